@@ -43,3 +43,46 @@ resource "aws_lambda_permission" "apigw" {
 output "api_gateway_endpoint" {
   value = aws_apigatewayv2_api.main.api_endpoint
 }
+
+# -----------------------------------------------------------------------------
+# Live feed (WebSocket): clients subscribe per event SKU or team, the updaters push
+# score changes with the management API (lambda/content-updater/feed.py)
+# -----------------------------------------------------------------------------
+
+resource "aws_apigatewayv2_api" "feed" {
+  name                       = "${var.project_name}-feed"
+  protocol_type              = "WEBSOCKET"
+  route_selection_expression = "$request.body.action"
+}
+
+resource "aws_apigatewayv2_integration" "feed" {
+  api_id             = aws_apigatewayv2_api.feed.id
+  integration_type   = "AWS_PROXY"
+  integration_method = "POST"
+  integration_uri    = aws_lambda_function.api_handler.invoke_arn
+}
+
+resource "aws_apigatewayv2_route" "feed" {
+  for_each  = toset(["$connect", "$disconnect", "subscribe"])
+  api_id    = aws_apigatewayv2_api.feed.id
+  route_key = each.value
+  target    = "integrations/${aws_apigatewayv2_integration.feed.id}"
+}
+
+resource "aws_apigatewayv2_stage" "feed" {
+  api_id      = aws_apigatewayv2_api.feed.id
+  name        = "live"
+  auto_deploy = true
+}
+
+resource "aws_lambda_permission" "apigw_feed" {
+  statement_id  = "AllowFeedAPIInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api_handler.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.feed.execution_arn}/*/*"
+}
+
+output "feed_endpoint" {
+  value = aws_apigatewayv2_stage.feed.invoke_url
+}
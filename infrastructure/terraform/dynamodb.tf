@@ -5,6 +5,10 @@ resource "aws_dynamodb_table" "main" {
   hash_key     = "PK"
   range_key    = "SK"
 
+  # Change stream for derived aggregates (lambda/content-updater/stream_consumer.py)
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attribute {
     name = "PK"
     type = "S"
@@ -33,6 +37,12 @@ resource "aws_dynamodb_table" "main" {
     projection_type = "ALL"
   }
 
+  # Live feed subscriptions expire with their WebSocket connection
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
   point_in_time_recovery {
     enabled = true
   }
@@ -19,6 +19,27 @@ resource "aws_scheduler_schedule" "content_update" {
   }
 }
 
+# Live-event refresh: only events running now, so it can run often
+resource "aws_scheduler_schedule" "live_update" {
+  name       = "${var.project_name}-live-update"
+  group_name = "default"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  schedule_expression = "rate(${var.live_refresh_minutes} minutes)"
+
+  target {
+    arn      = aws_lambda_function.live_updater.arn
+    role_arn = aws_iam_role.scheduler_role.arn
+
+    retry_policy {
+      maximum_retry_attempts = 0 # the next tick retries anyway
+    }
+  }
+}
+
 # IAM role for EventBridge Scheduler
 resource "aws_iam_role" "scheduler_role" {
   name = "${var.project_name}-scheduler-role"
@@ -47,7 +68,10 @@ resource "aws_iam_role_policy" "scheduler_policy" {
       {
         Effect   = "Allow"
         Action   = "lambda:InvokeFunction"
-        Resource = aws_lambda_function.content_updater.arn
+        Resource = [
+          aws_lambda_function.content_updater.arn,
+          aws_lambda_function.live_updater.arn
+        ]
       }
     ]
   })
@@ -61,3 +85,11 @@ resource "aws_lambda_permission" "eventbridge" {
   principal     = "scheduler.amazonaws.com"
   source_arn    = aws_scheduler_schedule.content_update.arn
 }
+
+resource "aws_lambda_permission" "eventbridge_live" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.live_updater.function_name
+  principal     = "scheduler.amazonaws.com"
+  source_arn    = aws_scheduler_schedule.live_update.arn
+}
@@ -54,6 +54,7 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "dynamodb:DeleteItem",
           "dynamodb:Query",
           "dynamodb:Scan",
+          "dynamodb:BatchGetItem",
           "dynamodb:BatchWriteItem"
         ]
         Resource = [
@@ -61,6 +62,16 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "${aws_dynamodb_table.main.arn}/index/*"
         ]
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = "${aws_dynamodb_table.main.arn}/stream/*"
+      },
       {
         Effect = "Allow"
         Action = [
@@ -68,6 +79,13 @@ resource "aws_iam_role_policy" "lambda_policy" {
         ]
         Resource = aws_cloudfront_distribution.main.arn
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "execute-api:ManageConnections"
+        ]
+        Resource = "${aws_apigatewayv2_api.feed.execution_arn}/*"
+      },
       {
         Effect = "Allow"
         Action = [
@@ -79,6 +97,11 @@ resource "aws_iam_role_policy" "lambda_policy" {
   })
 }
 
+locals {
+  # Management API endpoint the updaters post live feed messages to
+  feed_management_endpoint = "https://${aws_apigatewayv2_api.feed.id}.execute-api.${var.aws_region}.amazonaws.com/${aws_apigatewayv2_stage.feed.name}"
+}
+
 # Lambda function
 data "archive_file" "lambda_zip" {
   type        = "zip"
@@ -102,8 +125,9 @@ resource "aws_lambda_function" "content_updater" {
       DATA_BUCKET_NAME       = aws_s3_bucket.data.id
       CLOUDFRONT_DIST_ID     = aws_cloudfront_distribution.main.id
       PROJECT_NAME           = var.project_name
-      SEASON_ID              = var.season_id
+      SEASON_IDS             = join(",", distinct(concat([var.season_id], var.extra_season_ids)))
       WORLDS_SKUS            = var.worlds_skus
+      FEED_WS_ENDPOINT       = local.feed_management_endpoint
     }
   }
 
@@ -112,6 +136,77 @@ resource "aws_lambda_function" "content_updater" {
   }
 }
 
+# Live-event refresh: same package, lightweight entry point on a short schedule
+resource "aws_lambda_function" "live_updater" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${var.project_name}-live-updater"
+  role             = aws_iam_role.lambda_execution.arn
+  handler          = "index.live_handler"
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  runtime          = "python3.12"
+  timeout          = 120
+  memory_size      = 256
+
+  environment {
+    variables = {
+      TABLE_NAME       = aws_dynamodb_table.main.name
+      PROJECT_NAME     = var.project_name
+      SEASON_ID        = var.season_id
+      FEED_WS_ENDPOINT = local.feed_management_endpoint
+    }
+  }
+
+  tags = {
+    Name = "${var.project_name}-live-updater"
+  }
+}
+
+# Derived aggregates (match counts, team W-L-T, team video links) from the table stream
+resource "aws_lambda_function" "stream_consumer" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${var.project_name}-stream-consumer"
+  role             = aws_iam_role.lambda_execution.arn
+  handler          = "stream_consumer.handler"
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  runtime          = "python3.12"
+  timeout          = 60
+  memory_size      = 256
+
+  environment {
+    variables = {
+      TABLE_NAME = aws_dynamodb_table.main.name
+    }
+  }
+
+  tags = {
+    Name = "${var.project_name}-stream-consumer"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "match_stream" {
+  event_source_arn                   = aws_dynamodb_table.main.stream_arn
+  function_name                      = aws_lambda_function.stream_consumer.arn
+  # Only changes from here on: matches already in the table (or written before a
+  # team had a season item) are counted by scripts/sync_team_stats.py
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+
+  # Only event match items; everything else on the table never invokes the consumer
+  filter_criteria {
+    filter {
+      pattern = jsonencode({
+        dynamodb = {
+          Keys = {
+            PK = { S = [{ prefix = "EVENT#" }] }
+            SK = { S = [{ prefix = "MATCH#" }] }
+          }
+        }
+      })
+    }
+  }
+}
+
 # CloudWatch Log Group for Lambda
 resource "aws_cloudwatch_log_group" "lambda" {
   name              = "/aws/lambda/${var.project_name}-api-v3"
@@ -22,6 +22,12 @@ variable "content_refresh_hours" {
   default     = 24
 }
 
+variable "live_refresh_minutes" {
+  description = "Minutes between live-event score refreshes (active events only)"
+  type        = number
+  default     = 5
+}
+
 variable "tags" {
   description = "Common tags for all resources"
   type        = map(string)
@@ -37,6 +43,12 @@ variable "season_id" {
   type        = number
   default     = 197
 }
+
+variable "extra_season_ids" {
+  description = "Past seasons the content-updater keeps ingesting alongside season_id (e.g. [190])"
+  type        = list(number)
+  default     = []
+}
 variable "worlds_skus" {
   description = "Comma-separated list of SKUs that are World Championship events"
   type        = string
@@ -1,31 +1,137 @@
 
+import heapq
 import json
 import os
 import logging
-from decimal import Decimal
+import threading
+import time
+from itertools import islice
 from typing import Any
 
-import boto3
-from boto3.dynamodb.conditions import Key
-
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
 TABLE_NAME = os.environ.get('TABLE_NAME')
-table = dynamodb.Table(TABLE_NAME) if TABLE_NAME else None
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Cold starts: boto3 is imported and the DynamoDB client created by the first request
+# that reads or writes the table, so CORS preflights and cached responses never pay
+# for them. The low-level client and deserialize() below replace the resource layer
+# and boto3.dynamodb.conditions, which added their own import and setup time.
+# scripts/bench_api_cold_start.py measures the difference.
+_client = None
+_client_lock = threading.Lock()
+
+# Warm containers answer a repeated GET from memory for API_CACHE_SECONDS. The
+# updaters change the table every few minutes at most (live scores: 5 min).
+CACHE_SECONDS = int(os.environ.get('API_CACHE_SECONDS', '60'))
+CACHE_ENTRIES = 256
+_cache = {}  # (path, sorted query) -> (expires, response), oldest first
+
+# RobotEvents season ID -> the year in that season's event SKUs (RE-V5RC-25-0147 is season 197).
+# Team match items are keyed MATCH#{sku}#..., so a season is a narrower SK prefix.
+SEASON_SKU_YEARS = {'190': '24', '197': '25'}
+
+# Season partitions are write-sharded (SEASON#{id}#S{n}, ranking {version}#S{n});
+# must match SEASON_SHARDS in lambda/content-updater/ingest.py
+SEASON_SHARDS = 4
+
+# Live feed subscriptions: FEED#{channel} / CONN#{id}, plus the reverse item for $disconnect
+FEED_TTL_SECONDS = 2 * 60 * 60  # API Gateway closes WebSocket connections after 2 hours
+
+def dynamodb():
+    """The low-level DynamoDB client, created on first use."""
+    global _client
+    with _client_lock:  # scatter_query may be the first caller, from several threads
+        if _client is None:
+            import boto3
+            _client = boto3.client('dynamodb')
+    return _client
+
+def deserialize(value: dict):
+    """One DynamoDB attribute value as plain JSON-ready Python (numbers as int/float, sets as lists)."""
+    (kind, v), = value.items()
+    if kind == 'S' or kind == 'BOOL':
+        return v
+    if kind == 'N':
+        return int(v) if v.lstrip('-').isdigit() else float(v)
+    if kind == 'M':
+        return {k: deserialize(x) for k, x in v.items()}
+    if kind == 'L':
+        return [deserialize(x) for x in v]
+    if kind == 'NULL':
+        return None
+    if kind == 'NS':
+        return [deserialize({'N': n}) for n in v]
+    return list(v) if kind in ('SS', 'BS') else v  # B stays base64, as the JSON response needs
+
+def from_dynamo(raw: dict):
+    return {k: deserialize(v) for k, v in raw.items()} if raw else None
+
+def table_key(pk: str, sk: str) -> dict:
+    return {'PK': {'S': pk}, 'SK': {'S': sk}}
+
+def key_condition(pk: str, sk_prefix: str = None, pk_name: str = 'PK', sk_name: str = 'SK') -> dict:
+    """Query kwargs for `pk_name = pk [AND begins_with(sk_name, sk_prefix)]`."""
+    kwargs = {'KeyConditionExpression': f'{pk_name} = :pk', 'ExpressionAttributeValues': {':pk': {'S': pk}}}
+    if sk_prefix is not None:
+        kwargs['KeyConditionExpression'] += f' AND begins_with({sk_name}, :sk)'
+        kwargs['ExpressionAttributeValues'][':sk'] = {'S': sk_prefix}
+    return kwargs
+
+def get_item(pk: str, sk: str):
+    return from_dynamo(dynamodb().get_item(TableName=TABLE_NAME, Key=table_key(pk, sk)).get('Item'))
+
+def batch_write(requests: list):
+    """BatchWriteItem in chunks of 25, resubmitting unprocessed requests."""
+    for n in range(0, len(requests), 25):
+        pending = {TABLE_NAME: requests[n:n + 25]}
+        for attempt in range(5):
+            pending = dynamodb().batch_write_item(RequestItems=pending).get('UnprocessedItems')
+            if not pending:
+                break
+            time.sleep(0.05 * 2 ** attempt)
+
+def batch_get(keys: list) -> list:
+    """BatchGetItem (up to 100 keys), resubmitting unprocessed keys.
+
+    Keys still unprocessed after the retries (sustained throttling) are read one
+    by one, so an item is never reported missing just because it was throttled.
+    """
+    items, pending = [], {TABLE_NAME: {'Keys': keys}}
+    for attempt in range(5):
+        resp = dynamodb().batch_get_item(RequestItems=pending)
+        items.extend(from_dynamo(raw) for raw in resp.get('Responses', {}).get(TABLE_NAME, []))
+        pending = resp.get('UnprocessedKeys')
+        if not pending:
+            return items
+        time.sleep(0.05 * 2 ** attempt)
+    for key in pending[TABLE_NAME]['Keys']:
+        item = get_item(key['PK']['S'], key['SK']['S'])
+        if item:
+            items.append(item)
+    return items
+
+def cached_response(key):
+    hit = _cache.get(key)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+    _cache.pop(key, None)
+    return None
+
+def cache_response(key, resp: dict):
+    if len(_cache) >= CACHE_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + CACHE_SECONDS, resp)
 
 def handler(event: dict, context: Any) -> dict:
     # Handler deployed via Terraform
+    # WebSocket routes of the live feed API carry a connectionId instead of a path
+    if 'connectionId' in event.get('requestContext', {}):
+        return feed_handler(event)
+
     path = event.get('rawPath', '/')
     method = event.get('requestContext', {}).get('http', {}).get('method', 'GET')
-    query_params = event.get('queryStringParameters', {})
+    query_params = event.get('queryStringParameters') or {}
 
     logger.info(f"API Request: {method} {path}")
 
@@ -49,6 +155,17 @@ def handler(event: dict, context: Any) -> dict:
     elif path == '/api':
         path = '/'
 
+    if method != 'GET' or CACHE_SECONDS <= 0:
+        return route(path, method, query_params)
+    key = (path, tuple(sorted(query_params.items())))
+    resp = cached_response(key)
+    if resp is None:
+        resp = route(path, method, query_params)
+        if resp['statusCode'] == 200:
+            cache_response(key, resp)
+    return resp
+
+def route(path: str, method: str, query_params: dict) -> dict:
     try:
         if path == '/teams' and method == 'GET':
             return get_teams(query_params)
@@ -57,12 +174,14 @@ def handler(event: dict, context: Any) -> dict:
             team_number = parts[2] if len(parts) > 2 else None
             sub = parts[3] if len(parts) > 3 else None
             if sub == 'matches':
-                return get_team_matches(team_number)
+                return get_team_matches(team_number, query_params)
             elif sub == 'events':
                 return get_team_events(team_number)
             elif sub == 'awards':
                 return get_team_awards(team_number)
-            return get_team_detail(team_number)
+            return get_team_detail(team_number, query_params)
+        elif path == '/dashboard' and method == 'GET':
+            return get_dashboard(query_params)
         elif path == '/events' and method == 'GET':
             return get_events(query_params)
         elif path.startswith('/events/') and method == 'GET':
@@ -78,82 +197,183 @@ def handler(event: dict, context: Any) -> dict:
         logger.error(f"Internal Error: {e}", exc_info=True)
         return response(500, {"error": str(e)})
 
+def feed_channels(params: dict) -> list:
+    """Channels named by ?sku= / ?team= (on connect) or a subscribe message body."""
+    channels = []
+    if params.get('sku'):
+        channels.append(f"event:{params['sku']}")
+    if params.get('team'):
+        channels.append(f"team:{params['team']}")
+    return channels
+
+def feed_handler(event: dict) -> dict:
+    """$connect (subscribe from the query string), subscribe ({"action": "subscribe", "sku"/"team"}), $disconnect."""
+    ctx = event['requestContext']
+    route = ctx.get('routeKey')
+    connection_id = ctx['connectionId']
+
+    if route == '$disconnect':
+        deletes = []
+        for item in query_items(**key_condition(f'CONN#{connection_id}')):
+            deletes.append({'DeleteRequest': {'Key': table_key(item['PK'], item['SK'])}})
+            deletes.append({'DeleteRequest': {'Key': table_key(item['SK'], item['PK'])}})
+        batch_write(deletes)
+        return {'statusCode': 200}
+
+    if route == '$connect':
+        params = event.get('queryStringParameters') or {}
+    elif route == 'subscribe':
+        try:
+            params = json.loads(event.get('body') or '{}')
+        except json.JSONDecodeError:
+            return {'statusCode': 400, 'body': 'Invalid JSON'}
+        if not isinstance(params, dict):
+            return {'statusCode': 400, 'body': 'Expected a JSON object'}
+    else:
+        return {'statusCode': 400, 'body': f'Unknown route {route}'}
+
+    expires_at = {'N': str(int(time.time()) + FEED_TTL_SECONDS)}
+    puts = []
+    for channel in feed_channels(params):
+        puts.append({'PutRequest': {'Item': {**table_key(f'FEED#{channel}', f'CONN#{connection_id}'), 'expires_at': expires_at}}})
+        puts.append({'PutRequest': {'Item': {**table_key(f'CONN#{connection_id}', f'FEED#{channel}'), 'expires_at': expires_at}}})
+    batch_write(puts)
+    return {'statusCode': 200}
+
+def ranking_partitions(season_id) -> list:
+    """GSI1PKs holding the season's ranked teams.
+
+    The content-updater writes each ranking run to SEASON#{id}#V{run}#S{n} and
+    then swaps the RANKING pointer to it. While a run is moving teams over, its
+    `building` partitions are read too, so no team drops out mid-run. Versions
+    published before sharding (no `shards` on the pointer) are one partition.
+    """
+    pointer = get_item(f'SEASON#{season_id}', 'RANKING') or {}
+    version = pointer.get('version') or f'SEASON#{season_id}'
+    partitions = shard_partitions(version) if pointer.get('shards') else [version]
+    if pointer.get('building'):
+        partitions += shard_partitions(pointer['building'])
+    return partitions
+
+def shard_partitions(base: str) -> list:
+    return [f"{base}#S{n}" for n in range(SEASON_SHARDS)]
+
+def scatter_query(partitions: list, condition, sort_key: str, limit=None, **kwargs) -> list:
+    """Query every shard in parallel and merge their ordered results by sort_key.
+
+    `condition(pk)` returns one shard's key condition kwargs (see key_condition).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+        results = list(pool.map(lambda pk: query_items(limit=limit, **condition(pk), **kwargs), partitions))
+    merged = heapq.merge(*results, key=lambda item: item.get(sort_key, ''))
+    return list(islice(merged, limit)) if limit else list(merged)
+
 def get_teams(params: dict):
     season_id = params.get('season', os.environ.get('SEASON_ID', '197'))
     query = params.get('q', '').lower()
     
-    # Use GSI1 to list teams by rank
-    resp = table.query(
-        IndexName='GSI1',
-        KeyConditionExpression=Key('GSI1PK').eq(f'SEASON#{season_id}') & Key('GSI1SK').begins_with('RANK#'),
-        Limit=1000
+    # Use GSI1 to list teams by rank, from the published ranking version's shards
+    teams = scatter_query(
+        ranking_partitions(season_id),
+        lambda pk: key_condition(pk, 'RANK#', 'GSI1PK', 'GSI1SK'),
+        'GSI1SK', limit=1000, IndexName='GSI1'
     )
-    
-    teams = resp.get('Items', [])
     if query:
         teams = [t for t in teams if query in t['number'].lower() or query in t.get('name', '').lower()]
         
     return response(200, teams)
 
-def get_team_detail(number: str):
-    # Get metadata
-    meta = table.get_item(Key={'PK': f'TEAM#{number}', 'SK': 'METADATA'})
-    if 'Item' not in meta:
+def team_match_prefix(season):
+    """SK prefix for a team's match items, narrowed to one season's SKUs if given.
+
+    Returns None for a season we have no SKU year for.
+    """
+    if not season:
+        return 'MATCH#'
+    year = SEASON_SKU_YEARS.get(str(season))
+    return f'MATCH#RE-V5RC-{year}-' if year else None
+
+def query_items(limit=None, **kwargs):
+    """Query every page (up to `limit` items)."""
+    items = []
+    while True:
+        if limit:
+            kwargs['Limit'] = limit - len(items)
+        resp = dynamodb().query(TableName=TABLE_NAME, **kwargs)
+        items.extend(from_dynamo(raw) for raw in resp.get('Items', []))
+        if 'LastEvaluatedKey' not in resp or (limit and len(items) >= limit):
+            return items
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def get_dashboard(params: dict):
+    """Home-page document precomputed by the content-updater: one item read."""
+    season_id = params.get('season', os.environ.get('SEASON_ID', '197'))
+    item = get_item(f'SEASON#{season_id}', 'DASHBOARD')
+    if not item:
+        return response(404, {"error": "Dashboard not built yet"})
+    return response(200, item)
+
+def get_team_detail(number: str, params: dict):
+    prefix = team_match_prefix(params.get('season'))
+    if prefix is None:
+        return response(400, {"error": f"Unknown season {params.get('season')}"})
+
+    # Team identity (METADATA) plus that season's rank/skills/stats (SEASON#{id}), one round trip
+    season_id = params.get('season', os.environ.get('SEASON_ID', '197'))
+    keys = [table_key(f'TEAM#{number}', 'METADATA'), table_key(f'TEAM#{number}', f'SEASON#{season_id}')]
+    found = {item['SK']: item for item in batch_get(keys)}
+    if 'METADATA' not in found:
         return response(404, {"error": "Team not found"})
         
     # Get matches via reverse-lookup
-    matches = table.query(
-        KeyConditionExpression=Key('PK').eq(f'TEAM#{number}') & Key('SK').begins_with('MATCH#'),
+    data = {**found['METADATA'], **found.get(f'SEASON#{season_id}', {})}
+    data['matches'] = query_items(
+        limit=50,
         ScanIndexForward=False,
-        Limit=50
+        **key_condition(f'TEAM#{number}', prefix)
     )
     
-    data = meta['Item']
-    data['matches'] = matches.get('Items', [])
-    
     return response(200, data)
 
-def get_team_matches(number: str):
-    """Return all match reverse-lookup items for a team."""
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'TEAM#{number}') & Key('SK').begins_with('MATCH#'),
+def get_team_matches(number: str, params: dict):
+    """Return match reverse-lookup items for a team.
+
+    With ?season=, only that season's items are read (every page); without it,
+    the 200 most recent across all seasons.
+    """
+    season = params.get('season')
+    prefix = team_match_prefix(season)
+    if prefix is None:
+        return response(400, {"error": f"Unknown season {season}"})
+    items = query_items(
+        limit=None if season else 200,
         ScanIndexForward=False,
-        Limit=200
+        **key_condition(f'TEAM#{number}', prefix)
     )
-    return response(200, resp.get('Items', []))
+    return response(200, items)
 
 def get_team_events(number: str):
     """Return upcoming/active event registrations for a team."""
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'TEAM#{number}') & Key('SK').begins_with('EVENT#'),
-        ScanIndexForward=True
-    )
-    return response(200, resp.get('Items', []))
+    return response(200, query_items(**key_condition(f'TEAM#{number}', 'EVENT#')))
 
 def get_team_awards(number: str):
     """Return all award items for a team."""
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'TEAM#{number}') & Key('SK').begins_with('AWARD#'),
-        ScanIndexForward=True
-    )
-    return response(200, resp.get('Items', []))
+    return response(200, query_items(**key_condition(f'TEAM#{number}', 'AWARD#')))
 
 def get_event_matches(sku: str):
     """Return all match source-of-truth items for an event."""
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'EVENT#{sku}') & Key('SK').begins_with('MATCH#'),
-        ScanIndexForward=True
-    )
-    return response(200, resp.get('Items', []))
+    return response(200, query_items(**key_condition(f'EVENT#{sku}', 'MATCH#')))
 
 def get_events(params: dict):
     season_id = params.get('season', os.environ.get('SEASON_ID', '197'))
     
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'SEASON#{season_id}') & Key('SK').begins_with('EVENT#'),
-        Limit=1000 # Increased fetch limit for internal sorting
+    events = scatter_query(
+        shard_partitions(f'SEASON#{season_id}'),
+        lambda pk: key_condition(pk, 'EVENT#'),
+        'SK', limit=1000  # Increased fetch limit for internal sorting
     )
-    events = resp.get('Items', [])
     
     # Sort events: World level first, then by start date
     def sort_key(e):
@@ -182,5 +402,5 @@ def response(status_code: int, body: Any) -> dict:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(body, cls=DecimalEncoder)
+        'body': json.dumps(body)
     }
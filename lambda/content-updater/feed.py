@@ -0,0 +1,119 @@
+"""
+Live match feed.
+
+The match-write path queues every match item whose score changed; flush()
+pushes the batch to subscribed clients. The updaters flush after each team
+(update_matches) or event (live mode), so scores go out as they are written
+rather than when the run ends. Channels:
+
+    event:{sku}     event match items  (EVENT#{sku} / MATCH#...)
+    team:{number}   a team's reverse-lookup items (TEAM#{number} / MATCH#{sku}#...)
+
+Backend, picked from the environment:
+
+    FEED_WS_ENDPOINT   API Gateway WebSocket management endpoint. Subscribers are
+                       FEED#{channel} / CONN#{connection_id} items written by the
+                       api-handler's WebSocket routes.
+    FEED_PUBLISH_URL   POST {"updates": [...]} to a broker; scripts/feed_broker.py
+                       is the local stand-in.
+
+With neither set, queued updates are dropped.
+"""
+
+import json
+import logging
+import os
+import urllib.request
+from decimal import Decimal
+from typing import List, Tuple
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+logger = logging.getLogger()
+
+FEED_WS_ENDPOINT = os.environ.get('FEED_WS_ENDPOINT', '')
+FEED_PUBLISH_URL = os.environ.get('FEED_PUBLISH_URL', '')
+MESSAGE_BATCH = 50  # updates per pushed message; keeps frames well under the 32 KB WebSocket limit
+
+_pending: List[Tuple[str, dict]] = []
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Not JSON serializable: {type(obj)}")
+
+
+def channel_for(item: dict) -> str:
+    kind, _, key = item['PK'].partition('#')
+    return f"{kind.lower()}:{key}"
+
+
+def queue_item(item: dict):
+    """Queue a written match item for the next flush()."""
+    if FEED_WS_ENDPOINT or FEED_PUBLISH_URL:
+        _pending.append((channel_for(item), {k: v for k, v in item.items() if k != 'PK'}))
+
+
+def flush(table=None) -> int:
+    """Push everything queued since the last flush. Returns the number of updates sent."""
+    updates = [{'channel': channel, 'item': item} for channel, item in _pending]
+    _pending.clear()
+    if not updates:
+        return 0
+    try:
+        if FEED_WS_ENDPOINT:
+            _push_websocket(table, updates)
+        else:
+            _post(updates)
+    except Exception as e:
+        logger.error(f"Feed publish failed ({len(updates)} updates): {e}")
+        return 0
+    logger.info(f"Feed: published {len(updates)} match update(s)")
+    return len(updates)
+
+
+def _post(updates: list):
+    body = json.dumps({'updates': updates}, default=_default).encode()
+    req = urllib.request.Request(FEED_PUBLISH_URL, data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=5):
+        pass
+
+
+def _query_all(table, condition) -> List[dict]:
+    items, kwargs = [], {'KeyConditionExpression': condition}
+    while True:
+        resp = table.query(**kwargs)
+        items.extend(resp.get('Items', []))
+        if 'LastEvaluatedKey' not in resp:
+            return items
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+
+def _subscribers(table, channel: str) -> List[str]:
+    items = _query_all(table, Key('PK').eq(f'FEED#{channel}') & Key('SK').begins_with('CONN#'))
+    return [item['SK'][len('CONN#'):] for item in items]
+
+
+def _push_websocket(table, updates: list):
+    by_connection = {}
+    for channel in {u['channel'] for u in updates}:
+        for connection_id in _subscribers(table, channel):
+            by_connection.setdefault(connection_id, []).extend(u for u in updates if u['channel'] == channel)
+
+    client = boto3.client('apigatewaymanagementapi', endpoint_url=FEED_WS_ENDPOINT)
+    for connection_id, conn_updates in by_connection.items():
+        try:
+            for i in range(0, len(conn_updates), MESSAGE_BATCH):
+                data = json.dumps({'type': 'matches', 'updates': conn_updates[i:i + MESSAGE_BATCH]}, default=_default)
+                client.post_to_connection(ConnectionId=connection_id, Data=data.encode())
+        except client.exceptions.GoneException:
+            remove_connection(table, connection_id)
+
+
+def remove_connection(table, connection_id: str):
+    """Delete a connection's subscription items (both directions)."""
+    for item in _query_all(table, Key('PK').eq(f'CONN#{connection_id}')):
+        table.delete_item(Key={'PK': item['SK'], 'SK': item['PK']})
+        table.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
@@ -1,16 +1,23 @@
 
+import codecs
+import heapq
 import json
 import os
 import logging
 import urllib.request
 import urllib.error
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from decimal import Decimal
 from typing import Any, Optional, List, Dict
 
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+import feed
+import ingest
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -21,7 +28,9 @@ secrets_client = boto3.client('secretsmanager')
 # Environment variables
 TABLE_NAME = os.environ.get('TABLE_NAME')
 PROJECT_NAME = os.environ.get('PROJECT_NAME', 'vex5hub')
-SEASON_ID = int(os.environ.get('SEASON_ID', 197)) # Default to 2025-26, override as needed
+# Seasons each run ingests; the first is the current one. A run can also be given
+# {"seasons": [190]} to backfill a past season without a redeploy.
+SEASON_IDS = [int(s) for s in os.environ.get('SEASON_IDS', os.environ.get('SEASON_ID', '197')).split(',') if s.strip()]
 WORLDS_SKUS = os.environ.get('WORLDS_SKUS', '')
 
 table = dynamodb.Table(TABLE_NAME) if TABLE_NAME else None
@@ -29,6 +38,27 @@ table = dynamodb.Table(TABLE_NAME) if TABLE_NAME else None
 # RobotEvents API
 RE_API_BASE = "https://www.robotevents.com/api/v2"
 
+# Home-page dashboard document (PK SEASON#{id}, SK DASHBOARD)
+DASHBOARD_TOP_N = 4      # top teams kept per grade
+DASHBOARD_EVENTS = 6     # active and upcoming events kept (each)
+DASHBOARD_TEAM_FIELDS = ('number', 'name', 'organization', 'region', 'country', 'grade',
+                         'worlds_qualified', 'location', 'skills', 'stats', 'awards')
+DASHBOARD_EVENT_FIELDS = ('sku', 'name', 'level', 'start', 'end', 'location', 'status',
+                          'capacity', 'grade_level', 'livestream_url', 'match_count')
+
+# Ranking versions: each update_top_teams run writes GSI1PK=SEASON#{id}#V{run}#S{n}; the
+# pointer item (PK SEASON#{id}, SK RANKING) names the published one
+RANKING_SK = 'RANKING'
+
+# Skills leaderboard (update_top_teams): streamed, decoded only as far as needed
+SKILLS_TOP_N = 150           # teams kept per grade, plus any Worlds-qualified team
+STREAM_CHUNK = 64 * 1024     # bytes read per step while stream-parsing a response
+NUMBER_CHARS = frozenset('0123456789+-.eE')  # a number may go on past a chunk boundary
+
+# Live mode (live_handler): events running now, found by a date range on the season SK
+LIVE_MAX_EVENT_DAYS = 7      # longest event we expect; lower bound of the start-date range
+LIVE_END_GRACE_HOURS = 24    # RobotEvents `end` is often midnight of the last day
+
 def handler(event: dict, context: Any) -> dict:
     """Main Lambda handler triggered by EventBridge."""
     logger.info(f"VEX V5 Hub Update triggered at {datetime.now(timezone.utc).isoformat()}")
@@ -37,39 +67,196 @@ def handler(event: dict, context: Any) -> dict:
     if not api_key:
         return {"statusCode": 500, "body": "Missing RobotEvents API Key"}
 
-    results = {"timestamp": datetime.now(timezone.utc).isoformat(), "updates": [], "errors": []}
+    seasons = [int(s) for s in (event or {}).get('seasons', [])] or SEASON_IDS
+    results = {"timestamp": datetime.now(timezone.utc).isoformat(), "seasons": {}, "errors": []}
 
-    try:
-        # 1. Update Events (fast: one API call, stores level+status to DynamoDB)
-        update_events(api_key)
-        results["updates"].append("events")
+    for season_id in seasons:
+        results["seasons"][season_id] = updates = []
+        try:
+            update_season(api_key, season_id, updates)
+        except Exception as e:
+            logger.error(f"Update failed for season {season_id}: {e}", exc_info=True)
+            results["errors"].append(f"{season_id}: {e}")
 
-        # 2. Fetch Worlds Qualified teams (for flag tagging in step 3)
-        worlds_teams = fetch_worlds_teams(api_key, SEASON_ID)
+    # Anything queued outside update_matches' per-team flushes
+    feed.flush(table)
+    return {"statusCode": 200, "body": json.dumps(results)}
 
-        # 3. Update Top Teams from Skills leaderboard
-        #    *** This stores re_id (numeric RobotEvents team ID) in DynamoDB ***
-        update_top_teams(api_key, worlds_teams)
-        results["updates"].append("teams")
+def update_season(api_key: str, season_id: int, updates: list):
+    """Every updater phase for one season; each keys its writes by season_id."""
+    # 1. Update Events (fast: one API call, stores level+status to DynamoDB)
+    update_events(api_key, season_id)
+    updates.append("events")
 
-        # 4. Update Match results — reads re_id stored in step 3 (no extra API calls)
-        match_count = update_matches(api_key)
-        results["updates"].append(f"matches ({match_count})")
+    # 2. Fetch Worlds Qualified teams (for flag tagging in step 3)
+    worlds_teams = fetch_worlds_teams(api_key, season_id)
 
-        # 5. Update team event registrations (upcoming/live events)
-        event_count = update_team_events(api_key)
-        results["updates"].append(f"team_events ({event_count})")
+    # 3. Update Top Teams from Skills leaderboard
+    #    *** This stores re_id (numeric RobotEvents team ID) in DynamoDB ***
+    update_top_teams(api_key, season_id, worlds_teams)
+    updates.append("teams")
 
-        # 6. Update awards for tracked teams
-        award_count = update_awards(api_key)
-        results["updates"].append(f"awards ({award_count})")
+    # 4. Update Match results — reads re_id stored in step 3 (no extra API calls)
+    match_count = update_matches(api_key, season_id)
+    updates.append(f"matches ({match_count})")
 
-    except Exception as e:
-        logger.error(f"Update failed: {e}", exc_info=True)
-        results["errors"].append(str(e))
+    # 5. Update team event registrations (upcoming/live events)
+    event_count = update_team_events(api_key, season_id)
+    updates.append(f"team_events ({event_count})")
+
+    # 6. Update awards for tracked teams
+    award_count = update_awards(api_key, season_id)
+    updates.append(f"awards ({award_count})")
+
+    # 7. Rebuild the home-page dashboard from what was just stored
+    update_dashboard(season_id)
+    updates.append("dashboard")
+
+def live_handler(event: dict, context: Any) -> dict:
+    """Short-schedule entry point: refresh match scores for events running right now.
+
+    Skips the events/teams/awards phases entirely. Each active event costs one
+    RobotEvents call per division (plus paging) and one table query, and only
+    matches whose scores changed are written.
+    """
+    logger.info(f"VEX V5 Hub live refresh triggered at {datetime.now(timezone.utc).isoformat()}")
+    results = {"timestamp": datetime.now(timezone.utc).isoformat(), "events": {}, "errors": []}
+
+    events = active_events()
+    if not events:
+        return {"statusCode": 200, "body": json.dumps(results)}
+
+    api_key = get_api_key()
+    if not api_key:
+        return {"statusCode": 500, "body": "Missing RobotEvents API Key"}
+
+    tracked: Dict[int, set] = {}
+    for evt in events:
+        season_id = int(evt.get('season_id') or evt['PK'].split('#')[1])
+        if season_id not in tracked:
+            tracked[season_id] = tracked_team_numbers(season_id)
+        try:
+            results["events"][evt['sku']] = refresh_event_matches(api_key, evt, tracked[season_id])
+        except Exception as e:
+            logger.error(f"Live refresh failed for {evt.get('sku')}: {e}", exc_info=True)
+            results["errors"].append(f"{evt.get('sku')}: {e}")
+        feed.flush(table)
 
     return {"statusCode": 200, "body": json.dumps(results)}
 
+def active_events(now: datetime = None) -> List[dict]:
+    """Season event items running at `now`, across SEASON_IDS.
+
+    The key condition only reads events that started in the last
+    LIVE_MAX_EVENT_DAYS (SK is EVENT#{start}#{sku}); `end` is checked here.
+    """
+    now = now or datetime.now(timezone.utc)
+    lower = (now - timedelta(days=LIVE_MAX_EVENT_DAYS)).strftime('%Y-%m-%d')
+    ended_before = (now - timedelta(hours=LIVE_END_GRACE_HOURS)).isoformat()
+    events = []
+    for season_id in SEASON_IDS:
+        started = query_shards(
+            ingest.shard_partitions(f'SEASON#{season_id}'),
+            lambda pk: Key('PK').eq(pk) & Key('SK').between(f'EVENT#{lower}', f'EVENT#{now.isoformat()}'),
+            'SK'
+        )
+        events += [e for e in started if (e.get('end') or '') >= ended_before]
+    logger.info(f"{len(events)} active event(s): {', '.join(e['sku'] for e in events)}")
+    return events
+
+def tracked_team_numbers(season_id: int) -> set:
+    """Teams update_matches keeps reverse-lookup items for (top 100 by rank)."""
+    return {t['number'] for t in ranked_teams(season_id, 100) if t.get('number')}
+
+def _score_state(item) -> tuple:
+    """What live mode compares to decide whether a match changed."""
+    red_score, blue_score = item.get('red_score'), item.get('blue_score')
+    return (
+        int(red_score) if red_score is not None else None,
+        int(blue_score) if blue_score is not None else None,
+        item.get('started') or ''
+    )
+
+def refresh_event_matches(api_key: str, evt: dict, tracked: set) -> int:
+    """Poll every division of one event and write only new or re-scored matches."""
+    sku = evt['sku']
+    re_id, divisions = evt.get('re_id'), evt.get('divisions')
+    if not re_id or not divisions:
+        # Stored before events carried their RobotEvents ID/divisions
+        data = api_request(f"{RE_API_BASE}/events?sku[]={sku}", api_key)
+        if not data or not data.get('data'):
+            return 0
+        re_id = data['data'][0]['id']
+        divisions = data['data'][0].get('divisions', [])
+
+    current = {}
+    kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'EVENT#{sku}') & Key('SK').begins_with('MATCH#'),
+        'ProjectionExpression': 'SK, red_score, blue_score, started'
+    }
+    while True:
+        resp = table.query(**kwargs)
+        for item in resp.get('Items', []):
+            current[item['SK']] = _score_state(item)
+        if 'LastEvaluatedKey' not in resp:
+            break
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+    evt_meta = ingest.event_meta(evt)
+    changed = 0
+    for division in divisions:
+        div_id = int(division['id'])
+        page, last_page = 1, 1
+        while page <= last_page:
+            data = api_request(
+                f"{RE_API_BASE}/events/{int(re_id)}/divisions/{div_id}/matches?per_page=250&page={page}", api_key
+            )
+            if not data or 'data' not in data:
+                break
+            for match in data['data']:
+                item = ingest.event_match_item(match, sku, evt.get('name', ''), div_id)
+                previous = current.get(item['SK'])
+                if previous == _score_state(item):
+                    continue
+                if previous is None:
+                    _write_event_match_item(match, sku, evt.get('name', ''), evt_meta)
+                    red_teams, blue_teams, _, _ = ingest.split_alliances(match)
+                    for team_num in red_teams + blue_teams:
+                        if team_num in tracked:
+                            _write_team_match_item(match, sku, evt.get('name', ''), team_num, evt_meta)
+                else:
+                    _update_match_scores(match, item)
+                changed += 1
+            last_page = data.get('meta', {}).get('last_page', 1)
+            page += 1
+
+    logger.info(f"Live {sku}: {changed} match(es) written")
+    return changed
+
+def _update_match_scores(match: dict, item: dict):
+    """Set the score fields on an existing match's event item and its team items (keeps video_url)."""
+    table.update_item(
+        Key={'PK': item['PK'], 'SK': item['SK']},
+        UpdateExpression="SET red_score = :rs, blue_score = :bs, started = :st, updated_at = :u",
+        ExpressionAttributeValues={':rs': item.get('red_score'), ':bs': item.get('blue_score'),
+                                   ':st': item.get('started', ''), ':u': item['updated_at']}
+    )
+    feed.queue_item(item)
+    for team_num in item.get('red_teams', []) + item.get('blue_teams', []):
+        team_item = ingest.team_match_item(match, team_num, item['sku'], item.get('event_name', ''),
+                                           div_id=item.get('division_id'), updated_at=item['updated_at'])
+        try:
+            table.update_item(
+                Key={'PK': team_item['PK'], 'SK': team_item['SK']},
+                UpdateExpression="SET my_score = :m, opp_score = :o, won = :w, updated_at = :u",
+                ExpressionAttributeValues={':m': team_item.get('my_score'), ':o': team_item.get('opp_score'),
+                                           ':w': team_item['won'], ':u': team_item['updated_at']},
+                ConditionExpression='attribute_exists(PK)'
+            )
+            feed.queue_item(team_item)
+        except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+            pass  # untracked team: no reverse-lookup item
+
 def get_api_key() -> Optional[str]:
     """Retrieve API key from Secrets Manager."""
     try:
@@ -80,7 +267,28 @@ def get_api_key() -> Optional[str]:
         logger.error(f"Failed to get API key: {e}")
         return None
 
-def save_event_to_dynamo(evt: dict):
+def _upsert_item(item: dict, init: dict = None):
+    """Write item's attributes without dropping the ones it does not carry.
+
+    Unlike put_item this keeps attributes maintained elsewhere (match_count and
+    stats from the stream consumer, awards). `init` attributes are only set when
+    the item does not have them yet.
+    """
+    names, values, sets = {}, {}, []
+    for i, (attr, value) in enumerate(a for a in item.items() if a[0] not in ('PK', 'SK')):
+        names[f'#a{i}'], values[f':a{i}'] = attr, value
+        sets.append(f'#a{i} = :a{i}')
+    for i, (attr, value) in enumerate((init or {}).items()):
+        names[f'#i{i}'], values[f':i{i}'] = attr, value
+        sets.append(f'#i{i} = if_not_exists(#i{i}, :i{i})')
+    table.update_item(
+        Key={'PK': item['PK'], 'SK': item['SK']},
+        UpdateExpression="SET " + ", ".join(sets),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+def save_event_to_dynamo(evt: dict, season_id: int):
     """Process and save a single event object to DynamoDB."""
     sku = evt.get('sku')
     if not sku:
@@ -90,9 +298,10 @@ def save_event_to_dynamo(evt: dict):
     level = evt.get('level', '')
     
     item = {
-        'PK': f'SEASON#{SEASON_ID}',
+        'PK': ingest.season_event_pk(season_id, sku),
         'SK': f'EVENT#{start_date}#{sku}',
         'sku': sku,
+        'season_id': season_id,
         'name': evt.get('name'),
         'level': level,
         'start': start_date,
@@ -104,6 +313,8 @@ def save_event_to_dynamo(evt: dict):
             'country': evt.get('location', {}).get('country')
         },
         'status': 'future',
+        're_id': evt.get('id'),  # numeric RobotEvents event ID, used by live mode
+        'divisions': [{'id': d.get('id'), 'name': d.get('name')} for d in evt.get('divisions', []) if d.get('id')],
         'updated_at': datetime.now(timezone.utc).isoformat()
     }
     
@@ -114,13 +325,14 @@ def save_event_to_dynamo(evt: dict):
     elif evt.get('end', '') < now:
         item['status'] = 'past'
         
-    table.put_item(Item=item)
+    _upsert_item(item)
 
     # Also store SKU metadata for reverse-lookup enrichment
     meta_item = {
         'PK': f'EVENT#{sku}',
         'SK': 'METADATA',
         'sku': sku,
+        'season_id': season_id,  # where the stream consumer finds the season event item
         'name': evt.get('name'),
         'level': level,
         'start': start_date,
@@ -131,37 +343,77 @@ def save_event_to_dynamo(evt: dict):
         'country': evt.get('location', {}).get('country'),
         'updated_at': datetime.now(timezone.utc).isoformat()
     }
-    table.put_item(Item=meta_item)
+    _upsert_item(meta_item)
+
+def worlds_skus(season_id: int) -> List[str]:
+    """WORLDS_SKUS entries belonging to this season (by the year in the SKU)."""
+    skus = [s.strip() for s in WORLDS_SKUS.split(',') if s.strip()]
+    return [sku for sku in skus if ingest.sku_season(sku) in (None, season_id)]
 
-def update_events(api_key: str):
-    """Fetch events for the current season and store in DynamoDB."""
+def update_events(api_key: str, season_id: int):
+    """Fetch a season's events and store in DynamoDB."""
     # 1. Fetch recent past events (last 60 days) + upcoming events via paging
-    from datetime import timedelta
     sixty_days_ago = (datetime.now(timezone.utc) - timedelta(days=60)).strftime('%Y-%m-%d')
     
     page = 1
     last_page = 1
     while page <= last_page and page <= 20: # Safety limit of 20 pages
-        url = f"{RE_API_BASE}/events?season[]={SEASON_ID}&start={sixty_days_ago}&per_page=100&page={page}"
+        url = f"{RE_API_BASE}/events?season[]={season_id}&start={sixty_days_ago}&per_page=100&page={page}"
         data = api_request(url, api_key)
         if not data or 'data' not in data: break
 
         for evt in data['data']:
-            save_event_to_dynamo(evt)
+            save_event_to_dynamo(evt, season_id)
 
         last_page = data.get('meta', {}).get('last_page', 1)
         page += 1
 
     # 2. Explicitly fetch WORLDS_SKUS to ensure they are present even if > 60 days away
-    if WORLDS_SKUS:
-        skus = [s.strip() for s in WORLDS_SKUS.split(',') if s.strip()]
-        for sku in skus:
-            url = f"{RE_API_BASE}/events?sku[]={sku}"
-            data = api_request(url, api_key)
-            if data and 'data' in data and len(data['data']) > 0:
-                save_event_to_dynamo(data['data'][0])
-
-def update_matches(api_key: str) -> int:
+    for sku in worlds_skus(season_id):
+        url = f"{RE_API_BASE}/events?sku[]={sku}"
+        data = api_request(url, api_key)
+        if data and 'data' in data and len(data['data']) > 0:
+            save_event_to_dynamo(data['data'][0], season_id)
+
+def _pick(item: dict, fields: tuple) -> dict:
+    return {f: item[f] for f in fields if item.get(f) is not None}
+
+def update_dashboard(season_id: int) -> dict:
+    """Write the compact home-page document: active/upcoming events and top teams per grade.
+
+    The home page reads this one item instead of the full season event and
+    ranking lists. Event order matches what the page used to compute: active
+    first, then by start date, dropping events that ended over 12h ago.
+    """
+    events = season_events(season_id)
+
+    split_point = (datetime.now(timezone.utc) - timedelta(hours=12)).isoformat()
+    current = sorted((e for e in events if (e.get('end') or '') >= split_point), key=lambda e: e.get('start', ''))
+    active = [_pick(e, DASHBOARD_EVENT_FIELDS) for e in current if e.get('status') == 'active']
+    upcoming = [_pick(e, DASHBOARD_EVENT_FIELDS) for e in current if e.get('status') != 'active']
+
+    # Teams come back in rank order (grades interleaved); keep the top N of each grade
+    top_teams: Dict[str, list] = {'High School': [], 'Middle School': []}
+    for team in ranked_teams(season_id, 100):
+        grade_list = top_teams.setdefault(team.get('grade') or 'Other', [])
+        if len(grade_list) < DASHBOARD_TOP_N:
+            grade_list.append(_pick(team, DASHBOARD_TEAM_FIELDS))
+
+    item = {
+        'PK': f'SEASON#{season_id}',
+        'SK': 'DASHBOARD',
+        'season_id': season_id,
+        'active_events': active[:DASHBOARD_EVENTS],
+        'upcoming_events': upcoming[:DASHBOARD_EVENTS],
+        'top_teams': top_teams,
+        'updated_at': datetime.now(timezone.utc).isoformat()
+    }
+    table.put_item(Item=item)
+    logger.info(f"Dashboard: {len(active)} active, {len(upcoming)} upcoming events, "
+                f"{sum(len(t) for t in top_teams.values())} teams")
+    return item
+
+def update_matches(api_key: str, season_id: int) -> int:
     """Fetch match results for top teams at Signature and Regional events.
     
     Uses /teams/{id}/matches endpoint (correct RE API) filtered to season.
@@ -175,36 +427,16 @@ def update_matches(api_key: str) -> int:
     TARGET_LEVELS = {'Signature', 'Regional'}
     total_matches = 0
     seen_matches = set()  # deduplicate: tracks (sku, div_id, match_num)
-    team_records: Dict[str, Dict[str, int]] = {}
 
     # Get top tracked teams from DynamoDB GSI1 (ranked teams)
-    resp = table.query(
-        IndexName='GSI1',
-        KeyConditionExpression=(
-            Key('GSI1PK').eq(f'SEASON#{SEASON_ID}') &
-            Key('GSI1SK').begins_with('RANK#')
-        ),
-        Limit=100  # top 100 teams
-    )
-    teams = resp.get('Items', [])
-    team_lookup = {team.get('number'): team for team in teams if team.get('number')}
+    teams = ranked_teams(season_id, 100)  # top 100 teams
     logger.info(f"Fetching matches for {len(teams)} teams...")
 
     # Pre-fetch event metadata map for denormalization
     # Since we don't have many events per season, we can just fetch all
-    events_resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'SEASON#{SEASON_ID}') & Key('SK').begins_with('EVENT#')
-    )
     event_meta_map = {}
-    for e in events_resp.get('Items', []):
-        sku = e['sku']
-        loc = e.get('location', {})
-        loc_str = ", ".join(filter(None, [loc.get('city'), loc.get('region'), loc.get('country')]))
-        event_meta_map[sku] = {
-            'start': e.get('start'),
-            'end': e.get('end'),
-            'location': loc_str
-        }
+    for e in season_events(season_id):
+        event_meta_map[e['sku']] = ingest.event_meta(e)
 
     for team in teams:
         team_num = team.get('number', '')
@@ -216,7 +448,7 @@ def update_matches(api_key: str) -> int:
 
         # Fetch matches for this team this season
         matches_data = api_request(
-            f"{RE_API_BASE}/teams/{re_id}/matches?season[]={SEASON_ID}&per_page=250",
+            f"{RE_API_BASE}/teams/{re_id}/matches?season[]={season_id}&per_page=250",
             api_key
         )
         if not matches_data or 'data' not in matches_data:
@@ -226,11 +458,8 @@ def update_matches(api_key: str) -> int:
             evt_info = match.get('event', {})
             sku = evt_info.get('code', '')
             evt_name = evt_info.get('name', '')
-            div_id = match.get('division', {}).get('id', 1)
-            match_num = match.get('matchnum', 0)
-            round_num = match.get('round', 0)
-            instance = match.get('instance', 0)
-            match_key = (sku, div_id, round_num, instance, match_num)
+            match_key = (sku, ingest.match_division_id(match), match.get('round', 0),
+                         match.get('instance', 0), match.get('matchnum', 0))
 
             # Filter: only Signature/Regional events
             # We check DynamoDB event level if available, else skip unknown levels
@@ -240,9 +469,6 @@ def update_matches(api_key: str) -> int:
             if not sku:
                 continue
 
-            # Compute record for list view (only count finished matches with scores)
-            _track_team_record(team_records, team_num, match)
-
             # Only write team reverse-lookup items for this specific team
             evt_meta = event_meta_map.get(sku, {})
             _write_team_match_item(match, sku, evt_name, team_num, evt_meta)
@@ -253,108 +479,17 @@ def update_matches(api_key: str) -> int:
                 seen_matches.add(match_key)
                 total_matches += 1
 
+        feed.flush(table)  # this team's score changes go out now, not at the end of the run
         time.sleep(0.5)  # gentle rate limiting between teams
 
-    _persist_team_records(team_records, team_lookup)
-
     logger.info(f"Total unique matches stored: {total_matches}")
     return total_matches
 
 
-def _track_team_record(team_records: Dict[str, Dict[str, int]], team_num: str, match: dict):
-    """Increment local W-L-T tallies for a team based on a single match."""
-    if not team_num:
-        return
-
-    alliances = match.get('alliances', [])
-    red = next((a for a in alliances if a.get('color') == 'red'), {})
-    blue = next((a for a in alliances if a.get('color') == 'blue'), {})
-    red_teams = [t.get('team', {}).get('name', '') for t in red.get('teams', [])]
-    blue_teams = [t.get('team', {}).get('name', '') for t in blue.get('teams', [])]
-    red_score = red.get('score')
-    blue_score = blue.get('score')
-
-    if red_score is None or blue_score is None:
-        return  # Skip matches without final scores
-
-    alliance_color = 'red' if team_num in red_teams else 'blue'
-    my_score = red_score if alliance_color == 'red' else blue_score
-    opp_score = blue_score if alliance_color == 'red' else red_score
-    if my_score is None or opp_score is None:
-        return
-
-    stats = team_records.setdefault(team_num, {
-        'wins': 0,
-        'losses': 0,
-        'ties': 0,
-        'total_matches': 0,
-        'wp': 0,
-        'ap': 0,
-        'sp': 0
-    })
-
-    stats['total_matches'] += 1
-    my_score = int(my_score)
-    opp_score = int(opp_score)
-
-    if my_score > opp_score:
-        stats['wins'] += 1
-        stats['wp'] += 2  # Standard WP scoring
-    elif my_score < opp_score:
-        stats['losses'] += 1
-    else:
-        stats['ties'] += 1
-        stats['wp'] += 1
-
-
-def _persist_team_records(team_records: Dict[str, Dict[str, int]], team_lookup: Dict[str, dict]):
-    """Write aggregated stats back to DynamoDB for each team."""
-    for team_num, stats in team_records.items():
-        existing = team_lookup.get(team_num, {})
-        stats_payload = {
-            'wins': Decimal(str(stats['wins'])),
-            'losses': Decimal(str(stats['losses'])),
-            'ties': Decimal(str(stats['ties'])),
-            'total_matches': Decimal(str(stats['total_matches'])),
-            'wp': Decimal(str(stats['wp'])),
-            'ap': Decimal('0'),
-            'sp': Decimal('0')
-        }
-
-        # Preserve the ranking value if we have one
-        existing_rank = None
-        existing_stats = existing.get('stats') or {}
-        if 'rank' in existing_stats:
-            existing_rank = existing_stats['rank']
-        else:
-            gsi_key = existing.get('GSI1SK', '')
-            if gsi_key.startswith('RANK#'):
-                try:
-                    rank_str = gsi_key.split('#')[1]
-                    existing_rank = Decimal(rank_str)
-                except Exception:
-                    existing_rank = None
-
-        if existing_rank is not None:
-            stats_payload['rank'] = existing_rank if isinstance(existing_rank, Decimal) else Decimal(str(existing_rank))
-
-        try:
-            table.update_item(
-                Key={'PK': f'TEAM#{team_num}', 'SK': 'METADATA'},
-                UpdateExpression="SET stats = :stats, updated_at = :updated_at",
-                ExpressionAttributeValues={
-                    ':stats': stats_payload,
-                    ':updated_at': datetime.now(timezone.utc).isoformat()
-                }
-            )
-        except Exception as e:
-            logger.error(f"Failed to persist stats for TEAM#{team_num}: {e}")
-
-
-def update_team_events(api_key: str) -> int:
+def update_team_events(api_key: str, season_id: int) -> int:
     """Fetch upcoming/active event registrations for tracked teams.
 
-    For each team, calls /teams/{re_id}/events?season[]=SEASON_ID and stores
+    For each team, calls /teams/{re_id}/events?season[]={season_id} and stores
     items with PK: TEAM#{num}  SK: EVENT#{start_date}#{sku} for future or
     active events.
     """
@@ -362,15 +497,7 @@ def update_team_events(api_key: str) -> int:
     total_events = 0
 
     # Get tracked teams
-    resp = table.query(
-        IndexName='GSI1',
-        KeyConditionExpression=(
-            Key('GSI1PK').eq(f'SEASON#{SEASON_ID}') &
-            Key('GSI1SK').begins_with('RANK#')
-        ),
-        Limit=200
-    )
-    teams = resp.get('Items', [])
+    teams = ranked_teams(season_id, 200)
     logger.info(f"Fetching event registrations for {len(teams)} teams...")
 
     for team in teams:
@@ -382,7 +509,7 @@ def update_team_events(api_key: str) -> int:
         re_id = int(re_id)
 
         events_data = api_request(
-            f"{RE_API_BASE}/teams/{re_id}/events?season[]={SEASON_ID}&per_page=100",
+            f"{RE_API_BASE}/teams/{re_id}/events?season[]={season_id}&per_page=100",
             api_key
         )
         if not events_data or 'data' not in events_data:
@@ -444,26 +571,18 @@ def update_team_events(api_key: str) -> int:
     return total_events
 
 
-def update_awards(api_key: str) -> int:
+def update_awards(api_key: str, season_id: int) -> int:
     """Fetch awards for tracked teams from RobotEvents API.
 
-    For each team, calls /teams/{re_id}/awards?season[]={SEASON_ID} and stores:
+    For each team, calls /teams/{re_id}/awards?season[]={season_id} and stores:
       1. Individual items:  PK: TEAM#{num}  SK: AWARD#{sku}#{award_id}
-      2. Compact summary list on team METADATA for quick card display.
+      2. Compact summary list on the team's season item for quick card display.
     """
     import time
     total_awards = 0
 
     # Get tracked teams
-    resp = table.query(
-        IndexName='GSI1',
-        KeyConditionExpression=(
-            Key('GSI1PK').eq(f'SEASON#{SEASON_ID}') &
-            Key('GSI1SK').begins_with('RANK#')
-        ),
-        Limit=200
-    )
-    teams = resp.get('Items', [])
+    teams = ranked_teams(season_id, 200)
     logger.info(f"Fetching awards for {len(teams)} teams...")
 
     for team in teams:
@@ -475,7 +594,7 @@ def update_awards(api_key: str) -> int:
         re_id = int(re_id)
 
         awards_data = api_request(
-            f"{RE_API_BASE}/teams/{re_id}/awards?season[]={SEASON_ID}&per_page=250",
+            f"{RE_API_BASE}/teams/{re_id}/awards?season[]={season_id}&per_page=250",
             api_key
         )
         if not awards_data or 'data' not in awards_data:
@@ -522,17 +641,17 @@ def update_awards(api_key: str) -> int:
             except Exception as e:
                 logger.error(f"Error writing award TEAM#{team_num}/AWARD#{sku}#{award_id}: {e}")
 
-            # Build compact summary for METADATA
+            # Build compact summary for the season item
             summary = {'title': title, 'event_name': evt_name, 'sku': sku}
             if qualifications:
                 summary['qualifications'] = qualifications
             team_awards_summary.append(summary)
 
-        # Update team METADATA with compact awards list
+        # Update the team's season item with compact awards list
         if team_awards_summary:
             try:
                 table.update_item(
-                    Key={'PK': f'TEAM#{team_num}', 'SK': 'METADATA'},
+                    Key={'PK': f'TEAM#{team_num}', 'SK': f'SEASON#{season_id}'},
                     UpdateExpression="SET awards = :awards",
                     ExpressionAttributeValues={
                         ':awards': team_awards_summary
@@ -549,138 +668,49 @@ def update_awards(api_key: str) -> int:
 
 def _write_event_match_item(match: dict, sku: str, evt_name: str, evt_meta: dict = None):
     """Write the event-owned source-of-truth match item.
-    PK: EVENT#{sku}  SK: MATCH#{div_id}#{match_num:04d}
+    PK: EVENT#{sku}  SK: MATCH#{div_id}#{round}#{instance:02d}#{match_num:04d}
     """
     if evt_meta is None: evt_meta = {}
-    div_id = match.get('division', {}).get('id', 1)
-    match_num = match.get('matchnum', 0)
-    round_num = match.get('round', 0)
-    instance = match.get('instance', 0)
-    round_names = {1: 'Practice', 2: 'Qualification', 3: 'Quarterfinal', 4: 'Semifinal', 5: 'Final', 6: 'Round of 16'}
-    round_name = round_names.get(round_num, f'Round {round_num}')
-
-    alliances = match.get('alliances', [])
-    red = next((a for a in alliances if a.get('color') == 'red'), {})
-    blue = next((a for a in alliances if a.get('color') == 'blue'), {})
-    red_teams = [t.get('team', {}).get('name', '') for t in red.get('teams', [])]
-    blue_teams = [t.get('team', {}).get('name', '') for t in blue.get('teams', [])]
-    red_score = red.get('score')
-    blue_score = blue.get('score')
-
-    match_sk = f"MATCH#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
-    item = {
-        'PK': f'EVENT#{sku}',
-        'SK': match_sk,
-        'sku': sku,
-        'event_name': evt_name,
-        'division_id': Decimal(str(div_id)),
-        'match_num': Decimal(str(match_num)),
-        'round': round_name,
-        'instance': Decimal(str(instance)),
-        'field': match.get('field', ''),
-        'scheduled': match.get('scheduled', ''),
-        'started': match.get('started', ''),
-        'red_teams': red_teams,
-        'blue_teams': blue_teams,
-        'red_score': Decimal(str(red_score)) if red_score is not None else None,
-        'blue_score': Decimal(str(blue_score)) if blue_score is not None else None,
-        'updated_at': datetime.now(timezone.utc).isoformat()
-    }
-    item = {k: v for k, v in item.items() if v is not None}
+    item = ingest.event_match_item(match, sku, evt_name)
+    match_sk = item['SK']
     try:
         existing = table.get_item(Key={'PK': item['PK'], 'SK': item['SK']}).get('Item')
         if existing and 'video_url' in existing:
             item['video_url'] = existing['video_url']
             
         table.put_item(Item=item)
-        
-        # Increment match_count on the metadata item
-        table.update_item(
-            Key={'PK': f'EVENT#{sku}', 'SK': 'METADATA'},
-            UpdateExpression="ADD match_count :inc",
-            ExpressionAttributeValues={':inc': Decimal('1')}
-        )
-
-        # Increment match_count on the seasonal event item (used in lists)
-        start_date = evt_meta.get('start')
-        if start_date:
-            table.update_item(
-                Key={'PK': f'SEASON#{SEASON_ID}', 'SK': f'EVENT#{start_date}#{sku}'},
-                UpdateExpression="ADD match_count :inc",
-                ExpressionAttributeValues={':inc': Decimal('1')}
-            )
+        if not existing or _score_state(existing) != _score_state(item):
+            feed.queue_item(item)
+        # match_count and team stats follow from the stream (stream_consumer.py)
     except Exception as e:
         logger.error(f"Error writing event match {sku}/{match_sk}: {e}")
 
 def _write_team_match_item(match: dict, sku: str, evt_name: str, team_num: str, evt_meta: dict = None):
     """Write the team reverse-lookup match item.
-    PK: TEAM#{num}  SK: MATCH#{sku}#{div_id}#{match_num:04d}
+    PK: TEAM#{num}  SK: MATCH#{sku}#{div_id}#{round}#{instance:02d}#{match_num:04d}
     """
-    if evt_meta is None: evt_meta = {}
-    div_id = match.get('division', {}).get('id', 1)
-    match_num = match.get('matchnum', 0)
-    round_num = match.get('round', 0)
-    instance = match.get('instance', 0)
-    round_names = {1: 'Practice', 2: 'Qualification', 3: 'Quarterfinal', 4: 'Semifinal', 5: 'Final', 6: 'Round of 16'}
-    round_name = round_names.get(round_num, f'Round {round_num}')
-
-    alliances = match.get('alliances', [])
-    red = next((a for a in alliances if a.get('color') == 'red'), {})
-    blue = next((a for a in alliances if a.get('color') == 'blue'), {})
-    red_teams = [t.get('team', {}).get('name', '') for t in red.get('teams', [])]
-    blue_teams = [t.get('team', {}).get('name', '') for t in blue.get('teams', [])]
-    red_score = red.get('score')
-    blue_score = blue.get('score')
-
-    alliance_color = 'red' if team_num in red_teams else 'blue'
-    my_score = red_score if alliance_color == 'red' else blue_score
-    opp_score = blue_score if alliance_color == 'red' else red_score
-    partner_teams = red_teams if alliance_color == 'red' else blue_teams
-    opponent_teams = blue_teams if alliance_color == 'red' else red_teams
-    won = (my_score is not None and opp_score is not None and int(my_score) > int(opp_score))
-
-    team_match_sk = f"MATCH#{sku}#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
-    item = {
-        'PK': f'TEAM#{team_num}',
-        'SK': team_match_sk,
-        'sku': sku,
-        'event_name': evt_name,
-        'division_id': Decimal(str(div_id)),
-        'match_num': Decimal(str(match_num)),
-        'round': round_name,
-        'instance': Decimal(str(instance)),
-        'alliance': alliance_color,
-        'partner_teams': [t for t in partner_teams if t != team_num],
-        'opponent_teams': opponent_teams,
-        'my_score': Decimal(str(my_score)) if my_score is not None else None,
-        'opp_score': Decimal(str(opp_score)) if opp_score is not None else None,
-        'won': won,
-        'scheduled': match.get('scheduled', ''),
-        'event_start': evt_meta.get('start'),
-        'event_end': evt_meta.get('end'),
-        'event_location': evt_meta.get('location'),
-        'updated_at': datetime.now(timezone.utc).isoformat()
-    }
-    item = {k: v for k, v in item.items() if v is not None}
+    item = ingest.team_match_item(match, team_num, sku, evt_name, evt_meta)
+    team_match_sk = item['SK']
     try:
         existing = table.get_item(Key={'PK': item['PK'], 'SK': item['SK']}).get('Item')
         if existing and 'video_url' in existing:
             item['video_url'] = existing['video_url']
             
         table.put_item(Item=item)
+        if not existing or (existing.get('my_score'), existing.get('opp_score')) != (item.get('my_score'), item.get('opp_score')):
+            feed.queue_item(item)
     except Exception as e:
         logger.error(f"Error writing team match TEAM#{team_num}/{team_match_sk}: {e}")
 
 
 
-def fetch_worlds_teams(api_key: str, season_id: int) -> set:
-    """Fetch the set of team numbers registered for the World Championship."""
-    qualified_teams = set()
+def fetch_worlds_teams(api_key: str, season_id: int) -> Dict[str, str]:
+    """Fetch the team numbers registered for the World Championship, mapped to their grade."""
+    qualified_teams: Dict[str, str] = {}
     
     # Priority: use specific SKUs if provided via environment variable
     if WORLDS_SKUS:
-        skus = [s.strip() for s in WORLDS_SKUS.split(',') if s.strip()]
-        for sku in skus:
+        for sku in worlds_skus(season_id):
             logger.info(f"Fetching teams for specific Worlds SKU: {sku}")
             
             # Step 1: Resolve SKU to event ID via /events?sku[]=...
@@ -707,7 +737,7 @@ def fetch_worlds_teams(api_key: str, season_id: int) -> set:
                     break
                 for team in teams_data['data']:
                     team_num = team.get('number')
-                    if team_num: qualified_teams.add(team_num)
+                    if team_num: qualified_teams[team_num] = team.get('grade', '')
                 last_page = teams_data.get('meta', {}).get('last_page', 1)
                 page += 1
         
@@ -753,7 +783,7 @@ def fetch_worlds_teams(api_key: str, season_id: int) -> set:
                 
             for team in teams_data['data']:
                 team_num = team.get('number')
-                if team_num: qualified_teams.add(team_num)
+                if team_num: qualified_teams[team_num] = team.get('grade', '')
                 
             last_page = teams_data.get('meta', {}).get('last_page', 1)
             page += 1
@@ -761,93 +791,317 @@ def fetch_worlds_teams(api_key: str, season_id: int) -> set:
     logger.info(f"Found {len(qualified_teams)} Worlds qualified teams.")
     return qualified_teams
 
-def update_top_teams(api_key: str, worlds_teams: set = None):
-    """Fetch top teams from Skills for both Middle and High School."""
+def query_shards(partitions: List[str], condition, sort_key: str, limit: int = None, **kwargs) -> List[dict]:
+    """Scatter-gather: query every shard in parallel and merge their ordered results by sort_key.
+
+    `condition(pk)` builds one shard's key condition. Each shard reads at most
+    `limit` items, which is all a merged top-`limit` can need.
+    """
+    def read(pk):
+        items, query = [], dict(kwargs, KeyConditionExpression=condition(pk))
+        while True:
+            if limit:
+                query['Limit'] = limit - len(items)
+            resp = table.query(**query)
+            items.extend(resp.get('Items', []))
+            if 'LastEvaluatedKey' not in resp or (limit and len(items) >= limit):
+                return items
+            query['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+    with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+        results = list(pool.map(read, partitions))
+    merged = heapq.merge(*results, key=lambda item: item.get(sort_key, ''))
+    return list(islice(merged, limit)) if limit else list(merged)
+
+def season_events(season_id: int) -> List[dict]:
+    """All of a season's event items, in SK (start date) order."""
+    return query_shards(ingest.shard_partitions(f'SEASON#{season_id}'),
+                        lambda pk: Key('PK').eq(pk) & Key('SK').begins_with('EVENT#'), 'SK')
+
+def ranked_teams(season_id: int, limit: int) -> List[dict]:
+    """The top `limit` team season items of the ranking, in rank order."""
+    return query_shards(ranking_partitions(season_id),
+                        lambda pk: Key('GSI1PK').eq(pk) & Key('GSI1SK').begins_with('RANK#'),
+                        'GSI1SK', limit, IndexName='GSI1')
+
+def ranking_partitions(season_id: int) -> List[str]:
+    """GSI1PKs holding the season's ranked teams: one per shard of the published version.
+
+    As in the api-handler, a run's `building` partitions are read too: teams it
+    has already moved over (or that a failed run left there) are still ranked.
+    Versions published before sharding (no `shards` on the pointer) are a single
+    partition, and so is the unversioned SEASON#{id} from before the first run.
+    """
+    pointer = table.get_item(Key={'PK': f'SEASON#{season_id}', 'SK': RANKING_SK}).get('Item') or {}
+    version = pointer.get('version') or f'SEASON#{season_id}'
+    partitions = ingest.shard_partitions(version) if pointer.get('shards') else [version]
+    if pointer.get('building'):
+        partitions += ingest.shard_partitions(pointer['building'])
+    return partitions
+
+def start_ranking_run(season_id: int) -> str:
+    """Open a new ranking version and record it as `building` on the pointer.
+
+    Readers that want no gaps while a run moves teams over (the API) read the
+    published and the building partition together. A previous run that never
+    published is retired here so its teams are cleaned up after the next swap.
+    """
+    partition = f"SEASON#{season_id}#V{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}"
+    key = {'PK': f'SEASON#{season_id}', 'SK': RANKING_SK}
+    abandoned = (table.get_item(Key=key).get('Item') or {}).get('building')
+    update = "SET building = :p"
+    values = {':p': partition}
+    if abandoned:
+        update += " ADD retired :old"
+        values[':old'] = {abandoned}
+    table.update_item(Key=key, UpdateExpression=update, ExpressionAttributeValues=values)
+    return partition
+
+def publish_ranking(season_id: int, partition: str):
+    """Swap the pointer to `partition` in one conditional write and retire the old version."""
+    key = {'PK': f'SEASON#{season_id}', 'SK': RANKING_SK}
+    try:
+        old = table.update_item(
+            Key=key,
+            UpdateExpression="SET version = :p, shards = :n, published_at = :now REMOVE building",
+            ConditionExpression="attribute_not_exists(version) OR version < :p",
+            ExpressionAttributeValues={':p': partition, ':n': ingest.SEASON_SHARDS,
+                                       ':now': datetime.now(timezone.utc).isoformat()},
+            ReturnValues='ALL_OLD'
+        ).get('Attributes', {})
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        logger.warning(f"Ranking {partition} is older than the published one; not swapped")
+        return
+    previous = old.get('version') or f'SEASON#{season_id}'
+    table.update_item(Key=key, UpdateExpression="ADD retired :old", ExpressionAttributeValues={':old': {previous}})
+    logger.info(f"Ranking published: {partition} (was {previous})")
+    retire_rankings(season_id)
+
+def retire_rankings(season_id: int):
+    """Drop the GSI1 keys of teams left behind in retired ranking versions.
+
+    Teams still ranked were moved to the new version by their own write, so what
+    remains in a retired partition is exactly the teams that fell out of the top.
+    """
+    key = {'PK': f'SEASON#{season_id}', 'SK': RANKING_SK}
+    pointer = table.get_item(Key=key).get('Item') or {}
+    live = {pointer.get('version'), pointer.get('building')}
+    for partition in pointer.get('retired', set()) - live:
+        removed = 0
+        # Leftovers sit in the version's shards, or in the version itself if it predates sharding
+        for gsi_pk in [partition] + ingest.shard_partitions(partition):
+            kwargs = {'IndexName': 'GSI1', 'KeyConditionExpression': Key('GSI1PK').eq(gsi_pk),
+                      'ProjectionExpression': 'PK, SK'}
+            while True:
+                resp = table.query(**kwargs)
+                for item in resp.get('Items', []):
+                    try:
+                        table.update_item(
+                            Key={'PK': item['PK'], 'SK': item['SK']},
+                            UpdateExpression="REMOVE GSI1PK, GSI1SK",
+                            ConditionExpression="GSI1PK = :old",
+                            ExpressionAttributeValues={':old': gsi_pk}
+                        )
+                        removed += 1
+                    except table.meta.client.exceptions.ConditionalCheckFailedException:
+                        pass  # re-ranked since the query
+                if 'LastEvaluatedKey' not in resp:
+                    break
+                kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+        table.update_item(Key=key, UpdateExpression="DELETE retired :old", ExpressionAttributeValues={':old': {partition}})
+        logger.info(f"Retired ranking {partition}: {removed} team(s) unranked")
+
+def fetch_skills_leaderboard(url: str, api_key: str, grade: str, worlds_teams: Dict[str, str]) -> Optional[list]:
+    """Entries of one grade's skills leaderboard that update_top_teams keeps.
+
+    The leaderboard is thousands of entries in rank order; it is stream-parsed
+    and the download stops once the top SKILLS_TOP_N are in and every Worlds team
+    of this grade has been seen (teams of unknown grade keep it reading to the end).
+    Returns None if the fetch failed or came back empty.
+    """
+    pending = {n for n, g in worlds_teams.items() if not g or g == grade}
+    kept, seen = [], 0
+    try:
+        for i, entry in enumerate(api_stream_array(url, api_key)):
+            seen = i + 1
+            team_num = entry.get('team', {}).get('team')
+            pending.discard(team_num)
+            if i < SKILLS_TOP_N or team_num in worlds_teams:
+                kept.append(entry)
+            elif not pending:
+                break
+    except Exception as e:
+        logger.warning(f"Skills fetch failed for {grade}: {e}")
+        return None
+    logger.info(f"Skills {grade}: kept {len(kept)} of the first {seen} entries")
+    return kept or None
+
+def update_top_teams(api_key: str, season_id: int, worlds_teams: Dict[str, str] = None):
+    """Fetch a season's top teams from Skills for both Middle and High School.
+
+    Team identity (name, organization, location, re_id) goes on TEAM#{num} / METADATA;
+    the season's rank, skills and stats go on TEAM#{num} / SEASON#{id}, which is what
+    GSI1 indexes, so seasons never overwrite each other.
+    """
+    worlds_teams = worlds_teams or {}
     # Define endpoints for both grade levels
     endpoints = [
-        ("Middle School", "https://www.robotevents.com/api/seasons/197/skills?post_season=0&grade_level=Middle%20School"),
-        ("High School", "https://www.robotevents.com/api/seasons/197/skills?post_season=0&grade_level=High%20School")
+        ("Middle School", f"https://www.robotevents.com/api/seasons/{season_id}/skills?post_season=0&grade_level=Middle%20School"),
+        ("High School", f"https://www.robotevents.com/api/seasons/{season_id}/skills?post_season=0&grade_level=High%20School")
     ]
     
     total_teams = 0
+    complete_grades = 0
+    partition = start_ranking_run(season_id)
+
+    # Download both grades at once; the writes below stay on this thread
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        leaderboards = list(pool.map(
+            lambda endpoint: fetch_skills_leaderboard(endpoint[1], api_key, endpoint[0], worlds_teams), endpoints))
     
-    for grade, url in endpoints:
-        try:
-            logger.info(f"Fetching {grade} skills from: {url}")
-            data = api_request(url, api_key)
-            
-            if isinstance(data, list) and len(data) > 0:
-                logger.info(f"Fetched {len(data)} teams for {grade}")
-                
-                # Process top 150 for each grade + any Worlds Qualified team to ensure they appear
-                for i, entry in enumerate(data):
-                    team_info = entry.get('team', {})
-                    team_num = team_info.get('team')
-                    scores = entry.get('scores', {})
-                    
-                    is_worlds = team_num in (worlds_teams or set())
-                    if i >= 150 and not is_worlds:
-                        continue
-                        
-                    rank = entry.get('rank')
-                    score = scores.get('score')
-                    
-                    # Check for required fields
-                    if not team_num or rank is None: 
-                        continue
-
-                    # Create unique GSI1SK for combined ranking list if needed, 
-                    # or just use standard rank. We'll use grade in SK to differentiate if sorting by grade.
-                    # For now, we store them all.
-                    
-                    item = {
-                        'PK': f'TEAM#{team_num}',
-                        'SK': 'METADATA',
-                        'GSI1PK': f'SEASON#{SEASON_ID}',
-                        'GSI1SK': f'RANK#{rank:04d}#TEAM#{team_num}',
-                        'number': team_num,
-                        're_id': team_info.get('id'),  # numeric RobotEvents team ID
-                        'name': team_info.get('teamName'),
-                        'organization': team_info.get('organization'),
-                        'region': team_info.get('region'),
-                        'country': team_info.get('country'),
-                        'grade': team_info.get('gradeLevel'),
-                        'worlds_qualified': team_num in (worlds_teams or set()),
-                        'location': {
-                            'city': team_info.get('city'),
-                            'region': team_info.get('region'),
-                            'country': team_info.get('country')
-                        },
-                        'skills': {
-                            'combined_score': Decimal(str(score)) if score is not None else Decimal(0),
-                            'rank': Decimal(str(rank)),
-                            'driver': Decimal(str(scores.get('driver', 0))),
-                            'programming': Decimal(str(scores.get('programming', 0)))
-                        },
-                        'stats': {
-                            'rank': Decimal(str(rank)),
-                            'wins': Decimal('0'),
-                            'losses': Decimal('0'),
-                            'ties': Decimal('0'),
-                            'total_matches': Decimal('0'),
-                            'wp': Decimal('0'),
-                            'ap': Decimal('0'),
-                            'sp': Decimal('0')
-                        },
-                        'updated_at': datetime.now(timezone.utc).isoformat()
-                    }
-                    
-                    table.put_item(Item=item)
-                    total_teams += 1
+    for (grade, url), data in zip(endpoints, leaderboards):
+        if not data:
+            continue
+        logger.info(f"Fetched {len(data)} teams for {grade}")
+        
+        # Top SKILLS_TOP_N for each grade + any Worlds Qualified team to ensure they appear
+        for entry in data:
+            team_info = entry.get('team', {})
+            team_num = team_info.get('team')
+            scores = entry.get('scores', {})
                 
-        except Exception as e:
-            logger.warning(f"Skills fetch failed for {grade}: {e}")
+            rank = entry.get('rank')
+            score = scores.get('score')
+            
+            # Check for required fields
+            if not team_num or rank is None: 
+                continue
+
+            identity = {
+                'number': team_num,
+                're_id': team_info.get('id'),  # numeric RobotEvents team ID
+                'name': team_info.get('teamName'),
+                'organization': team_info.get('organization'),
+                'region': team_info.get('region'),
+                'country': team_info.get('country'),
+                'grade': team_info.get('gradeLevel'),
+                'location': {
+                    'city': team_info.get('city'),
+                    'region': team_info.get('region'),
+                    'country': team_info.get('country')
+                },
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            }
+            _upsert_item({'PK': f'TEAM#{team_num}', 'SK': 'METADATA', **identity})
+
+            # The season item carries the identity too, so a GSI1 listing is a full team card
+            item = {
+                'PK': f'TEAM#{team_num}',
+                'SK': f'SEASON#{season_id}',
+                'GSI1PK': f'{partition}#S{ingest.shard_of(team_num)}',
+                'GSI1SK': f'RANK#{rank:04d}#TEAM#{team_num}',
+                **identity,
+                'season_id': season_id,
+                'worlds_qualified': team_num in worlds_teams,
+                'skills': {
+                    'combined_score': Decimal(str(score)) if score is not None else Decimal(0),
+                    'rank': Decimal(str(rank)),
+                    'driver': Decimal(str(scores.get('driver', 0))),
+                    'programming': Decimal(str(scores.get('programming', 0)))
+                }
+            }
+
+            # W-L-T/WP accumulate from the stream (stream_consumer.py); only seed them here
+            _upsert_item(item, init={'stats': {
+                'wins': Decimal('0'),
+                'losses': Decimal('0'),
+                'ties': Decimal('0'),
+                'total_matches': Decimal('0'),
+                'wp': Decimal('0'),
+                'ap': Decimal('0'),
+                'sp': Decimal('0')
+            }})
+            # Rank is this run's, not an accumulator: a separate SET, since the
+            # if_not_exists above and a stats.rank path can't share one expression
+            table.update_item(
+                Key={'PK': item['PK'], 'SK': item['SK']},
+                UpdateExpression="SET stats.#rank = :rank",
+                ExpressionAttributeNames={'#rank': 'rank'},
+                ExpressionAttributeValues={':rank': Decimal(str(rank))}
+            )
+            total_teams += 1
+        complete_grades += 1
 
     logger.info(f"Total teams updated: {total_teams}")
 
-    # Fallback to basic team fetch if needed
-    logger.info("Falling back to basic team list fetch")
-    # ... fallback logic (keep existing if desired, or simpler)
+    # Only a run that covered every grade replaces the published ranking
+    if complete_grades == len(endpoints):
+        publish_ranking(season_id, partition)
+    else:
+        logger.warning(f"Ranking {partition} incomplete ({complete_grades}/{len(endpoints)} grades); not published")
+
+def iter_json_array(stream, chunk_size: int = STREAM_CHUNK):
+    """Yield the objects of a top-level JSON array as the bytes arrive.
+
+    Only the undecoded tail is held in memory, so a caller that stops early
+    never reads (or decodes) the rest of the response.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buf, pos, eof, opened = '', 0, False, False
+    while True:
+        while pos < len(buf) and (buf[pos] in ' \t\r\n' or (opened and buf[pos] == ',')):
+            pos += 1
+        if pos < len(buf):
+            if not opened:
+                if buf[pos] != '[':
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 40]!r}")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A number cut by the chunk boundary also decodes ('123' of '12345',
+                # '-9' of '-9.5'): only accept one that something other than a number
+                # character follows, or that ends the stream
+                if eof or (end < len(buf) and buf[end] not in NUMBER_CHARS):
+                    pos = end
+                    yield value
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise ValueError("JSON array ended early")
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+
+def api_stream_array(url: str, api_key: str, max_retries: int = 3):
+    """Like api_request for endpoints that return a bare JSON array, but yields entries as they stream in."""
+    import time
+    req = urllib.request.Request(url, headers={
+        'Authorization': f'Bearer {api_key}',
+        'Accept': 'application/json',
+        'User-Agent': 'Vex5Hub/1.0 (internal-tool)'
+    })
+    for attempt in range(max_retries):
+        try:
+            resp = urllib.request.urlopen(req, timeout=15)
+        except urllib.error.HTTPError as e:
+            if e.code != 429:
+                raise
+            wait = 5 * (2 ** attempt)  # 5s, 10s, 20s
+            logger.warning(f"Rate limited (429) on {url}, waiting {wait}s (attempt {attempt+1}/{max_retries})")
+            time.sleep(wait)
+            continue
+        with resp:
+            yield from iter_json_array(resp)
+        return
+    raise RuntimeError(f"Max retries exceeded for {url}")
 
 def api_request(url: str, api_key: str, max_retries: int = 3) -> Optional[dict]:
     import time
@@ -0,0 +1,379 @@
+"""Shared RobotEvents match -> DynamoDB item transformation.
+
+Used by the content-updater Lambda (packaged alongside index.py) and by the
+scripts in scripts/, which add this directory to sys.path. Keeps the round-name
+map, the alliance split and the SK formats in one place:
+
+  Event item:  PK: EVENT#{sku}  SK: MATCH#{div_id}#{round}#{instance:02d}#{match_num:04d}
+  Team item:   PK: TEAM#{num}   SK: MATCH#{sku}#{div_id}#{round}#{instance:02d}#{match_num:04d}
+"""
+
+import json
+import sys
+import zlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ROUND_NAMES = {1: 'Practice', 2: 'Qualification', 3: 'Quarterfinal', 4: 'Semifinal', 5: 'Final', 6: 'Round of 16'}
+ROUND_NUMBERS = {name: num for num, name in ROUND_NAMES.items()}
+
+BATCH_SIZE = 25  # BatchWriteItem limit
+
+# RobotEvents season ID -> the year in that season's event SKUs (RE-V5RC-25-0147 is season 197)
+SEASON_SKU_YEARS = {190: '24', 197: '25'}
+SKU_YEAR_SEASONS = {year: season for season, year in SEASON_SKU_YEARS.items()}
+
+# Season partitions are write-sharded: events live under SEASON#{id}#S{n} and each
+# ranking version under {version}#S{n}, n = crc32(sku or team number) % SEASON_SHARDS.
+# Changing this needs a re-shard (scripts/shard_season.py); the api-handler keeps a copy.
+SEASON_SHARDS = 4
+
+
+class MatchRecord:
+    """Compact stand-in for a RobotEvents match dict.
+
+    Keeps only the fields ingestion and link generation use, in slots rather than
+    nested alliance/team/event dicts, with team numbers, SKUs and event names
+    interned so thousands of matches share one copy of each string. Also accepts
+    match_links.json entries (match_id/match_name/division_id/video_url).
+    get() mirrors dict.get for the flat API keys, so records can be passed
+    anywhere a match dict is read.
+    """
+
+    __slots__ = ('id', 'name', 'sku', 'event_id', 'event_name', 'division_id', 'round', 'instance',
+                 'matchnum', 'field', 'scheduled', 'started', 'red_teams', 'blue_teams',
+                 'red_team_ids', 'blue_team_ids', 'red_score', 'blue_score', 'video_url', '_started_ts')
+
+    @classmethod
+    def from_api(cls, m: dict) -> 'MatchRecord':
+        rec = cls()
+        evt = m.get('event') or {}
+        rec.id = m.get('id', m.get('match_id'))
+        rec.name = m.get('name', m.get('match_name'))
+        rec.sku = sys.intern(evt.get('code') or evt.get('sku') or '')
+        rec.event_id = evt.get('id')
+        rec.event_name = sys.intern(evt.get('name') or '')
+        rec.division_id = match_division_id(m)
+        rec.round = m.get('round', 0)
+        rec.instance = m.get('instance', 0)
+        rec.matchnum = m.get('matchnum', 0)
+        rec.field = m.get('field', '')
+        rec.scheduled = m.get('scheduled', '')
+        rec.started = m.get('started', '')
+        rec.red_teams = rec.blue_teams = rec.red_team_ids = rec.blue_team_ids = ()
+        rec.red_score = rec.blue_score = None
+        for alliance in m.get('alliances') or []:
+            teams = [t.get('team') or {} for t in alliance.get('teams', [])]
+            names = tuple(sys.intern(t.get('name') or '') for t in teams)
+            ids = tuple(t.get('id') for t in teams)
+            if alliance.get('color') == 'red' and not rec.red_teams:
+                rec.red_teams, rec.red_team_ids, rec.red_score = names, ids, alliance.get('score')
+            elif alliance.get('color') == 'blue' and not rec.blue_teams:
+                rec.blue_teams, rec.blue_team_ids, rec.blue_score = names, ids, alliance.get('score')
+        rec.video_url = m.get('video_url')
+        rec._started_ts = None
+        return rec
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ and not key.startswith('_') else None
+        return default if value is None else value
+
+    @property
+    def started_ts(self) -> Optional[float]:
+        """`started` as epoch seconds, parsed once."""
+        if self._started_ts is None and self.started:
+            self._started_ts = datetime.fromisoformat(self.started.replace('Z', '+00:00')).timestamp()
+        return self._started_ts
+
+    def alliances(self) -> List[dict]:
+        """Alliances in the RobotEvents list shape."""
+        return [
+            {'color': color, 'score': score,
+             'teams': [{'team': {'id': tid, 'name': name}} for name, tid in zip(names, ids)]}
+            for color, names, ids, score in (('red', self.red_teams, self.red_team_ids, self.red_score),
+                                             ('blue', self.blue_teams, self.blue_team_ids, self.blue_score))
+        ]
+
+    def to_api(self) -> dict:
+        """Rebuild a RobotEvents-shaped match dict (for collected_matches.json and match links)."""
+        match = {
+            'id': self.id,
+            'event': {'id': self.event_id, 'name': self.event_name, 'code': self.sku},
+            'division': {'id': self.division_id},
+            'round': self.round,
+            'instance': self.instance,
+            'matchnum': self.matchnum,
+            'scheduled': self.scheduled,
+            'started': self.started,
+            'field': self.field,
+            'name': self.name,
+            'alliances': self.alliances(),
+        }
+        if self.video_url:
+            match['video_url'] = self.video_url
+        return match
+
+    def __repr__(self):
+        return f"MatchRecord({self.sku} div {self.division_id} {self.name!r})"
+
+
+def match_object_hook(obj: dict):
+    """json object_hook that turns match objects into MatchRecords as they are parsed.
+
+    Hooks run innermost-first, so each match's nested team/alliance/event dicts
+    are dropped as soon as its record is built instead of living for the whole load.
+    """
+    if 'matchnum' in obj and 'alliances' in obj:
+        return MatchRecord.from_api(obj)
+    return obj
+
+
+def load_match_records(path: str) -> Dict[str, MatchRecord]:
+    """Load collected_matches.json, match_links.json or a match list as {match_id: MatchRecord}."""
+    with open(path) as f:
+        data = json.load(f, object_hook=match_object_hook)
+    if isinstance(data, dict) and 'matches' in data:
+        data = data['matches']
+    if isinstance(data, dict):
+        return {str(k): v for k, v in data.items() if isinstance(v, MatchRecord)}
+    return {str(rec.id): rec for rec in data if isinstance(rec, MatchRecord)}
+
+
+def round_name(round_num: int) -> str:
+    return ROUND_NAMES.get(round_num, f'Round {round_num}')
+
+
+def event_match_sk(div_id: int, round_num: int, instance: int, match_num: int) -> str:
+    return f"MATCH#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
+
+
+def team_match_sk(sku: str, div_id: int, round_num: int, instance: int, match_num: int) -> str:
+    return f"MATCH#{sku}#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
+
+
+def sku_season(sku: str) -> Optional[int]:
+    """Season ID for an event SKU, or None if its year is not in SEASON_SKU_YEARS."""
+    parts = sku.split('-')
+    return SKU_YEAR_SEASONS.get(parts[2]) if len(parts) > 3 else None
+
+
+def shard_of(key: str) -> int:
+    return zlib.crc32(key.encode()) % SEASON_SHARDS
+
+
+def shard_partitions(base: str) -> List[str]:
+    """Every shard of a sharded partition key."""
+    return [f"{base}#S{n}" for n in range(SEASON_SHARDS)]
+
+
+def season_event_pk(season_id: int, sku: str) -> str:
+    """PK of a season's event item: SEASON#{id}#S{shard of the sku}."""
+    return f"SEASON#{season_id}#S{shard_of(sku)}"
+
+
+def match_sku(match) -> str:
+    """SKU from a match payload (API matches use event.code, match_links.json uses event.sku)."""
+    if isinstance(match, MatchRecord):
+        return match.sku
+    evt = match.get('event') or {}
+    return evt.get('code') or evt.get('sku') or ''
+
+
+def match_event_name(match) -> str:
+    if isinstance(match, MatchRecord):
+        return match.event_name
+    return (match.get('event') or {}).get('name', '')
+
+
+def match_division_id(match) -> int:
+    if isinstance(match, MatchRecord):
+        return match.division_id
+    division = match.get('division')
+    if isinstance(division, dict) and division.get('id') is not None:
+        return division['id']
+    return match.get('division_id') or 1
+
+
+def event_meta(event: dict) -> dict:
+    """Start/end/location denormalized onto team match items, from an event payload or SEASON# item."""
+    loc = event.get('location') or {}
+    loc_str = ", ".join(filter(None, [loc.get('city'), loc.get('region'), loc.get('country')]))
+    return {'start': event.get('start'), 'end': event.get('end'), 'location': loc_str}
+
+
+def split_alliances(match):
+    """Return (red_teams, blue_teams, red_score, blue_score) for a match."""
+    if isinstance(match, MatchRecord):
+        return list(match.red_teams), list(match.blue_teams), match.red_score, match.blue_score
+    red_teams, blue_teams = [], []
+    red_score = blue_score = None
+    for alliance in match.get('alliances') or []:
+        color = alliance.get('color')
+        if color == 'red' and not red_teams:
+            red_teams = [t.get('team', {}).get('name', '') for t in alliance.get('teams', [])]
+            red_score = alliance.get('score')
+        elif color == 'blue' and not blue_teams:
+            blue_teams = [t.get('team', {}).get('name', '') for t in alliance.get('teams', [])]
+            blue_score = alliance.get('score')
+    return red_teams, blue_teams, red_score, blue_score
+
+
+WIN_POINTS = {'wins': 2, 'ties': 1, 'losses': 0}  # standard WP scoring
+STAT_FIELDS = ('wins', 'losses', 'ties', 'total_matches', 'wp')
+
+
+def match_results(item: Optional[dict]) -> Dict[str, str]:
+    """team -> 'wins' | 'losses' | 'ties' for a played event match item; empty if unplayed."""
+    if not item:
+        return {}
+    red_score, blue_score = item.get('red_score'), item.get('blue_score')
+    if red_score is None or blue_score is None:
+        return {}
+    if not item.get('started') and red_score == 0 and blue_score == 0:
+        return {}  # scheduled match with placeholder zeros
+    red = 'wins' if red_score > blue_score else 'losses' if red_score < blue_score else 'ties'
+    blue = {'wins': 'losses', 'losses': 'wins', 'ties': 'ties'}[red]
+    results = {t: red for t in item.get('red_teams', []) if t}
+    results.update({t: blue for t in item.get('blue_teams', []) if t})
+    return results
+
+
+def team_season_stats(items: Iterable[dict]) -> Dict[tuple, Dict[str, int]]:
+    """(team, season_id) -> W-L-T/total_matches/wp recomputed from event match items.
+
+    The same outcomes the stream consumer folds as deltas, so a full recompute
+    and the stream agree on what counts.
+    """
+    stats: Dict[tuple, Dict[str, int]] = {}
+    for item in items:
+        season_id = sku_season(item['PK'][len('EVENT#'):])
+        if season_id is None:
+            continue
+        for team, outcome in match_results(item).items():
+            team_stats = stats.setdefault((team, season_id), dict.fromkeys(STAT_FIELDS, 0))
+            team_stats[outcome] += 1
+            team_stats['total_matches'] += 1
+            team_stats['wp'] += WIN_POINTS[outcome]
+    return stats
+
+
+def _num(value) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+def _compact(item: dict) -> dict:
+    return {k: v for k, v in item.items() if v is not None}
+
+
+def event_match_item(match, sku: str = None, evt_name: str = None,
+                     div_id: int = None, updated_at: str = None) -> dict:
+    """Event-owned source-of-truth item for a match."""
+    sku = sku or match_sku(match)
+    evt_name = evt_name if evt_name is not None else match_event_name(match)
+    div_id = div_id if div_id is not None else match_division_id(match)
+    match_num = match.get('matchnum', 0)
+    round_num = match.get('round', 0)
+    instance = match.get('instance', 0)
+    red_teams, blue_teams, red_score, blue_score = split_alliances(match)
+
+    return _compact({
+        'PK': f'EVENT#{sku}',
+        'SK': event_match_sk(div_id, round_num, instance, match_num),
+        'sku': sku,
+        'event_name': evt_name,
+        'division_id': _num(div_id),
+        'match_num': _num(match_num),
+        'round': round_name(round_num),
+        'instance': _num(instance),
+        'field': match.get('field', ''),
+        'scheduled': match.get('scheduled', ''),
+        'started': match.get('started', ''),
+        'red_teams': red_teams,
+        'blue_teams': blue_teams,
+        'red_score': _num(red_score),
+        'blue_score': _num(blue_score),
+        'updated_at': updated_at or datetime.now(timezone.utc).isoformat()
+    })
+
+
+def team_match_item(match, team_num: str, sku: str = None, evt_name: str = None,
+                    evt_meta: dict = None, div_id: int = None, updated_at: str = None) -> dict:
+    """Team reverse-lookup item for one team's view of a match."""
+    evt_meta = evt_meta or {}
+    sku = sku or match_sku(match)
+    evt_name = evt_name if evt_name is not None else match_event_name(match)
+    div_id = div_id if div_id is not None else match_division_id(match)
+    match_num = match.get('matchnum', 0)
+    round_num = match.get('round', 0)
+    instance = match.get('instance', 0)
+    red_teams, blue_teams, red_score, blue_score = split_alliances(match)
+
+    alliance_color = 'red' if team_num in red_teams else 'blue'
+    my_score = red_score if alliance_color == 'red' else blue_score
+    opp_score = blue_score if alliance_color == 'red' else red_score
+    partner_teams = red_teams if alliance_color == 'red' else blue_teams
+    opponent_teams = blue_teams if alliance_color == 'red' else red_teams
+    won = (my_score is not None and opp_score is not None and int(my_score) > int(opp_score))
+
+    return _compact({
+        'PK': f'TEAM#{team_num}',
+        'SK': team_match_sk(sku, div_id, round_num, instance, match_num),
+        'sku': sku,
+        'event_name': evt_name,
+        'division_id': _num(div_id),
+        'match_num': _num(match_num),
+        'round': round_name(round_num),
+        'instance': _num(instance),
+        'alliance': alliance_color,
+        'partner_teams': [t for t in partner_teams if t != team_num],
+        'opponent_teams': opponent_teams,
+        'my_score': _num(my_score),
+        'opp_score': _num(opp_score),
+        'won': won,
+        'scheduled': match.get('scheduled', ''),
+        'event_start': evt_meta.get('start'),
+        'event_end': evt_meta.get('end'),
+        'event_location': evt_meta.get('location'),
+        'updated_at': updated_at or datetime.now(timezone.utc).isoformat()
+    })
+
+
+def match_items(match, evt_meta: dict = None, teams: Optional[set] = None,
+                sku: str = None, evt_name: str = None, div_id: int = None,
+                updated_at: str = None) -> List[dict]:
+    """Event item plus one team item per participating team (or only those in `teams`)."""
+    updated_at = updated_at or datetime.now(timezone.utc).isoformat()
+    items = [event_match_item(match, sku, evt_name, div_id, updated_at)]
+    red_teams, blue_teams, _, _ = split_alliances(match)
+    for team_num in red_teams + blue_teams:
+        if team_num and (teams is None or team_num in teams):
+            items.append(team_match_item(match, team_num, sku, evt_name, evt_meta, div_id, updated_at))
+    return items
+
+
+def transform_matches(matches: Iterable, evt_meta_by_sku: Dict[str, dict] = None,
+                      teams: Optional[set] = None, batch_size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    """Turn RobotEvents match payloads (dicts or MatchRecords) into BatchWriteItem-sized lists of items.
+
+    Each match is keyed once, so repeated matches (e.g. fetched via several teams)
+    only produce items the first time they are seen.
+    """
+    evt_meta_by_sku = evt_meta_by_sku or {}
+    updated_at = datetime.now(timezone.utc).isoformat()
+    seen = set()
+    batch: List[dict] = []
+    for match in matches:
+        sku = match_sku(match)
+        if not sku:
+            continue
+        key = (sku, match_division_id(match), match.get('round', 0), match.get('instance', 0), match.get('matchnum', 0))
+        if key in seen:
+            continue
+        seen.add(key)
+        batch.extend(match_items(match, evt_meta_by_sku.get(sku), teams, sku=sku, updated_at=updated_at))
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
@@ -0,0 +1,265 @@
+"""
+Derived aggregates from the table's change stream.
+
+Consumes DynamoDB Streams records (NEW_AND_OLD_IMAGES) for event match items
+(EVENT#{sku} / MATCH#...) and keeps the values derived from them in step, so
+the cost of maintaining them follows the number of changes, not table size:
+
+    EVENT#{sku} / METADATA, SEASON#{id}#S{n} / EVENT#{start}#{sku}
+        match_count      +1 per inserted match, -1 per removed one
+    TEAM#{num} / SEASON#{id}
+        stats            wins/losses/ties/total_matches/wp, from the change in
+                         match outcome between the old and new image
+    TEAM#{num} / MATCH#{sku}#...
+        video_url        follows the event item
+
+A batch is folded into per-key deltas first, so a match re-scored several
+times in one batch costs one write per affected key. Delivery is at-least-once;
+writes that fail are logged rather than retried. The repair paths recompute
+from the match items: scripts/sync_event_match_counts.py for counts and
+scripts/sync_team_stats.py for stats (which also covers matches written before
+a team had a season item, since the stream only ever adds to existing stats).
+
+Locally, record the stream to a change log and replay it:
+
+    python3 stream_consumer.py record --out changes.jsonl
+    python3 stream_consumer.py replay changes.jsonl --dry-run
+"""
+
+import argparse
+import json
+import logging
+import os
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+import ingest
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+TABLE_NAME = os.environ.get('TABLE_NAME')
+
+table = boto3.resource('dynamodb').Table(TABLE_NAME) if TABLE_NAME else None
+_deserializer = TypeDeserializer()
+
+
+def _image(record: dict, key: str) -> Optional[dict]:
+    raw = record.get('dynamodb', {}).get(key)
+    if not raw:
+        return None
+    return {k: _deserializer.deserialize(v) for k, v in raw.items()}
+
+
+def _is_event_match(image: Optional[dict]) -> bool:
+    return bool(image) and image.get('PK', '').startswith('EVENT#') and image.get('SK', '').startswith('MATCH#')
+
+
+class Deltas:
+    """Per-key changes folded from a batch of stream records."""
+
+    def __init__(self):
+        self.match_counts: Dict[str, int] = defaultdict(int)               # sku -> delta
+        self.stats: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))  # (team, season) -> field -> delta
+        self.videos: Dict[tuple, Optional[str]] = {}                       # (PK, SK) -> url (None removes)
+        self.records = 0
+
+    def add(self, record: dict):
+        old, new = _image(record, 'OldImage'), _image(record, 'NewImage')
+        if not (_is_event_match(old) or _is_event_match(new)):
+            return
+        self.records += 1
+        current = new or old
+        sku = current['PK'][len('EVENT#'):]
+
+        event_name = record.get('eventName')
+        if event_name == 'INSERT':
+            self.match_counts[sku] += 1
+        elif event_name == 'REMOVE':
+            self.match_counts[sku] -= 1
+
+        season_id = ingest.sku_season(sku)
+        for sign, results in ((-1, ingest.match_results(old)), (1, ingest.match_results(new))):
+            for team, outcome in results.items():
+                if season_id is None:
+                    continue
+                team_stats = self.stats[(team, season_id)]
+                team_stats[outcome] += sign
+                team_stats['total_matches'] += sign
+                team_stats['wp'] += sign * ingest.WIN_POINTS[outcome]
+
+        old_url = (old or {}).get('video_url')
+        new_url = (new or {}).get('video_url')
+        if old_url != new_url:
+            team_sk = f"MATCH#{sku}#{current['SK'][len('MATCH#'):]}"
+            for team in current.get('red_teams', []) + current.get('blue_teams', []):
+                if team:
+                    self.videos[(f'TEAM#{team}', team_sk)] = new_url
+
+    def pending(self) -> dict:
+        stats = {team: {f: d for f, d in fields.items() if d} for team, fields in self.stats.items()}
+        return {
+            'match_counts': {sku: d for sku, d in self.match_counts.items() if d},
+            'stats': {team: fields for team, fields in stats.items() if fields},
+            'videos': self.videos,
+        }
+
+
+def fold(records: Iterable[dict]) -> Deltas:
+    deltas = Deltas()
+    for record in records:
+        deltas.add(record)
+    return deltas
+
+
+def _ignore_missing(e: Exception) -> bool:
+    return getattr(e, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+def apply(deltas: Deltas, target=None) -> Dict[str, int]:
+    """Write the folded deltas. Items that do not exist are left alone."""
+    target = target or table
+    pending = deltas.pending()
+    written = defaultdict(int)
+
+    for sku, delta in pending['match_counts'].items():
+        try:
+            meta = target.update_item(
+                Key={'PK': f'EVENT#{sku}', 'SK': 'METADATA'},
+                UpdateExpression="ADD match_count :d",
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeValues={':d': Decimal(delta)},
+                ReturnValues='ALL_NEW'
+            )['Attributes']
+            written['match_counts'] += 1
+            season_id = meta.get('season_id') or ingest.sku_season(sku)
+            if meta.get('start') and season_id:
+                target.update_item(
+                    Key={'PK': ingest.season_event_pk(int(season_id), sku), 'SK': f"EVENT#{meta['start']}#{sku}"},
+                    UpdateExpression="ADD match_count :d",
+                    ConditionExpression="attribute_exists(PK)",
+                    ExpressionAttributeValues={':d': Decimal(delta)}
+                )
+        except Exception as e:
+            if not _ignore_missing(e):
+                logger.error(f"match_count {sku} ({delta:+d}) failed: {e}")
+
+    for (team, season_id), fields in pending['stats'].items():
+        names = {f'#{f}': f for f in fields}
+        values = {f':{f}': Decimal(d) for f, d in fields.items()}
+        try:
+            target.update_item(
+                Key={'PK': f'TEAM#{team}', 'SK': f'SEASON#{season_id}'},
+                UpdateExpression="ADD " + ", ".join(f"stats.#{f} :{f}" for f in fields),
+                ConditionExpression="attribute_exists(stats)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+            written['stats'] += 1
+        except Exception as e:
+            if not _ignore_missing(e):
+                logger.error(f"stats TEAM#{team}/SEASON#{season_id} {fields} failed: {e}")
+
+    for (pk, sk), url in pending['videos'].items():
+        kwargs = {'UpdateExpression': "REMOVE video_url"} if url is None else {
+            'UpdateExpression': "SET video_url = :v", 'ExpressionAttributeValues': {':v': url}}
+        try:
+            target.update_item(Key={'PK': pk, 'SK': sk}, ConditionExpression="attribute_exists(PK)", **kwargs)
+            written['videos'] += 1
+        except Exception as e:
+            if not _ignore_missing(e):
+                logger.error(f"video_url {pk}/{sk} failed: {e}")
+
+    return dict(written)
+
+
+def handler(event: dict, context: Any) -> dict:
+    """Lambda entry point for the table's stream event source mapping."""
+    deltas = fold(event.get('Records', []))
+    written = apply(deltas)
+    logger.info(f"Stream batch: {deltas.records} match record(s) -> {written}")
+    return {'records': deltas.records, 'written': written}
+
+
+# ---------------------------------------------------------------------------
+# Local use: record the stream to a change log, replay a change log
+# ---------------------------------------------------------------------------
+
+def record_stream(session, table_name: str, out_path: str) -> int:
+    """Append every record currently on the table's stream (from TRIM_HORIZON) to out_path."""
+    stream_arn = session.client('dynamodb').describe_table(TableName=table_name)['Table'].get('LatestStreamArn')
+    if not stream_arn:
+        raise SystemExit(f"{table_name} has no stream enabled")
+    streams = session.client('dynamodbstreams')
+    shards, start = [], None
+    while True:
+        desc = streams.describe_stream(StreamArn=stream_arn, **({'ExclusiveStartShardId': start} if start else {}))
+        shards += desc['StreamDescription']['Shards']
+        start = desc['StreamDescription'].get('LastEvaluatedShardId')
+        if not start:
+            break
+
+    count = 0
+    with open(out_path, 'a') as f:
+        for shard in shards:
+            iterator = streams.get_shard_iterator(StreamArn=stream_arn, ShardId=shard['ShardId'],
+                                                  ShardIteratorType='TRIM_HORIZON')['ShardIterator']
+            while iterator:
+                resp = streams.get_records(ShardIterator=iterator, Limit=1000)
+                for rec in resp['Records']:
+                    f.write(json.dumps(rec, default=str) + '\n')
+                    count += 1
+                if not resp['Records']:
+                    break  # caught up on an open shard
+                iterator = resp.get('NextShardIterator')
+    return count
+
+
+def read_change_log(path: str) -> Iterable[dict]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Derived aggregates from the table's change stream")
+    parser.add_argument("--profile", default="rdp", help="AWS profile to use")
+    parser.add_argument("--table", default="vex5hub-data", help="DynamoDB table name")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Append the table's stream records to a change log")
+    rec.add_argument("--out", default="changes.jsonl", help="Change log path (JSON lines)")
+
+    rep = sub.add_parser("replay", help="Apply a recorded change log")
+    rep.add_argument("log", help="Change log path (JSON lines of stream records)")
+    rep.add_argument("--dry-run", action="store_true", help="Print the folded deltas without writing")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        session = boto3.Session(profile_name=args.profile, region_name='ca-central-1')
+        print(f"Recorded {record_stream(session, args.table, args.out)} stream records to {args.out}")
+        return
+
+    deltas = fold(read_change_log(args.log))
+    pending = deltas.pending()
+    print(f"{deltas.records} match records -> {len(pending['match_counts'])} event counts, "
+          f"{len(pending['stats'])} team stats, {len(pending['videos'])} team video links")
+    if args.dry_run:
+        for sku, delta in sorted(pending['match_counts'].items()):
+            print(f"  EVENT#{sku}  match_count {delta:+d}")
+        for (team, season_id), fields in sorted(pending['stats'].items()):
+            print(f"  TEAM#{team}/SEASON#{season_id}  " + " ".join(f"{f} {d:+d}" for f, d in fields.items()))
+        for (pk, sk), url in sorted(pending['videos'].items()):
+            print(f"  {pk}/{sk}  video_url -> {url}")
+        return
+    session = boto3.Session(profile_name=args.profile, region_name='ca-central-1')
+    print(f"Written: {apply(deltas, session.resource('dynamodb').Table(args.table))}")
+
+
+if __name__ == "__main__":
+    main()
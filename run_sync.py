@@ -5,7 +5,7 @@ import os
 
 # add scripts directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
-from sync_event import sync_event_matches
+from sync_event import sync_events
 
 def get_api():
     session = boto3.Session(profile_name='rdp', region_name='ca-central-1')
@@ -14,9 +14,8 @@ def get_api():
 api = get_api()
 skus = ['RE-V5RC-25-0147', 'RE-V5RC-25-0011', 'RE-V5RC-25-0254']
 
-for sku in skus:
-    print(f"Syncing {sku}...")
-    sync_event_matches(sku, api, 'vex5hub-data', 'rdp')
+# All events and divisions sync concurrently under one shared API rate limit
+sync_events(skus, api, 'vex5hub-data', 'rdp')
 
 print("Uploading multi_event_links.csv to DynamoDB...")
 os.system("python3 scripts/upload_match_videos.py multi_event_links.csv")
@@ -0,0 +1,153 @@
+"""
+API Handler Cold-Start Benchmark
+
+Times what a cold Lambda container pays inside lambda/api-handler/index.py:
+importing the module, the first OPTIONS preflight, the first GET /dashboard
+(which creates the DynamoDB client) and a repeated GET (answered from the
+response cache). Each run is a fresh interpreter; the DynamoDB calls go to a
+local stub endpoint, so no AWS access is needed and the numbers are client-side
+cost only.
+
+The baseline is the same handler with the module-level setup it used to do
+(import boto3 and boto3.dynamodb.conditions, create the resource and Table), or
+with --baseline REV, the handler at that git revision.
+
+    python scripts/bench_api_cold_start.py
+    python scripts/bench_api_cold_start.py --runs 20 --baseline HEAD~1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HANDLER = os.path.join(ROOT, 'lambda', 'api-handler', 'index.py')
+TABLE_NAME = 'vex5hub-bench'
+
+# What the handler module did at import time before it created its client lazily
+EAGER_SETUP = f"""
+import boto3
+from boto3.dynamodb.conditions import Key
+boto3.resource('dynamodb').Table({TABLE_NAME!r})
+"""
+
+CHILD = """
+import importlib.util, json, sys, time
+
+def request(method, path):
+    return {'rawPath': path, 'requestContext': {'http': {'method': method}}}
+
+started = time.perf_counter()
+exec(sys.argv[2])
+spec = importlib.util.spec_from_file_location('index', sys.argv[1])
+index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(index)
+timings = {'import': time.perf_counter() - started}
+
+for name, method, path in (('options', 'OPTIONS', '/api/teams'), ('first_get', 'GET', '/api/dashboard'),
+                           ('repeat_get', 'GET', '/api/dashboard')):
+    t = time.perf_counter()
+    status = index.handler(request(method, path), None)['statusCode']
+    timings[name] = time.perf_counter() - t
+    assert status == 200, (name, status)
+print(json.dumps(timings))
+"""
+
+
+class StubDynamo(BaseHTTPRequestHandler):
+    """Just enough of the DynamoDB JSON protocol for the handler's read and write calls."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        op = self.headers.get('X-Amz-Target', '').split('.')[-1]
+        if op == 'GetItem':
+            result = {'Item': {**body['Key'], 'season_id': {'N': '197'}, 'top_teams': {'L': []}}}
+        elif op == 'Query':
+            result = {'Items': [], 'Count': 0, 'ScannedCount': 0}
+        elif op == 'BatchGetItem':
+            result = {'Responses': {name: [] for name in body['RequestItems']}, 'UnprocessedKeys': {}}
+        elif op == 'BatchWriteItem':
+            result = {'UnprocessedItems': {}}
+        else:
+            result = {}
+        payload = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def handler_at(rev: str, workdir: str) -> str:
+    source = subprocess.run(['git', 'show', f'{rev}:lambda/api-handler/index.py'], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    path = os.path.join(workdir, f'index_{rev.replace("/", "_").replace("~", "_")}.py')
+    with open(path, 'w') as f:
+        f.write(source)
+    return path
+
+
+def cold_start(handler_path: str, setup: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, '-c', CHILD, handler_path, setup], env=env,
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(f"{handler_path} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the api-handler's import time and cold start")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per variant (median reported)")
+    parser.add_argument("--baseline", help="Git revision whose handler to compare against "
+                                           "(default: this handler with the old eager module setup)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDynamo)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = dict(os.environ, TABLE_NAME=TABLE_NAME, AWS_DEFAULT_REGION='ca-central-1',
+               AWS_ACCESS_KEY_ID='local', AWS_SECRET_ACCESS_KEY='local',
+               AWS_ENDPOINT_URL_DYNAMODB=f'http://127.0.0.1:{server.server_port}')
+    env.pop('AWS_PROFILE', None)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.baseline:
+            variants = {f'baseline ({args.baseline})': (handler_at(args.baseline, workdir), ''),
+                        'current': (HANDLER, '')}
+        else:
+            variants = {'baseline (eager setup)': (HANDLER, EAGER_SETUP), 'current': (HANDLER, '')}
+
+        results = {}
+        for name, (path, setup) in variants.items():
+            runs = [cold_start(path, setup, env) for _ in range(args.runs)]
+            results[name] = {phase: statistics.median(r[phase] for r in runs) * 1000 for phase in runs[0]}
+    server.shutdown()
+
+    (base_name, base), (_, current) = results.items()
+    rows = [
+        ('import', 'import'),
+        ('cold OPTIONS', 'import+options'),
+        ('cold GET /dashboard', 'import+first_get'),
+        ('warm repeat GET', 'repeat_get'),
+    ]
+
+    def total(timings, phases):
+        return sum(timings[p] for p in phases.split('+'))
+
+    print(f"Median of {args.runs} fresh interpreters; baseline = {base_name}\n")
+    print(f"{'':<22}{'baseline ms':>12}{'current ms':>12}{'saved ms':>10}")
+    for label, phases in rows:
+        b, c = total(base, phases), total(current, phases)
+        print(f"{label:<22}{b:>12.1f}{c:>12.1f}{b - c:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Ingestion Transform Benchmark
+
+Measures items/sec of ingest.transform_matches (RobotEvents match JSON ->
+BatchWriteItem-sized item lists). No AWS access; the input is read from disk
+and replicated up to --count matches, with distinct match numbers so the
+transform's de-duplication doesn't short-circuit the copies.
+
+    python scripts/bench_ingest.py                                  # match_links.json
+    python scripts/bench_ingest.py --input collected_matches.json --count 50000
+
+Each run also compares plain match dicts with ingest.MatchRecord: peak and
+retained memory of loading the replicated set from JSON (tracemalloc), and
+transform throughput over each representation.
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
+
+
+def load_input(path: str) -> list:
+    """Accepts collected_matches.json ({"matches": {...}}), match_links.json ({id: match}) or a list."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'matches' in data:
+        data = data['matches']
+    return list(data.values()) if isinstance(data, dict) else data
+
+
+def replicate(matches: list, count: int) -> list:
+    out = []
+    copy_num = 0
+    while len(out) < count:
+        for m in matches[:count - len(out)]:
+            m = copy.deepcopy(m)
+            m['instance'] = m.get('instance', 0) + copy_num * 100
+            out.append(m)
+        copy_num += 1
+    return out
+
+
+def measure_load(path: str, records: bool):
+    """Load a match file as dicts or MatchRecords; returns (matches, seconds, peak_bytes, retained_bytes)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    if records:
+        matches = list(ingest.load_match_records(path).values())
+    else:
+        matches = load_input(path)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return matches, elapsed, peak, retained
+
+
+def run(matches: list, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = batches = 0
+        for batch in ingest.transform_matches(matches):
+            items += len(batch)
+            batches += 1
+        timings.append((time.perf_counter() - started, items, batches))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the match -> item ingestion transform")
+    parser.add_argument("--input", default="match_links.json", help="Match JSON to replicate")
+    parser.add_argument("--count", type=int, default=20000, help="Number of matches to transform per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs")
+    args = parser.parse_args()
+
+    source = load_input(args.input)
+    if not source:
+        print(f"No matches in {args.input}")
+        sys.exit(1)
+    matches = replicate(source, args.count)
+    print(f"Transforming {len(matches)} matches ({len(source)} unique in {args.input}), {args.repeat} runs")
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump({'matches': {str(n): m for n, m in enumerate(matches)}}, f)
+        replicated_path = f.name
+    del matches, source
+
+    try:
+        for label, records in (('dicts', False), ('records', True)):
+            loaded, load_time, peak, retained = measure_load(replicated_path, records)
+            print(f"\n{label}: load {load_time:.3f}s, peak {peak / 1e6:.1f} MB, retained {retained / 1e6:.1f} MB")
+            timings = run(loaded, args.repeat)
+            for n, (elapsed, items, batches) in enumerate(timings, 1):
+                print(f"  run {n}: {items} items in {batches} batches, {elapsed:.3f}s, {items / elapsed:,.0f} items/sec")
+            best, items, _ = min(timings)
+            print(f"  best: {items / best:,.0f} items/sec ({len(loaded) / best:,.0f} matches/sec)")
+            del loaded
+    finally:
+        os.unlink(replicated_path)
+
+
+if __name__ == "__main__":
+    main()
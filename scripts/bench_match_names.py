@@ -0,0 +1,146 @@
+"""
+Match Name Benchmark and Round-Trip Check
+
+Checks scripts/match_names.py against every match name we have on disk, then
+times it against the chained str.replace normalization it replaced.
+
+Round-trip properties, for every RobotEvents name in the match store (or
+collected_matches.json) and match_links.json, plus a synthetic grid of keys:
+
+    parse_name(name) == (match.round, match.instance, match.matchnum)
+    format_name(parse_name(name)) == name
+    parse_name(short_name(key)) == key and parse_name(format_name(key)) == key
+
+CSV names (multi_event_links.csv etc.) must parse and re-shorten to themselves.
+Exits non-zero if any check fails.
+
+    python3 scripts/bench_match_names.py
+    python3 scripts/bench_match_names.py --store collected_matches.db --repeat 20
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import match_names
+from match_names import ROUNDS, SINGLE_ROUNDS, format_name, parse_name, short_name
+
+CSV_FILES = ['multi_event_links.csv', 'match_videos_fixed.csv']
+
+
+def legacy_normalize(name):
+    """The generator's old chained-replace version, kept here as the baseline."""
+    n = name.replace('Qualifier #', 'Q')
+    n = n.replace('Round of 16 #', 'R16')
+    n = n.replace('Quarterfinal #', 'QF')
+    n = n.replace('Semifinal #', 'SF')
+    n = n.replace('Final #', 'F')
+    n = n.replace('Practice #', 'P')
+    return n.replace(' #', '')
+
+
+def load_matches(store_path: str, links_path: str) -> list:
+    """(name, round, instance, matchnum) for every named match we can find."""
+    found = []
+    if store_path.endswith('.db') and os.path.exists(store_path):
+        from match_store import MatchStore
+        store = MatchStore(store_path)
+        found += [(m.name, m.round, m.instance, m.matchnum) for m in store.all() if m.name]
+        store.close()
+    elif os.path.exists(store_path):
+        with open(store_path) as f:
+            data = json.load(f)
+        data = data.get('matches', data) if isinstance(data, dict) else data
+        found += [(m['name'], m['round'], m['instance'], m['matchnum'])
+                  for m in (data.values() if isinstance(data, dict) else data) if m.get('name')]
+    if os.path.exists(links_path):
+        with open(links_path) as f:
+            found += [(m['match_name'], m['round'], m['instance'], m['matchnum']) for m in json.load(f).values()]
+    return found
+
+
+def synthetic_keys():
+    for num, *_ in ROUNDS:
+        for instance in ([1] if num in SINGLE_ROUNDS else range(1, 17)):
+            for matchnum in range(1, 201 if num in SINGLE_ROUNDS else 4):
+                yield (num, instance, matchnum)
+
+
+def check(matches: list, csv_names: list) -> list:
+    failures = []
+    for name, round_num, instance, matchnum in matches:
+        try:
+            key = parse_name(name)
+        except ValueError as e:
+            failures.append(f"{name}: {e}")
+            continue
+        if key != (round_num, instance, matchnum):
+            failures.append(f"{name}: parsed {key}, match has {(round_num, instance, matchnum)}")
+        elif format_name(key) != name:
+            failures.append(f"{name}: formats back as {format_name(key)!r}")
+    for key in synthetic_keys():
+        for text in (format_name(key), short_name(key)):
+            if parse_name(text) != key:
+                failures.append(f"{key}: {text!r} parses as {parse_name(text)}")
+    for path, name in csv_names:
+        try:
+            if short_name(parse_name(name)) != name:
+                failures.append(f"{path}: {name!r} re-shortens to {short_name(parse_name(name))!r}")
+        except ValueError as e:
+            failures.append(f"{path}: {e}")
+    return failures
+
+
+def bench(names: list, repeat: int):
+    def timed(fn):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for n in names:
+                fn(n)
+        return len(names) * repeat / (time.perf_counter() - started)
+
+    def cold(n):
+        match_names.parse_name.cache_clear()
+        match_names.normalize.cache_clear()
+        return match_names.normalize(n)
+
+    return {
+        'legacy str.replace': timed(legacy_normalize),
+        'match_names (uncached)': timed(cold),
+        'match_names (cached)': timed(match_names.normalize),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and round-trip check for match_names")
+    parser.add_argument("--store", default="collected_matches.db", help="Match store (.db) or collected_matches.json")
+    parser.add_argument("--links", default="match_links.json", help="match_links.json path")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes over the names per timing")
+    args = parser.parse_args()
+
+    matches = load_matches(args.store, args.links)
+    csv_names = []
+    for path in CSV_FILES:
+        if os.path.exists(path):
+            with open(path) as f:
+                csv_names += [(path, row['match_name']) for row in csv.DictReader(f)]
+
+    failures = check(matches, csv_names)
+    print(f"Round-trip: {len(matches)} match names, {len(csv_names)} CSV names, "
+          f"{sum(1 for _ in synthetic_keys())} synthetic keys -> {len(failures)} failure(s)")
+    for line in failures[:20]:
+        print(f"  {line}")
+
+    names = [m[0] for m in matches] or [format_name(k) for k in synthetic_keys()]
+    for label, rate in bench(names, args.repeat).items():
+        print(f"  {label:<24} {rate:>12,.0f} names/s")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
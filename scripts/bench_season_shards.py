@@ -0,0 +1,203 @@
+"""
+Season Partition Sharding Benchmark
+
+Compares one SEASON#{id} partition with the sharded SEASON#{id}#S{n} scheme
+(ingest.SEASON_SHARDS) as concurrent writers and readers are added. Writers put
+season event items the way save_event_to_dynamo does; readers list the season's
+events the way the api-handler's /events does (up to 1000, which is the whole
+season), one query for the single partition or a parallel query per shard
+merged in SK order. A top-k page smaller than the season doesn't scale the same
+way: every shard has to return up to k items for the merge.
+
+By default the table is an in-process stand-in that enforces DynamoDB's
+per-partition throughput (1000 WCU/s, 3000 RCU/s), which is what makes a single
+hot key the ceiling. --endpoint-url runs the same load against DynamoDB Local
+or a moto server instead; neither throttles, so there only the client-side
+concurrency of the scatter-gather reader shows.
+
+    python scripts/bench_season_shards.py
+    python scripts/bench_season_shards.py --workers 1 4 16 --seconds 2
+    python scripts/bench_season_shards.py --endpoint-url http://localhost:8000
+"""
+
+import argparse
+import bisect
+import heapq
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
+
+SEASON_ID = 197
+ITEM_KB = 1  # roughly a season event item
+
+
+class Partition:
+    """Sorted items plus a capacity clock: each request waits for its share of the partition's units/sec."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys, self.items = [], []
+        self.next_free = {'read': 0.0, 'write': 0.0}
+
+    def consume(self, kind: str, units: float, per_second: float):
+        with self.lock:
+            now = time.perf_counter()
+            start = max(now, self.next_free[kind])
+            self.next_free[kind] = start + units / per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+class LocalTable:
+    """In-process stand-in for the table with per-partition write/read limits."""
+
+    def __init__(self, wcu: float = 1000, rcu: float = 3000):
+        self.wcu, self.rcu = wcu, rcu
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+    def _partition(self, pk: str) -> Partition:
+        with self._lock:
+            return self._partitions.setdefault(pk, Partition())
+
+    def reset_capacity(self):
+        for part in self._partitions.values():
+            part.next_free = {'read': 0.0, 'write': 0.0}
+
+    def put(self, item: dict):
+        part = self._partition(item['PK'])
+        part.consume('write', math.ceil(ITEM_KB), self.wcu)
+        with part.lock:
+            i = bisect.bisect_left(part.keys, item['SK'])
+            if i < len(part.keys) and part.keys[i] == item['SK']:
+                part.items[i] = item
+            else:
+                part.keys.insert(i, item['SK'])
+                part.items.insert(i, item)
+
+    def query(self, pk: str, sk_prefix: str, limit: int) -> list:
+        part = self._partition(pk)
+        with part.lock:
+            i = bisect.bisect_left(part.keys, sk_prefix)
+            page = [it for it in part.items[i:i + limit] if it['SK'].startswith(sk_prefix)]
+        # Eventually consistent: half a unit per 4 KB read
+        part.consume('read', max(0.5, math.ceil(len(page) * ITEM_KB / 4) / 2), self.rcu)
+        return page
+
+
+class DynamoTable:
+    """The same two calls against a real endpoint (DynamoDB Local, moto server)."""
+
+    def __init__(self, endpoint_url: str, table_name: str):
+        import boto3
+        from boto3.dynamodb.conditions import Key
+        self._key = Key
+        resource = boto3.resource('dynamodb', endpoint_url=endpoint_url, region_name='ca-central-1',
+                                  aws_access_key_id='local', aws_secret_access_key='local')
+        try:
+            self.table = resource.create_table(
+                TableName=table_name, BillingMode='PAY_PER_REQUEST',
+                KeySchema=[{'AttributeName': 'PK', 'KeyType': 'HASH'}, {'AttributeName': 'SK', 'KeyType': 'RANGE'}],
+                AttributeDefinitions=[{'AttributeName': 'PK', 'AttributeType': 'S'},
+                                      {'AttributeName': 'SK', 'AttributeType': 'S'}])
+            self.table.wait_until_exists()
+        except resource.meta.client.exceptions.ResourceInUseException:
+            self.table = resource.Table(table_name)
+
+    def put(self, item: dict):
+        self.table.put_item(Item=item)
+
+    def query(self, pk: str, sk_prefix: str, limit: int) -> list:
+        return self.table.query(KeyConditionExpression=self._key('PK').eq(pk) & self._key('SK').begins_with(sk_prefix),
+                                Limit=limit).get('Items', [])
+
+
+def event_item(sku: str, sharded: bool, prefix: str) -> dict:
+    pk = ingest.season_event_pk(SEASON_ID, sku) if sharded else f'SEASON#{SEASON_ID}'
+    return {'PK': prefix + pk, 'SK': f'EVENT#2025-10-01#{sku}', 'sku': sku, 'name': f'Event {sku}'}
+
+
+def partitions(sharded: bool, prefix: str) -> list:
+    base = f'{prefix}SEASON#{SEASON_ID}'
+    return ingest.shard_partitions(base) if sharded else [base]
+
+
+def list_events(table, pks: list, page: int, pool: ThreadPoolExecutor) -> list:
+    if len(pks) == 1:
+        return table.query(pks[0], 'EVENT#', page)
+    pages = pool.map(lambda pk: table.query(pk, 'EVENT#', page), pks)
+    return list(islice(heapq.merge(*pages, key=lambda it: it['SK']), page))
+
+
+def run(workers: int, seconds: float, op) -> float:
+    """Run op() on `workers` threads for `seconds`; returns operations/sec.
+
+    Measured over the time until the last thread finishes, since an operation
+    started before the deadline can be waiting on partition capacity past it.
+    """
+    started = time.perf_counter()
+    deadline = started + seconds
+    counts = [0] * workers
+
+    def loop(n):
+        while time.perf_counter() < deadline:
+            op()
+            counts[n] += 1
+
+    threads = [threading.Thread(target=loop, args=(n,)) for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark one season partition vs. sharded season partitions")
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4, 8, 16], help="Concurrent writers/readers")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duration of each run")
+    parser.add_argument("--page", type=int, default=1000, help="Events per listing (api-handler limit)")
+    parser.add_argument("--seed", type=int, default=800, help="Events in the season for the read runs")
+    parser.add_argument("--wcu", type=float, default=1000, help="Per-partition write units/sec (stand-in only)")
+    parser.add_argument("--rcu", type=float, default=3000, help="Per-partition read units/sec (stand-in only)")
+    parser.add_argument("--endpoint-url", help="DynamoDB Local / moto server URL instead of the in-process stand-in")
+    parser.add_argument("--table", default="vex5hub-bench", help="Table name at --endpoint-url")
+    args = parser.parse_args()
+
+    table = DynamoTable(args.endpoint_url, args.table) if args.endpoint_url else LocalTable(args.wcu, args.rcu)
+    target = args.endpoint_url or f"in-process stand-in ({args.wcu:.0f} WCU/s, {args.rcu:.0f} RCU/s per partition)"
+    print(f"Target: {target}; {ingest.SEASON_SHARDS} shards; {args.seconds:.1f}s per run")
+    # Each run gets its own key prefix so the two schemes never share partitions
+    run_id = uuid.uuid4().hex[:6]
+
+    with ThreadPoolExecutor(max_workers=ingest.SEASON_SHARDS * max(args.workers)) as pool:
+        for kind in ('write', 'read'):
+            print(f"\n{kind}s/sec  {'workers':>7}  {'1 partition':>12}  {f'{ingest.SEASON_SHARDS} shards':>12}  {'speedup':>7}")
+            for workers in args.workers:
+                rates = []
+                for sharded in (False, True):
+                    prefix = f'{run_id}-{kind}-{workers}-{int(sharded)}-'
+                    if kind == 'write':
+                        seq = count()
+                        op = lambda: table.put(event_item(f'RE-V5RC-25-{next(seq):06d}', sharded, prefix))
+                    else:
+                        for n in range(args.seed):
+                            table.put(event_item(f'RE-V5RC-25-{n:06d}', sharded, prefix))
+                        pks = partitions(sharded, prefix)
+                        op = lambda: list_events(table, pks, args.page, pool)
+                    if isinstance(table, LocalTable):
+                        table.reset_capacity()  # seeding doesn't count against the run
+                    rates.append(run(workers, args.seconds, op))
+                print(f"{'':>11}  {workers:>7}  {rates[0]:>12,.0f}  {rates[1]:>12,.0f}  {rates[1] / rates[0]:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import argparse
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 
-def cleanup_stale_matches(table_name, profile):
+from ddb_scan import parallel_scan
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
+def cleanup_stale_matches(table_name, profile, snapshot_path=None, segments=8):
     session = boto3.Session(profile_name=profile, region_name='ca-central-1')
     table = session.resource('dynamodb').Table(table_name)
     
@@ -11,33 +16,28 @@ def cleanup_stale_matches(table_name, profile):
     # But we can query by PK=EVENT#sku and filter or scan
     # For now, let's just scan for anything with SK containing #100#
     
-    count = 0
-    # Scan for matches with #100# in SK
-    # This is inefficient but safe for a one-time cleanup of a small table
-    response = table.scan(
-        FilterExpression="contains(SK, :s)",
-        ExpressionAttributeValues={":s": "#100#"}
-    )
-    
-    items = response.get('Items', [])
-    while 'LastEvaluatedKey' in response:
-        response = table.scan(
-            FilterExpression="contains(SK, :s)",
-            ExpressionAttributeValues={":s": "#100#"},
-            ExclusiveStartKey=response['LastEvaluatedKey']
+    if snapshot_path:
+        items = Snapshot(snapshot_path).sk_contains("#100#")
+    else:
+        # Scan for matches with #100# in SK, keys only
+        items = parallel_scan(
+            table,
+            segments=segments,
+            projection=['PK', 'SK'],
+            filter_expression=Attr('SK').contains('#100#')
         )
-        items.extend(response.get('Items', []))
         
-    print(f"Found {len(items)} stale items to delete.")
-    
-    with table.batch_writer() as batch:
-        for item in items:
-            batch.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
-            count += 1
-            if count % 100 == 0:
-                print(f"  Deleted {count} items...")
+    plan = WritePlan()
+    for item in items:
+        plan.delete({'PK': item['PK'], 'SK': item['SK']}, reason='division_100')
+    print(f"Found {len(plan)} stale items to delete.")
+    count = plan.apply(table)['delete']
                 
     print(f"Cleanup complete. Deleted {count} items.")
 
 if __name__ == "__main__":
-    cleanup_stale_matches("vex5hub-data", "rdp")
+    parser = argparse.ArgumentParser(description="Delete stale division-100 match items")
+    parser.add_argument("--snapshot", help="Find stale items in a local table snapshot instead of scanning")
+    parser.add_argument("--segments", type=int, default=8, help="Parallel scan segments/workers")
+    args = parser.parse_args()
+    cleanup_stale_matches("vex5hub-data", "rdp", args.snapshot, args.segments)
@@ -1,4 +1,5 @@
 
+import argparse
 import json
 import urllib.request
 import ssl
@@ -6,6 +7,10 @@ import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from decimal import Decimal
 
+from ddb_scan import parallel_scan
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
 ssl._create_default_https_context = ssl._create_unverified_context
 
 # Config
@@ -55,46 +60,51 @@ def get_actual_worlds_teams():
     print(f"Found {len(actual_teams)} actual Worlds teams.")
     return actual_teams
 
-def cleanup():
+def cleanup(season_id, snapshot_path=None, segments=8):
     actual_teams = get_actual_worlds_teams()
+    # The flag is per season: it lives on TEAM#{num} / SEASON#{id}, not on METADATA
+    season_sk = f'SEASON#{season_id}'
     
-    print("Scanning DynamoDB for teams marked as Worlds Qualified...")
-    # Scan for teams with worlds_qualified = true
-    # Note: We use METADATA SK to find team items
-    response = table.scan(
-        FilterExpression=Attr('worlds_qualified').eq(True) & Attr('SK').eq('METADATA')
-    )
-    
-    items = response.get('Items', [])
-    while 'LastEvaluatedKey' in response:
-        response = table.scan(
-            FilterExpression=Attr('worlds_qualified').eq(True) & Attr('SK').eq('METADATA'),
-            ExclusiveStartKey=response['LastEvaluatedKey']
-        )
-        items.extend(response.get('Items', []))
+    if snapshot_path:
+        print(f"Reading teams marked as Worlds Qualified from snapshot {snapshot_path}...")
+        items = [i for i in Snapshot(snapshot_path).worlds_qualified() if i.get('SK') == season_sk]
+    else:
+        print("Scanning DynamoDB for teams marked as Worlds Qualified...")
+        # Scan for team season items with worlds_qualified = true
+        items = list(parallel_scan(
+            table,
+            segments=segments,
+            projection=['PK', 'SK', 'number'],
+            filter_expression=Attr('worlds_qualified').eq(True) & Attr('SK').eq(season_sk)
+        ))
 
     print(f"Found {len(items)} items in DB marked as qualified.")
     
-    cleared_count = 0
+    plan = WritePlan()
     kept_count = 0
     
     for item in items:
         team_num = item.get('number')
         if team_num not in actual_teams:
             print(f"Correcting {team_num}: removing worlds_qualified flag.")
-            try:
-                table.update_item(
-                    Key={'PK': f'TEAM#{team_num}', 'SK': 'METADATA'},
-                    UpdateExpression="SET worlds_qualified = :val",
-                    ExpressionAttributeValues={':val': False}
-                )
-                cleared_count += 1
-            except Exception as e:
-                print(f"Error updating {team_num}: {e}")
+            plan.update(
+                {'PK': f'TEAM#{team_num}', 'SK': season_sk},
+                "SET worlds_qualified = :val",
+                values={':val': False},
+                condition="attribute_exists(PK)",
+                reason='clear_worlds_qualified'
+            )
         else:
             kept_count += 1
+
+    cleared_count = plan.apply(table).get('update', 0)
             
     print(f"Cleanup complete. Cleared: {cleared_count}, Kept: {kept_count}")
 
 if __name__ == "__main__":
-    cleanup()
+    parser = argparse.ArgumentParser(description="Clear stale worlds_qualified flags")
+    parser.add_argument("--season", type=int, default=197, help="Season ID the WORLDS_SKUS belong to")
+    parser.add_argument("--snapshot", help="Find flagged teams in a local table snapshot instead of scanning")
+    parser.add_argument("--segments", type=int, default=8, help="Parallel scan segments/workers")
+    args = parser.parse_args()
+    cleanup(args.season, args.snapshot, args.segments)
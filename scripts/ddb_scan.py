@@ -0,0 +1,101 @@
+"""
+Parallel Segmented Scan
+
+Shared helper for scripts that must read the whole live table. Splits the scan
+into Segment/TotalSegments slices handled by a worker pool and yields items as
+they arrive, so callers can stream instead of building one big list.
+
+    from ddb_scan import parallel_scan
+    for item in parallel_scan(table, segments=8, projection=['PK', 'SK', 'video_url'],
+                              filter_expression=Attr('SK').begins_with('MATCH#')):
+        ...
+
+Workers use the Table's low-level client (thread-safe) rather than the Table
+resource itself. That client still converts between Python and DynamoDB types,
+so filter values go in and items come out in the usual boto3 resource shape.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+_DONE = object()
+
+
+def _scan_kwargs(table_name, projection=None, filter_expression=None, page_size=None) -> dict:
+    kwargs = {'TableName': table_name}
+    names = {}
+    values = {}
+
+    if filter_expression is not None:
+        built = ConditionExpressionBuilder().build_expression(filter_expression)
+        kwargs['FilterExpression'] = built.condition_expression
+        names.update(built.attribute_name_placeholders)
+        values.update(built.attribute_value_placeholders)
+
+    if projection:
+        # Placeholders avoid clashes with reserved words such as 'round' and 'name'
+        placeholders = []
+        for i, attr in enumerate(projection):
+            names[f'#p{i}'] = attr
+            placeholders.append(f'#p{i}')
+        kwargs['ProjectionExpression'] = ', '.join(placeholders)
+
+    if names:
+        kwargs['ExpressionAttributeNames'] = names
+    if values:
+        kwargs['ExpressionAttributeValues'] = values
+    if page_size:
+        kwargs['Limit'] = page_size
+    return kwargs
+
+
+def parallel_scan(table, segments: int = 8, projection=None, filter_expression=None, page_size=None):
+    """Yield every item matching filter_expression, scanning `segments` slices concurrently."""
+    client = table.meta.client
+    base_kwargs = _scan_kwargs(table.name, projection, filter_expression, page_size)
+    pages: queue.Queue = queue.Queue(maxsize=segments * 2)
+    stop = threading.Event()
+
+    def put(value):
+        # Bounded queue gives back-pressure; re-check stop so an abandoned generator doesn't hang workers
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def scan_segment(segment: int):
+        kwargs = dict(base_kwargs, Segment=segment, TotalSegments=segments)
+        try:
+            while not stop.is_set():
+                resp = client.scan(**kwargs)
+                if resp.get('Items'):
+                    put(resp['Items'])
+                if 'LastEvaluatedKey' not in resp:
+                    break
+                kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    pool = ThreadPoolExecutor(max_workers=segments)
+    for segment in range(segments):
+        pool.submit(scan_segment, segment)
+
+    finished = 0
+    try:
+        while finished < segments:
+            page = pages.get()
+            if page is _DONE:
+                finished += 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        stop.set()
+        pool.shutdown(wait=False)
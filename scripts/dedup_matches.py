@@ -2,48 +2,67 @@
 Deduplication + Video URL Merge Script
 
 This script:
-1. Scans ALL TEAM# MATCH# records in DynamoDB
+1. Scans ALL TEAM# MATCH# records in DynamoDB (or reads them from a local snapshot)
 2. Groups them by (PK, sku, match_num, round, instance) to find duplicates
 3. For duplicates: merges video_url into the canonical (content-updater) record,
    deletes the timestamp-based duplicate
 4. Deletes any legacy NESTED records (malformed SKs without sku)
+
+Planning is done in memory and produces a WritePlan (merges, deletes, renames)
+that is applied with batched deletes and concurrent conditional updates.
+
+Usage:
+    python3 scripts/dedup_matches.py [--snapshot vex5hub_snapshot.db] [--dry-run]
+    python3 scripts/dedup_matches.py --plan-out dedup_plan.jsonl    # plan + diff only, for review
+    python3 scripts/dedup_matches.py --apply dedup_plan.jsonl       # apply a reviewed plan (resumable)
 """
 
+import argparse
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from collections import defaultdict
 import time
 
+from ddb_scan import parallel_scan
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
 TABLE_NAME = 'vex5hub-data'
 DRY_RUN = False  # Set to True to preview changes without modifying DB
 
-def run():
+# Only the attributes the dedup logic reads
+SCAN_PROJECTION = ['PK', 'SK', 'sku', 'round', 'instance', 'match_num', 'matchnum', 'video_url']
+
+def load_match_items(table, snapshot_path=None, segments=8):
+    """Stream TEAM# MATCH# records, from the snapshot if given, otherwise a parallel live scan."""
+    if snapshot_path:
+        snap = Snapshot(snapshot_path)
+        print(f"Reading MATCH records from snapshot {snapshot_path} (exported {snap.exported_at()} UTC)...")
+        return snap.items(sk_prefix='MATCH#', pk_prefix='TEAM#')
+
+    print(f"Scanning all MATCH records ({segments} segments)...")
+    return parallel_scan(
+        table,
+        segments=segments,
+        projection=SCAN_PROJECTION,
+        filter_expression=Attr('PK').begins_with('TEAM#') & Attr('SK').begins_with('MATCH#')
+    )
+
+def get_table():
     session = boto3.Session(profile_name='rdp', region_name='ca-central-1')
     dynamodb = session.resource('dynamodb')
-    table = dynamodb.Table(TABLE_NAME)
-
-    # Scan all MATCH records
-    print("Scanning all MATCH records...")
-    all_items = []
-    scan_kwargs = {
-        'FilterExpression': Attr('SK').begins_with('MATCH#')
-    }
-    
-    while True:
-        resp = table.scan(**scan_kwargs)
-        all_items.extend(resp.get('Items', []))
-        if 'LastEvaluatedKey' not in resp:
-            break
-        scan_kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
-    
-    print(f"Total MATCH records found: {len(all_items)}")
+    return dynamodb.Table(TABLE_NAME)
 
+def build_plan(items) -> WritePlan:
+    """Classify MATCH records and plan every merge, delete and rename. No DB access."""
     # Classify records
     canonical = []    # Content-updater style: SK like MATCH#SKU#div#round#inst#num
     timestamp_based = []  # upload_matches.py style: SK like MATCH#2026-...#id
     legacy_nested = []     # Malformed: SK like MATCH#1#2#01#...
+    total = 0
 
-    for item in all_items:
+    for item in items:
+        total += 1
         sk = item.get('SK', '')
         pk = item.get('PK', '')
         
@@ -57,6 +76,7 @@ def run():
         else:
             legacy_nested.append(item)
 
+    print(f"Total MATCH records found: {total}")
     print(f"Canonical (content-updater): {len(canonical)}")
     print(f"Timestamp-based (upload_matches): {len(timestamp_based)}")
     print(f"Legacy/malformed: {len(legacy_nested)}")
@@ -82,6 +102,7 @@ def run():
         '6': 'Round of 16'
     }
 
+    plan = WritePlan()
     updates = 0
     deletes = 0
     orphans = 0
@@ -103,27 +124,29 @@ def run():
         if canonical_item:
             # Merge video_url into canonical record if it doesn't have one
             if video_url and not canonical_item.get('video_url'):
-                if not DRY_RUN:
-                    table.update_item(
-                        Key={'PK': canonical_item['PK'], 'SK': canonical_item['SK']},
-                        UpdateExpression='SET video_url = :v',
-                        ExpressionAttributeValues={':v': video_url}
-                    )
+                plan.update(
+                    {'PK': canonical_item['PK'], 'SK': canonical_item['SK']},
+                    'SET video_url = :v',
+                    values={':v': video_url},
+                    condition='attribute_exists(PK) AND attribute_not_exists(video_url)',
+                    reason='merge_video_url'
+                )
                 updates += 1
 
             # Delete the timestamp-based duplicate
-            if not DRY_RUN:
-                table.delete_item(Key={'PK': pk, 'SK': sk})
+            plan.delete({'PK': pk, 'SK': sk}, reason='duplicate')
             deletes += 1
         else:
             # No canonical match found — this is an orphan (only exists in our upload)
             # Keep it but fix the round name if numeric
-            if raw_round in ROUND_MAP and not DRY_RUN:
-                table.update_item(
-                    Key={'PK': pk, 'SK': sk},
-                    UpdateExpression='SET #r = :r',
-                    ExpressionAttributeNames={'#r': 'round'},
-                    ExpressionAttributeValues={':r': normalized_round}
+            if raw_round in ROUND_MAP:
+                plan.update(
+                    {'PK': pk, 'SK': sk},
+                    'SET #r = :r',
+                    values={':r': normalized_round},
+                    names={'#r': 'round'},
+                    condition='attribute_exists(PK)',
+                    reason='rename_round'
                 )
             orphans += 1
 
@@ -132,16 +155,51 @@ def run():
     for item in legacy_nested:
         pk = item['PK']
         sk = item['SK']
-        if not DRY_RUN:
-            table.delete_item(Key={'PK': pk, 'SK': sk})
+        plan.delete({'PK': pk, 'SK': sk}, reason='legacy')
         legacy_deletes += 1
 
-    print(f"\n--- Results ---")
-    print(f"Video URLs merged into canonical records: {updates}")
-    print(f"Timestamp-based duplicates deleted: {deletes}")
+    print(f"\n--- Plan ---")
+    print(f"Video URLs to merge into canonical records: {updates}")
+    print(f"Timestamp-based duplicates to delete: {deletes}")
     print(f"Orphan records kept (no canonical match): {orphans}")
-    print(f"Legacy/malformed records deleted: {legacy_deletes}")
-    print(f"DRY_RUN: {DRY_RUN}")
+    print(f"Legacy/malformed records to delete: {legacy_deletes}")
+    return plan
+
+def apply_plan(plan: WritePlan, table, workers=16, progress_path=None):
+    print(f"\nApplying {len(plan)} planned writes ({workers} workers)...")
+    started = time.time()
+    results = plan.apply(table, workers=workers, progress_path=progress_path)
+    print(f"Applied in {time.time() - started:.1f}s: {dict(results)}")
+    if results.get('update_failed') or results.get('batch_failed'):
+        print("Some writes failed; re-run with --apply to resume the remaining ones.")
+
+def run(snapshot_path=None, dry_run=DRY_RUN, segments=8, plan_out=None, workers=16):
+    table = get_table()
+    plan = build_plan(load_match_items(table, snapshot_path, segments))
+
+    if dry_run or plan_out:
+        plan.print_diff(limit=None if plan_out else 50)
+    if plan_out:
+        plan.save(plan_out)
+        print(f"Review it, then run: python3 scripts/dedup_matches.py --apply {plan_out}")
+        return
+    if dry_run:
+        print(f"DRY_RUN: {dry_run}")
+        return
+
+    apply_plan(plan, table, workers)
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Deduplicate TEAM# MATCH# records and merge video URLs")
+    parser.add_argument("--snapshot", help="Read records from a local table snapshot instead of scanning")
+    parser.add_argument("--dry-run", action="store_true", default=DRY_RUN, help="Print the planned changes only")
+    parser.add_argument("--plan-out", help="Save the plan to this file instead of applying it")
+    parser.add_argument("--apply", metavar="PLAN", help="Apply a previously saved plan (resumes if interrupted)")
+    parser.add_argument("--segments", type=int, default=8, help="Parallel scan segments/workers")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent write workers")
+    args = parser.parse_args()
+
+    if args.apply:
+        apply_plan(WritePlan.load(args.apply), get_table(), args.workers, progress_path=args.apply + '.progress')
+    else:
+        run(args.snapshot, args.dry_run, args.segments, args.plan_out, args.workers)
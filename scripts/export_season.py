@@ -0,0 +1,183 @@
+"""
+Season Parquet Export
+
+Exports matches, teams, events and awards from DynamoDB into partitioned,
+zstd-compressed Parquet datasets so analysis doesn't need to page through the
+live table or the pretty-printed match_links.json:
+
+    <out>/matches/season=197/sku=RE-V5RC-25-0165/*.parquet
+    <out>/awards/season=197/sku=.../*.parquet
+    <out>/events/season=197/*.parquet
+    <out>/teams/season=197/*.parquet
+
+With --bucket the datasets are also uploaded to s3://<bucket>/exports/.
+
+Loading a season locally:
+
+    from export_season import load_season
+    df = load_season('exports', 197, 'matches', columns=['sku', 'red_score', 'blue_score']).to_pandas()
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import os
+import sys
+from decimal import Decimal
+
+import boto3
+
+from ddb_scan import parallel_scan
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest  # noqa: E402
+
+TABLE_NAME = 'vex5hub-data'
+DATASETS = ('matches', 'teams', 'events', 'awards')
+
+
+def _plain(value):
+    """Convert DynamoDB Decimals to int/float, recursively."""
+    if isinstance(value, Decimal):
+        return int(value) if value % 1 == 0 else float(value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _flatten(item: dict) -> dict:
+    """Flatten one level of nested maps (stats, skills, location) into prefixed columns."""
+    row = {}
+    for key, value in _plain(item).items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                row[f'{key}_{sub_key}'] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+def _season_for_sku(sku: str, event_seasons: dict):
+    if sku in event_seasons:
+        return event_seasons[sku]
+    # Not in a SEASON# partition: fall back to the SKU's year
+    return ingest.sku_season(sku or '')
+
+
+def collect_rows(items) -> dict:
+    """Classify raw table items into flat rows per dataset."""
+    rows = {name: [] for name in DATASETS}
+    event_seasons = {}
+    pending = []  # matches/awards need the sku -> season map built from events
+
+    for item in items:
+        pk = item.get('PK', '')
+        sk = item.get('SK', '')
+
+        if pk.startswith('SEASON#') and sk.startswith('EVENT#'):
+            season = int(pk.split('#')[1])
+            event_seasons[item.get('sku')] = season
+            row = _flatten(item)
+            row['season'] = season
+            rows['events'].append(row)
+        elif pk.startswith('TEAM#') and sk.startswith('SEASON#'):
+            row = _flatten(item)
+            row['season'] = int(sk.split('#')[1])
+            rows['teams'].append(row)
+        elif pk.startswith('EVENT#') and sk.startswith('MATCH#'):
+            pending.append(('matches', item))
+        elif pk.startswith('TEAM#') and sk.startswith('AWARD#'):
+            pending.append(('awards', item))
+
+    for dataset, item in pending:
+        row = _flatten(item)
+        if dataset == 'awards':
+            row['team'] = item['PK'].split('#', 1)[1]
+        row['season'] = _season_for_sku(item.get('sku', ''), event_seasons)
+        rows[dataset].append(row)
+
+    return rows
+
+
+def write_datasets(rows: dict, out_dir: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    partitions = {
+        'matches': ['season', 'sku'],
+        'awards': ['season', 'sku'],
+        'events': ['season'],
+        'teams': ['season'],
+    }
+    for dataset, dataset_rows in rows.items():
+        if not dataset_rows:
+            print(f"  {dataset}: no rows, skipping")
+            continue
+        # Key attributes are redundant with the partition/columns and bloat the files
+        for row in dataset_rows:
+            row.pop('PK', None)
+            row.pop('GSI1PK', None)
+        # Items are sparse (video_url, match_count, stats...): every attribute any row has
+        # is a column, null where a row lacks it. from_pylist would keep only the first row's.
+        columns = dict.fromkeys(key for row in dataset_rows for key in row)
+        arrow_table = pa.Table.from_pydict({c: [row.get(c) for row in dataset_rows] for c in columns})
+        pq.write_to_dataset(
+            arrow_table,
+            root_path=os.path.join(out_dir, dataset),
+            partition_cols=partitions[dataset],
+            compression='zstd',
+            existing_data_behavior='delete_matching'
+        )
+        print(f"  {dataset}: {arrow_table.num_rows} rows, {arrow_table.num_columns} columns")
+
+
+def upload_datasets(session, out_dir: str, bucket: str, prefix: str = 'exports'):
+    s3 = session.client('s3')
+    count = 0
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            key = f"{prefix}/{os.path.relpath(path, out_dir).replace(os.sep, '/')}"
+            s3.upload_file(path, bucket, key)
+            count += 1
+    print(f"Uploaded {count} files to s3://{bucket}/{prefix}/")
+
+
+def load_season(out_dir: str, season: int, dataset: str = 'matches', columns=None, sku: str = None):
+    """Load one season (optionally one event) of a dataset as a pyarrow Table."""
+    import pyarrow.dataset as ds
+
+    data = ds.dataset(os.path.join(out_dir, dataset), format='parquet', partitioning='hive')
+    expr = ds.field('season') == season
+    if sku:
+        expr = expr & (ds.field('sku') == sku)
+    return data.to_table(columns=columns, filter=expr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the DynamoDB season data to partitioned Parquet")
+    parser.add_argument("--out", default="exports", help="Local output directory")
+    parser.add_argument("--bucket", help="S3 data bucket to upload the export to (optional)")
+    parser.add_argument("--profile", default="rdp", help="AWS profile to use")
+    parser.add_argument("--region", default="ca-central-1", help="AWS region")
+    parser.add_argument("--table", default=TABLE_NAME, help="DynamoDB table name")
+    parser.add_argument("--segments", type=int, default=8, help="Parallel scan segments/workers")
+    args = parser.parse_args()
+
+    session = boto3.Session(profile_name=args.profile, region_name=args.region)
+    table = session.resource('dynamodb').Table(args.table)
+
+    print(f"Scanning {args.table} ({args.segments} segments)...")
+    rows = collect_rows(parallel_scan(table, segments=args.segments))
+
+    print(f"Writing Parquet datasets to {args.out}/")
+    write_datasets(rows, args.out)
+
+    if args.bucket:
+        upload_datasets(session, args.out, args.bucket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,13 @@
 import json
 import sys
 
-def extract_matches(sku):
-    with open('/Users/jj/vex5hub-site/collected_matches.json', 'r') as f:
-        data = json.load(f)
-    
-    matches = data.get('matches', {})
-    event_matches = []
-    for m_id, m_data in matches.items():
-        if m_data.get('event', {}).get('code') == sku:
-            event_matches.append(m_data)
-    
-    # Sort matches by scheduled time or started time
-    event_matches.sort(key=lambda x: x.get('started') or x.get('scheduled') or '')
+from match_store import MatchStore
+
+def extract_matches(sku, store_path='/Users/jj/vex5hub-site/collected_matches.db'):
+    store = MatchStore(store_path)
+    # Indexed by SKU and already sorted by started (or scheduled) time
+    event_matches = list(store.event(sku, raw=True))
+    store.close()
     
     with open(f'matches_{sku}.json', 'w') as f:
         json.dump(event_matches, f, indent=2)
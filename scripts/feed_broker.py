@@ -0,0 +1,144 @@
+"""
+Local Live Feed Broker
+
+Stand-in for the WebSocket feed API when running the updater and the site
+locally. The updater publishes to it (lambda/content-updater/feed.py with
+FEED_PUBLISH_URL set) and browsers subscribe with Server-Sent Events, getting
+the same {"type": "matches", "updates": [...]} messages the WebSocket API sends:
+
+    python3 scripts/feed_broker.py --port 8787
+    FEED_PUBLISH_URL=http://localhost:8787/publish   (updater)
+    NEXT_PUBLIC_FEED_URL=http://localhost:8787       (site)
+
+    GET  /stream?sku=RE-V5RC-25-0147&team=3150N    text/event-stream
+    POST /publish  {"updates": [{"channel": "team:3150N", "item": {...}}]}
+"""
+
+import argparse
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+KEEPALIVE_SECONDS = 15
+
+
+class Broker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []  # (channels, queue)
+
+    def subscribe(self, channels: set) -> queue.Queue:
+        q = queue.Queue()
+        with self._lock:
+            self._subscribers.append((channels, q))
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers = [(c, s) for c, s in self._subscribers if s is not q]
+
+    def publish(self, updates: list) -> int:
+        """Fan updates out to matching subscribers; returns how many received something."""
+        delivered = 0
+        with self._lock:
+            for channels, q in self._subscribers:
+                mine = [u for u in updates if u.get('channel') in channels]
+                if mine:
+                    q.put({'type': 'matches', 'updates': mine})
+                    delivered += 1
+        return delivered
+
+
+def channels_from_query(query: str) -> set:
+    params = parse_qs(query)
+    return ({f"event:{sku}" for sku in params.get('sku', [])} |
+            {f"team:{team}" for team in params.get('team', [])})
+
+
+def make_handler(broker: Broker):
+    class Handler(BaseHTTPRequestHandler):
+        def _cors(self):
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Headers', 'content-type')
+
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self._cors()
+            self.end_headers()
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/publish':
+                self.send_error(404)
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except json.JSONDecodeError:
+                self.send_error(400, "Invalid JSON")
+                return
+            delivered = broker.publish(body.get('updates', []))
+            payload = json.dumps({'delivered': delivered}).encode()
+            self.send_response(200)
+            self._cors()
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/stream':
+                self.send_error(404)
+                return
+            channels = channels_from_query(url.query)
+            if not channels:
+                self.send_error(400, "Pass ?sku= and/or ?team=")
+                return
+
+            self.send_response(200)
+            self._cors()
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+
+            q = broker.subscribe(channels)
+            print(f"+ subscriber {sorted(channels)}")
+            try:
+                while True:
+                    try:
+                        message = q.get(timeout=KEEPALIVE_SECONDS)
+                        self.wfile.write(f"event: matches\ndata: {json.dumps(message)}\n\n".encode())
+                    except queue.Empty:
+                        self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                broker.unsubscribe(q)
+                print(f"- subscriber {sorted(channels)}")
+
+        def log_message(self, fmt, *args):
+            if not self.path.startswith('/stream'):
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the live match feed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(Broker()))
+    server.daemon_threads = True
+    print(f"Feed broker on http://{args.host}:{args.port} (POST /publish, GET /stream?sku=&team=)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ import boto3
 import urllib.request
 import ssl
 import os
+import sys
+
+from match_store import DEFAULT_STORE, MatchStore
 
 API_BASE_URL = "https://www.robotevents.com/api/v2"
 
@@ -56,6 +59,7 @@ def fetch_matches(api_key, sku):
             })
             try:
                 with urllib.request.urlopen(req, context=ctx) as resp:
+                    # Kept as the API's dicts: the store saves them verbatim
                     data = json.loads(resp.read().decode())
                     if not data['data']: break
                     all_matches.extend(data['data'])
@@ -66,35 +70,21 @@ def fetch_matches(api_key, sku):
                 break
     return all_matches
 
-def update_collected(skus):
+def update_collected(skus, store_path=DEFAULT_STORE):
     api_key = get_api_key()
     if not api_key: return
 
-    file_path = 'collected_matches.json'
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-    else:
-        data = {"matches": {}}
-
-    modified = False
+    store = MatchStore(store_path)
+    total_new = 0
     for sku in skus:
         matches = fetch_matches(api_key, sku)
-        print(f"Fetched {len(matches)} matches for {sku}")
-        for m in matches:
-            m_id = str(m['id'])
-            if m_id not in data['matches']:
-                data['matches'][m_id] = m
-                modified = True
+        new = store.upsert(matches)
+        total_new += new
+        print(f"Fetched {len(matches)} matches for {sku} ({new} new)")
     
-    if modified:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-        print(f"Updated {file_path}")
-    else:
-        print("No new matches found.")
+    print(f"Updated {store_path}: {total_new} new matches, {len(store)} total")
+    store.close()
 
 if __name__ == "__main__":
-    import sys
     skus = sys.argv[1:] if len(sys.argv) > 1 else ["RE-V5RC-25-0011", "RE-V5RC-25-0010"]
     update_collected(skus)
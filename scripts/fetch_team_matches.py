@@ -6,10 +6,13 @@ import os
 import time
 from datetime import datetime
 
+from match_store import MatchStore
+
 # --- Configuration ---
 TEAMS_FILE = "/Users/binjiang/vex5hub-site/top_100_teams.json"
 API_BASE_URL = "https://www.robotevents.com/api/v2"
 SEASON_ID = 197  # V5RC 2025-2026 Push Back
+STORE_FILE = "/Users/binjiang/vex5hub-site/collected_matches.db"
 
 def get_api_key():
     print("Fetching API Key from Secrets Manager...")
@@ -61,6 +64,7 @@ def fetch_team_matches(api_key, team_number):
         try:
             time.sleep(0.2) # Rate limiting
             with urllib.request.urlopen(req, context=ctx) as resp:
+                # Kept as the API's dicts: the store saves them verbatim
                 data = json.loads(resp.read().decode())
                 if not data['data']: break
                 matches.extend(data['data'])
@@ -79,43 +83,25 @@ def main():
     with open(TEAMS_FILE, "r") as f:
         teams = json.load(f)
 
-    all_matches = {}
-    event_skus = set()
+    store = MatchStore(STORE_FILE)
+    total_new = 0
 
     for team in teams:
         matches = fetch_team_matches(api_key, team)
-        print(f"  Found {len(matches)} matches for {team}")
-        for m in matches:
-            match_id = m['id']
-            if match_id not in all_matches:
-                all_matches[match_id] = m
-                sku = m.get('event', {}).get('code') # Use 'code' for SKU
-                if sku:
-                    event_skus.add(sku)
-
-    print(f"\nTotal unique matches: {len(all_matches)}")
-    print(f"Total unique events: {len(event_skus)}")
+        new = store.upsert(matches)
+        total_new += new
+        print(f"  Found {len(matches)} matches for {team} ({new} new)")
 
-    # Save results
-    output = {
-        "matches": all_matches,
-        "event_skus": list(event_skus)
-    }
-    with open("/Users/binjiang/vex5hub-site/collected_matches.json", "w") as f:
-        json.dump(output, f, indent=2)
-    print("Saved to collected_matches.json")
+    event_counts = store.event_counts()
+    print(f"\nTotal unique matches: {len(store)} ({total_new} new this run)")
+    print(f"Total unique events: {len(event_counts)}")
+    print(f"Saved to {STORE_FILE}")
 
     # Also summary of events for easier picking
-    event_counts = {}
-    for m in all_matches.values():
-        sku = m.get('event', {}).get('code')
-        if sku:
-            event_counts[sku] = event_counts.get(sku, 0) + 1
-    
-    sorted_events = sorted(event_counts.items(), key=lambda x: x[1], reverse=True)
     with open("/Users/binjiang/vex5hub-site/event_summary.json", "w") as f:
-        json.dump(sorted_events, f, indent=2)
+        json.dump([list(row) for row in event_counts], f, indent=2)
     print("Saved to event_summary.json")
+    store.close()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,10 @@
 import json
+import os
+import sys
 import boto3
-from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
 
 def final_fix(table_name, profile):
     session = boto3.Session(profile_name=profile, region_name='ca-central-1')
@@ -26,8 +30,6 @@ def final_fix(table_name, profile):
         }
     }
     
-    round_map = {1: 'Practice', 2: 'Qualification', 3: 'Quarterfinal', 4: 'Semifinal', 5: 'Final', 6: 'Round of 16'}
-
     count = 0
     for match_id, m in data.items():
         sku = m['event']['sku']
@@ -36,21 +38,18 @@ def final_fix(table_name, profile):
         instance = m['instance']
         match_num = m['matchnum']
         
-        round_name = round_map.get(round_num, f'Round {round_num}')
         video_url = m['video_url']
         
         meta = META.get(sku, {})
         
         # Determine all teams involved
-        teams = []
-        for alliance in m['alliances']:
-            for t_obj in alliance['teams']:
-                teams.append(t_obj['team']['name'])
+        red_teams, blue_teams, _, _ = ingest.split_alliances(m)
+        teams = red_teams + blue_teams
         
         # Try several possible division IDs for this match
         possible_divs = [div_id, 1, 100, 2, 3, 4]
-        for d in possible_divs:
-            sk = f"MATCH#{sku}#{d}#{round_num}#{instance:02d}#{match_num:04d}"
+        for t, d in ((t, d) for t in teams for d in possible_divs):
+            sk = ingest.team_match_sk(sku, d, round_num, instance, match_num)
             
             # Try to update even without condition if necessary, but keep it for safety first
             try:
@@ -72,7 +71,7 @@ def final_fix(table_name, profile):
                 pass
         
         # 2. Update Event Item
-        event_sk = f"MATCH#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
+        event_sk = ingest.event_match_sk(div_id, round_num, instance, match_num)
         try:
             table.update_item(
                 Key={'PK': f"EVENT#{sku}", 'SK': event_sk},
@@ -1,31 +1,57 @@
 import json
 import csv
-import re
+import os
+from bisect import bisect_left
+
+from match_names import normalize
+
+def load_existing(csv_path):
+    """Rows already in the CSV, keyed by (sku, match name, division); their timestamps are hand-checked."""
+    if not os.path.exists(csv_path):
+        return {}
+    with open(csv_path, newline='') as f:
+        return {(r[0], r[1], str(r[4])): r for r in list(csv.reader(f))[1:] if len(r) >= 5}
+
+def in_order(entries):
+    """The largest subset of one video's entries whose timestamps rise with their start times.
+
+    entries are (started, timestamp, row) tuples. A match that sits before one
+    it followed (or after one it preceded) is left out rather than guessed at.
+    """
+    entries = sorted(entries, key=lambda e: e[0])
+    tails, tail_idx, prev = [], [], [None] * len(entries)
+    for i, (_, ts, _) in enumerate(entries):
+        pos = bisect_left(tails, ts)
+        prev[i] = tail_idx[pos - 1] if pos else None
+        if pos == len(tails):
+            tails.append(ts)
+            tail_idx.append(i)
+        else:
+            tails[pos], tail_idx[pos] = ts, i
+    keep, i = [], tail_idx[-1] if tail_idx else None
+    while i is not None:
+        keep.append(entries[i][2])
+        i = prev[i]
+    return keep[::-1]
 
 def convert_json_to_csv(json_path, csv_path):
     with open(json_path, 'r') as f:
         data = json.load(f)
+    existing = load_existing(csv_path)
     
     rows = []
+    kept = clamped = 0
+    videos = {}  # (sku, division, youtube id) -> new entries, checked for order before they are added
     for match_id, m in data.items():
-        sku = m['event']['sku']
+        sku = m['event'].get('sku') or m['event']['code']
         
-        # Normalize match name
-        # Qualifier #1 -> Q1
-        # Final #1 -> F1
-        # Semifinals #2 -> SF2
-        # Round of 16 #5-2 -> R16-5-2
-        name = m['match_name']
-        match_type = ""
-        if "Qualifier" in name: match_type = "Q"
-        elif "Final" in name: match_type = "F"
-        elif "Semifinal" in name: match_type = "SF"
-        elif "Quarterfinal" in name: match_type = "QF"
-        elif "Round of 16" in name: match_type = "R16"
-        
-        # Extract numbers
-        nums = re.findall(r'\d+', name)
-        match_str = match_type + "-".join(nums)
+        match_str = normalize(m['match_name'])
+        div_id = m.get('division_id', 1)
+        if (sku, match_str, str(div_id)) in existing:
+            # Keep the existing video/timestamp; only matches new to the CSV come from the JSON
+            rows.append(existing.pop((sku, match_str, str(div_id))))
+            kept += 1
+            continue
         
         yt_url = m['video_url']
         # Extract youtube ID: https://www.youtube.com/watch?v=ID&...
@@ -36,16 +62,25 @@ def convert_json_to_csv(json_path, csv_path):
              yt_id = yt_url.split('youtu.be/')[1].split('?')[0]
              
         ts = m['timestamp']
-        div_id = m.get('division_id', 1)
+        if not ts:
+            # Clamped to the start of the video: the fit put the match before it began
+            clamped += 1
+            continue
         
-        rows.append([sku, match_str, yt_id, ts, div_id])
+        started = m.get('started') or m.get('scheduled') or ''
+        videos.setdefault((sku, div_id, yt_id), []).append((started, ts, [sku, match_str, yt_id, ts, div_id]))
+
+    added = [row for entries in videos.values() for row in in_order(entries)]
+    out_of_order = sum(len(entries) for entries in videos.values()) - len(added)
+    rows += added
         
     with open(csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['sku', 'match_name', 'youtube_id', 'timestamp_seconds', 'division_id'])
-        writer.writerows(rows)
+        writer.writerows(rows + list(existing.values()))
     
-    print(f"Generated {csv_path} with {len(rows)} rows.")
+    print(f"Generated {csv_path} with {len(rows) + len(existing)} rows ({kept} kept as they were, "
+          f"{len(added)} added; skipped {clamped} clamped to 0 and {out_of_order} out of order).")
 
 if __name__ == "__main__":
     convert_json_to_csv("match_links.json", "match_videos_fixed.csv")
@@ -1,7 +1,11 @@
 
 import json
 import csv
-from datetime import datetime
+import time
+
+import match_names
+import stream_anchors
+from match_store import DEFAULT_STORE, MatchStore
 
 # --- Configuration ---
 # Keys are SKU, values are lists of stream configs for that event
@@ -149,108 +153,57 @@ STREAMS = {
 
 }
 
-def load_matches(file_path):
-    with open(file_path, 'r') as f:
-        return json.load(f)
+# Match ranges with no usable video, by SKU. prefix/from/to apply to the normalized
+# name (Q84..Q109); div_id is optional and limits the range to one division.
+EXCLUDE = {
+    "RE-V5RC-25-0254": [ # NorCal SV MS
+        {"prefix": "Q", "from": 84, "to": 109, "reason": "stream crash"}
+    ]
+}
 
-def normalize_match_name(name):
-    """
-    Normalizes 'Qualifier #1' -> 'Q1', 'Round of 16 #4-1' -> 'R164-1', etc.
-    Matches the expectations of parse_match_name in upload_match_videos.py
-    """
-    if not name: return name
-    n = name.replace('Qualifier #', 'Q')
-    n = n.replace('Round of 16 #', 'R16')
-    n = n.replace('Quarterfinal #', 'QF')
-    n = n.replace('Semifinal #', 'SF')
-    n = n.replace('Final #', 'F')
-    n = n.replace('Practice #', 'P')
-    n = n.replace('Round of 32 #', 'R32')
-    n = n.replace('Round of 64 #', 'R64')
-    return n.replace(' #', '')
+def is_excluded(clean_name, div_id, ranges):
+    for r in ranges:
+        if r.get('div_id') is not None and int(r['div_id']) != div_id:
+            continue
+        prefix = r['prefix']
+        rest = clean_name[len(prefix):] if clean_name and clean_name.startswith(prefix) else ''
+        if rest.isdigit() and int(r['from']) <= int(rest) <= int(r['to']):
+            return True
+    return False
+
+def load_matches(store, skus):
+    """Matches for just the configured events, pulled from the local match store."""
+    matches = []
+    for sku in skus:
+        matches.extend(store.event(sku))
+    return matches
 
-def generate_links():
-    data = load_matches('collected_matches.json')
-    matches = list(data.get('matches', {}).values())
-    print(f"Total collected matches loaded: {len(matches)}")
+def generate_links(fit_rate=False):
+    store = MatchStore(DEFAULT_STORE)
+    matches = [m for m in load_matches(store, STREAMS) if m.started]
+    store.close()
+    print(f"Matches loaded for {len(STREAMS)} streamed events: {len(matches)}")
     
-    # Pre-calculate video start timestamps
-    for sku in STREAMS:
-        for cfg in STREAMS[sku]:
-            # Find the reference match to anchor this stream segment
-            ref_match = None
-            for match in matches:
-                if (match.get('event', {}).get('code') == sku and 
-                    match.get('name') == cfg['ref_match_name'] and 
-                    match.get('division', {}).get('id') == cfg['div_id']):
-                    ref_match = match
-                    break
-            
-            if ref_match and ref_match.get('started'):
-                ref_start_dt = datetime.fromisoformat(ref_match['started'].replace('Z', '+00:00'))
-                v_start = ref_start_dt.timestamp() - cfg['ref_timestamp']
-                cfg['v_start'] = v_start
-                print(f"Anchored {sku} ({cfg['video_id']}) using {cfg['ref_match_name']} -> v_start={v_start}")
+    # Fit segment starts from their anchors, then pick each match's segment in one pass
+    started = time.perf_counter()
+    assigned = stream_anchors.solve(matches, STREAMS, fit_rate=fit_rate)
+    print(f"Solved {len(assigned)} match offsets in {(time.perf_counter() - started) * 1000:.1f} ms")
 
     links = []
-    
-    for match in matches:
-        if not match.get('started'): continue
-        
-        sku = match.get('event', {}).get('code')
-        if sku not in STREAMS: continue
-        
-        div_id = match.get('division', {}).get('id')
-        match_name = match.get('name')
-        match_start_dt = datetime.fromisoformat(match['started'].replace('Z', '+00:00'))
-        match_ts = match_start_dt.timestamp()
-        
-        # Select the best stream segment
-        best_cfg = None
-        min_abs_offset = float('inf')
-        
-        for cfg in STREAMS[sku]:
-            if div_id != cfg['div_id'] or 'v_start' not in cfg: continue
-            
-            offset = match_ts - cfg['v_start']
-            
-            # A match belongs to a segment if it's reasonably close. 
-            # If there's a huge gap (crash), the later segment will eventually be "closer" or have a smaller positive offset.
-            # We prefer positive offsets (match starts AFTER segment start)
-            if 0 <= offset < 43200: # Match is within 12 hours after segment start
-                if offset < min_abs_offset:
-                    min_abs_offset = offset
-                    best_cfg = cfg
-            elif best_cfg is None and -14400 < offset < 0:
-                # Allow matches up to 4 hours BEFORE the anchor if no positive match found yet
-                # This handles early morning matches before the reference match
-                if abs(offset) < min_abs_offset:
-                    min_abs_offset = abs(offset)
-                    best_cfg = cfg
-                
-        if not best_cfg:
-            continue
-            
-        timestamp = int(match_ts - best_cfg['v_start'])
-        if timestamp < 0: timestamp = 0
-        
-        clean_name = normalize_match_name(match_name)
+    for match, segment, timestamp in assigned:
+        sku = match.sku
+        clean_name = match_names.normalize(match.name)
 
-        # Event-specific filtering (NorCal Crash)
-        try:
-            if sku == 'RE-V5RC-25-0254' and clean_name.startswith('Q'):
-                qnum = int(clean_name[1:])
-                if 84 <= qnum <= 109:
-                    continue # Skip lost matches during stream crash
-        except:
-            pass
+        # Event-specific exclusions (stream crashes etc.)
+        if is_excluded(clean_name, match.division_id, EXCLUDE.get(sku, [])):
+            continue
             
         links.append({
             'sku': sku,
             'match_name': clean_name,
-            'youtube_id': best_cfg['video_id'],
+            'youtube_id': segment['video_id'],
             'timestamp_seconds': timestamp,
-            'division_id': div_id
+            'division_id': match.division_id
         })
 
     print(f"Generated links for {len(links)} matches.")
@@ -264,4 +217,8 @@ def generate_links():
     print(f"Saved to {csv_file}")
 
 if __name__ == "__main__":
-    generate_links()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate multi_event_links.csv from STREAMS")
+    parser.add_argument("--fit-rate", action="store_true",
+                        help="Also fit playback rate for segments with 3+ anchors")
+    generate_links(fit_rate=parser.parse_args().fit_rate)
@@ -0,0 +1,233 @@
+"""
+Video Anchor Inference
+
+Finds stream anchors automatically instead of by hand. For each video, a local
+file of (video timestamp, match label) observations is aligned against the
+matches' `started` times from the local match store:
+
+  - chapters:   YouTube description lines like "1:23:45 Qualification 12"
+  - vtt / srt:  caption transcripts ("...up next, qualification match 12...")
+  - csv:        OCR output or multi_event_links.csv (timestamp_seconds, match_name)
+
+Every recognized label becomes a (started, video_ts) pair. The offsets
+(video_ts - started) are clustered (a crash or a cut restarts the clock and
+shifts every later offset), each cluster is fitted robustly (median/MAD outlier rejection
+followed by least squares on the inliers, optionally a Theil-Sen rate), and
+the inliers become the segment's anchors. Clusters that overlap a larger one in
+video time are mislabels rather than restarts and are dropped; consecutive
+segments of one video get min/max_timestamp bounds at the restart. Output is one JSON file per event in
+the stream_registry `put` format:
+
+    python3 scripts/infer_anchors.py manifest.json --out-dir anchors/
+    python3 scripts/stream_registry.py put RE-V5RC-25-0147 anchors/RE-V5RC-25-0147.json
+
+manifest.json lists the videos to process:
+
+    [{"sku": "RE-V5RC-25-0147", "div_id": 1, "video_id": "NaLgd1bmHy4",
+      "source": "chapters/NaLgd1bmHy4.txt", "format": "chapters"}]
+
+Requires numpy (pip install numpy).
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from collections import defaultdict
+
+import numpy as np
+
+import match_names
+from match_store import DEFAULT_STORE, MatchStore
+
+TIMESTAMP = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,](\d+))?')
+CUE_TIMING = re.compile(r'^\s*([\d:.,]+)\s*-->\s*([\d:.,]+)')
+
+SPLIT_GAP = 300      # offsets further apart than this (s) belong to different segments
+MIN_SUPPORT = 3      # clusters with fewer observations are treated as outliers
+MIN_TOLERANCE = 30   # inlier tolerance floor (s), on top of 3 x MAD
+
+
+def match_name_from_label(text: str):
+    """RobotEvents match name for the first label in `text`, or None."""
+    key = match_names.find_name(text)
+    return match_names.format_name(key) if key else None
+
+
+def parse_timestamp(text: str):
+    m = TIMESTAMP.search(text)
+    if not m:
+        return None
+    hours, minutes, seconds, fraction = m.groups()
+    value = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    return value + (float(f"0.{fraction}") if fraction else 0.0)
+
+
+def read_chapters(path: str):
+    with open(path) as f:
+        for line in f:
+            ts = parse_timestamp(line)
+            name = match_name_from_label(TIMESTAMP.sub(' ', line, count=1))
+            if ts is not None and name:
+                yield ts, name
+
+
+def read_captions(path: str):
+    """VTT/SRT cues: the cue start time and every label spoken in the cue."""
+    start = None
+    with open(path) as f:
+        for line in f:
+            timing = CUE_TIMING.match(line)
+            if timing:
+                start = parse_timestamp(timing.group(1))
+            elif not line.strip():
+                start = None
+            elif start is not None:
+                name = match_name_from_label(line)
+                if name:
+                    yield start, name
+
+
+def read_csv(path: str):
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            name = match_name_from_label(row.get('match_name', ''))
+            if name and row.get('timestamp_seconds'):
+                yield float(row['timestamp_seconds']), name
+
+
+READERS = {'chapters': read_chapters, 'vtt': read_captions, 'srt': read_captions, 'csv': read_csv}
+
+
+def read_observations(source: str, fmt: str = None):
+    """[(video_ts, match_name)] keeping the first sighting of each label."""
+    fmt = fmt or os.path.splitext(source)[1].lstrip('.').lower()
+    if fmt not in READERS:
+        fmt = 'chapters'
+    first = {}
+    for ts, name in READERS[fmt](source):
+        if name not in first or ts < first[name]:
+            first[name] = ts
+    return sorted((ts, name) for name, ts in first.items())
+
+
+def cluster_offsets(offset):
+    """Indices grouped by offset cluster.
+
+    A stream restart shifts every later offset by the length of the outage, so
+    clusters are separated by gaps of more than SPLIT_GAP between sorted
+    offsets. Clusters with fewer than MIN_SUPPORT points are mislabels.
+    """
+    order = np.argsort(offset)
+    breaks = np.flatnonzero(np.diff(offset[order]) > SPLIT_GAP) + 1
+    return [c for c in np.split(order, breaks) if len(c) >= MIN_SUPPORT]
+
+
+def robust_fit(wall, video, fit_rate: bool = False):
+    """Fit video = rate * wall + intercept ignoring outliers.
+
+    Returns (rate, intercept, inlier_mask, rms). Outliers are points more than
+    max(MIN_TOLERANCE, 3 x MAD) from the median offset; the final estimate is
+    least squares over the inliers (Theil-Sen for the rate when fit_rate).
+    """
+    offset = video - wall
+    center = np.median(offset)
+    mad = 1.4826 * np.median(np.abs(offset - center))
+    inliers = np.abs(offset - center) <= max(MIN_TOLERANCE, 3 * mad)
+
+    rate = 1.0
+    w, v = wall[inliers], video[inliers]
+    if fit_rate and len(w) >= 3:
+        i, j = np.triu_indices(len(w), k=1)
+        dw = w[j] - w[i]
+        valid = dw != 0
+        if valid.any():
+            rate = float(np.median((v[j] - v[i])[valid] / dw[valid]))
+    intercept = float(np.mean(v - rate * w))
+    rms = float(np.sqrt(np.mean((v - (rate * w + intercept)) ** 2)))
+    return rate, intercept, inliers, rms
+
+
+def infer_video(observations, matches_by_name: dict, fit_rate: bool = False):
+    """Segments (registry format) for one video's observations."""
+    pairs = [(matches_by_name[name].started_ts, ts, name)
+             for ts, name in observations
+             if name in matches_by_name and matches_by_name[name].started]
+    if len(pairs) < MIN_SUPPORT:
+        return [], len(pairs)
+
+    wall = np.array([p[0] for p in pairs])
+    video = np.array([p[1] for p in pairs], dtype=np.float64)
+    fits = []
+    for cluster in cluster_offsets(video - wall):
+        rate, intercept, inliers, rms = robust_fit(wall[cluster], video[cluster], fit_rate)
+        fits.append((cluster[inliers], len(cluster) - inliers.sum(), rate, intercept, rms))
+
+    # Segments of one video follow each other in time. A cluster whose span overlaps
+    # a better-supported one is a run of mislabels, not a restart, so drop it.
+    segments = []
+    spans = []
+    for kept, outliers, rate, intercept, rms in sorted(fits, key=lambda f: -len(f[0])):
+        lo, hi = video[kept].min(), video[kept].max()
+        if any(lo <= s_hi and s_lo <= hi for s_lo, s_hi in spans):
+            continue
+        spans.append((lo, hi))
+        segments.append({
+            'anchors': [{'match_name': pairs[i][2], 'timestamp': int(round(pairs[i][1]))}
+                        for i in sorted(kept, key=lambda i: pairs[i][1])],
+            'fit': {'rate': round(rate, 6), 'v_start': round(-intercept / rate), 'rms': round(rms, 1),
+                    'inliers': int(len(kept)), 'outliers': int(outliers)},
+        })
+    segments.sort(key=lambda seg: seg['anchors'][0]['timestamp'])
+    # After a restart, the next segment's fitted start lies before the outage; split
+    # the video between neighbouring segments halfway between their anchors
+    for prev, nxt in zip(segments, segments[1:]):
+        boundary = (prev['anchors'][-1]['timestamp'] + nxt['anchors'][0]['timestamp']) // 2
+        prev['max_timestamp'] = boundary
+        nxt['min_timestamp'] = boundary
+    return segments, len(pairs)
+
+
+def run(manifest_path: str, out_dir: str, store_path: str = DEFAULT_STORE, fit_rate: bool = False) -> dict:
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    store = MatchStore(store_path)
+    by_event = {}
+    results = defaultdict(list)
+    for video in manifest:
+        key = (video['sku'], video.get('div_id', 1))
+        if key not in by_event:
+            by_event[key] = {m.name: m for m in store.event(*key) if m.name}
+        observations = read_observations(video['source'], video.get('format'))
+        segments, matched = infer_video(observations, by_event[key], fit_rate)
+        print(f"{video['sku']} div {key[1]} {video['video_id']}: {len(observations)} labels, "
+              f"{matched} matched, {len(segments)} segment(s)")
+        for seg in segments:
+            print(f"    v_start={seg['fit']['v_start']} rms={seg['fit']['rms']}s "
+                  f"inliers={seg['fit']['inliers']} outliers={seg['fit']['outliers']}")
+            results[video['sku']].append(dict(seg, video_id=video['video_id'], div_id=key[1]))
+    store.close()
+
+    os.makedirs(out_dir, exist_ok=True)
+    for sku, segments in results.items():
+        path = os.path.join(out_dir, f"{sku}.json")
+        with open(path, 'w') as f:
+            json.dump({'segments': segments, 'exclude': []}, f, indent=2)
+        print(f"Wrote {len(segments)} segment(s) to {path}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Infer stream anchors from chapter/transcript/OCR files")
+    parser.add_argument("manifest", help="JSON list of {sku, div_id, video_id, source, format}")
+    parser.add_argument("--out-dir", default="anchors", help="Directory for per-event registry JSON")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Local match store path")
+    parser.add_argument("--fit-rate", action="store_true", help="Also fit playback rate (Theil-Sen)")
+    args = parser.parse_args()
+    run(args.manifest, args.out_dir, args.store, args.fit_rate)
+
+
+if __name__ == "__main__":
+    main()
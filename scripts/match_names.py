@@ -0,0 +1,105 @@
+"""
+Match Names
+
+One parser/formatter for every match-name spelling the link and upload tools
+see. Each spelling maps to the canonical key (round, instance, matchnum), with
+RobotEvents round numbers (the same numbers the table's sort keys use):
+
+    Qualifier #12    Q12                      -> (2, 1, 12)
+    Practice #3      P3                       -> (1, 1, 3)
+    R16 #5-2         R165-2   R16-5-2         -> (6, 5, 2)
+    QF #1-1          QF1-1    Quarterfinal #1-1 -> (3, 1, 1)
+    SF #2-1          SF2-1    Semifinal #2-1  -> (4, 2, 1)
+    Final #1-2       F1-2                     -> (5, 1, 2)
+
+format_name(key) gives the RobotEvents name and short_name(key) the compact
+form used in multi_event_links.csv; both parse back to the same key.
+Elimination names without a match number keep the old upload parser's reading:
+'SF2' is instance 2 match 1, 'F2' is instance 1 match 2.
+
+The spelling table is compiled into a single regex, so parsing is one match
+call per name, and results are cached since the same few hundred names repeat
+across every event.
+"""
+
+import re
+from functools import lru_cache
+
+# round number, short prefix, RobotEvents prefix, accepted spellings (regex, case-insensitive).
+# Order matters: longer prefixes must come before the ones they start with (QF before Q).
+ROUNDS = [
+    (6, 'R16', 'R16', r'r(?:ound\s*of\s*)?16'),
+    (3, 'QF', 'QF', r'q(?:uarter\s*-?\s*finals?|f)'),
+    (4, 'SF', 'SF', r's(?:emi\s*-?\s*finals?|f)'),
+    (5, 'F', 'Final', r'f(?:inals?)?'),
+    (2, 'Q', 'Qualifier', r'q(?:ualifi(?:ers?|cations?)|uals?)?'),
+    (1, 'P', 'Practice', r'p(?:ractice)?'),
+]
+SINGLE_ROUNDS = {1, 2}  # numbered by matchnum only; instance is always 1
+
+SHORT_PREFIX = {num: short for num, short, _, _ in ROUNDS}
+LONG_PREFIX = {num: long for num, _, long, _ in ROUNDS}
+
+_PREFIXES = '|'.join(f'(?P<r{num}>{spelling})' for num, _, _, spelling in ROUNDS)
+_NUMBERS = r'\s*(?:match\s*)?[#-]?\s*(\d+)(?:\s*-\s*(\d+))?'
+NAME_PATTERN = re.compile(rf'^\s*(?:{_PREFIXES}){_NUMBERS}\s*$', re.I)
+# Free text (chapters, captions, OCR): first label anywhere in the string
+LABEL_PATTERN = re.compile(rf'\b(?:{_PREFIXES}){_NUMBERS}\b', re.I)
+
+
+def _key(m):
+    round_num = next(num for num, *_ in ROUNDS if m.group(f'r{num}') is not None)
+    first, second = m.group(len(ROUNDS) + 1), m.group(len(ROUNDS) + 2)
+    if round_num in SINGLE_ROUNDS:
+        if second is not None:
+            return None
+        return (round_num, 1, int(first))
+    if second is not None:
+        return (round_num, int(first), int(second))
+    if round_num == 5:
+        return (round_num, 1, int(first))
+    return (round_num, int(first), 1)
+
+
+@lru_cache(maxsize=4096)
+def parse_name(name: str) -> tuple:
+    """(round, instance, matchnum) for any supported spelling; ValueError otherwise."""
+    m = NAME_PATTERN.match(name or '')
+    key = _key(m) if m else None
+    if key is None:
+        raise ValueError(f"Unknown match notation: {name}")
+    return key
+
+
+def find_name(text: str):
+    """Key for the first match label in free text, or None."""
+    for m in LABEL_PATTERN.finditer(text or ''):
+        key = _key(m)
+        if key:
+            return key
+    return None
+
+
+def format_name(key: tuple) -> str:
+    """RobotEvents name: 'Qualifier #12', 'R16 #5-2', 'Final #1-1'."""
+    round_num, instance, matchnum = key
+    if round_num in SINGLE_ROUNDS:
+        return f'{LONG_PREFIX[round_num]} #{matchnum}'
+    return f'{LONG_PREFIX[round_num]} #{instance}-{matchnum}'
+
+
+def short_name(key: tuple) -> str:
+    """Compact CSV name: 'Q12', 'R165-2', 'F1-1'."""
+    round_num, instance, matchnum = key
+    if round_num in SINGLE_ROUNDS:
+        return f'{SHORT_PREFIX[round_num]}{matchnum}'
+    return f'{SHORT_PREFIX[round_num]}{instance}-{matchnum}'
+
+
+@lru_cache(maxsize=4096)
+def normalize(name: str) -> str:
+    """Short form of any spelling; names that don't parse are returned unchanged."""
+    try:
+        return short_name(parse_name(name))
+    except ValueError:
+        return name
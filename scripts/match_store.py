@@ -0,0 +1,183 @@
+"""
+Local Match Store
+
+Indexed SQLite replacement for collected_matches.json. Matches are keyed by
+RobotEvents match ID, upserted one row at a time, and indexed by SKU,
+division and name, so tools can pull a single event without loading (or
+rewriting) the whole season:
+
+    from match_store import MatchStore
+    store = MatchStore()
+    store.upsert(matches)                            # API dicts or MatchRecords
+    for m in store.event('RE-V5RC-25-0165', division_id=1):
+        ...
+
+Each row keeps the match JSON as it was stored: API dicts verbatim (video_url
+and any field MatchRecord doesn't carry included), MatchRecords via to_api().
+Rows come back as ingest.MatchRecord, or as that JSON with raw=True, which is
+what export and extract write. To migrate an existing file:
+
+    python3 scripts/match_store.py import collected_matches.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from typing import Iterable, Iterator, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+from ingest import MatchRecord
+
+DEFAULT_STORE = 'collected_matches.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    sku TEXT NOT NULL,
+    division_id INTEGER,
+    name TEXT,
+    started TEXT,
+    scheduled TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_event ON matches (sku, division_id, name);
+CREATE INDEX IF NOT EXISTS idx_matches_name ON matches (name);
+"""
+
+UPSERT = """
+INSERT INTO matches (id, sku, division_id, name, started, scheduled, data) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    sku = excluded.sku, division_id = excluded.division_id, name = excluded.name,
+    started = excluded.started, scheduled = excluded.scheduled, data = excluded.data
+"""
+
+
+def _record(match) -> MatchRecord:
+    return match if isinstance(match, MatchRecord) else MatchRecord.from_api(match)
+
+
+def _is_match(obj) -> bool:
+    return isinstance(obj, dict) and 'matchnum' in obj and 'alliances' in obj
+
+
+class MatchStore:
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def _records(self, sql: str, params=(), raw: bool = False) -> Iterator:
+        for (data,) in self.conn.execute(sql, params):
+            match = json.loads(data)
+            yield match if raw else MatchRecord.from_api(match)
+
+    def upsert(self, matches: Iterable) -> int:
+        """Insert or replace matches by ID. Returns how many were new."""
+        rows = []
+        for m in matches:
+            rec = _record(m)
+            if rec.id is None or not rec.sku:
+                continue
+            data = rec.to_api() if m is rec else m
+            rows.append((rec.id, rec.sku, rec.division_id, rec.name, rec.started, rec.scheduled,
+                         json.dumps(data, separators=(',', ':'), default=str)))
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        existing = set()
+        for n in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+            chunk = ids[n:n + 500]
+            existing.update(r[0] for r in self.conn.execute(
+                f"SELECT id FROM matches WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(set(ids) - existing)
+
+    def get(self, match_id) -> Optional[MatchRecord]:
+        return next(self._records("SELECT data FROM matches WHERE id = ?", (int(match_id),)), None)
+
+    def event(self, sku: str, division_id: int = None, raw: bool = False) -> Iterator:
+        """Matches for one event (optionally one division), in play order."""
+        sql = "SELECT data FROM matches WHERE sku = ?"
+        params = [sku]
+        if division_id is not None:
+            sql += " AND division_id = ?"
+            params.append(division_id)
+        sql += " ORDER BY COALESCE(NULLIF(started, ''), scheduled), id"
+        return self._records(sql, params, raw)
+
+    def find(self, sku: str, division_id: int, name: str) -> Optional[MatchRecord]:
+        return next(self._records(
+            "SELECT data FROM matches WHERE sku = ? AND division_id = ? AND name = ?",
+            (sku, division_id, name)
+        ), None)
+
+    def all(self, raw: bool = False) -> Iterator:
+        return self._records("SELECT data FROM matches ORDER BY id", raw=raw)
+
+    def event_skus(self) -> list:
+        return [sku for (sku,) in self.conn.execute("SELECT DISTINCT sku FROM matches ORDER BY sku")]
+
+    def event_counts(self) -> list:
+        """[(sku, match count)] with the busiest events first."""
+        return self.conn.execute(
+            "SELECT sku, COUNT(*) AS n FROM matches GROUP BY sku ORDER BY n DESC, sku"
+        ).fetchall()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def import_json(store: MatchStore, path: str) -> int:
+    """Load a collected_matches.json-style file ({"matches": {...}}) or match list into the store."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('matches', data)
+    matches = data.values() if isinstance(data, dict) else data
+    return store.upsert(m for m in matches if _is_match(m))
+
+
+def export_json(store: MatchStore, path: str) -> int:
+    """Write the store back out in the old collected_matches.json layout."""
+    matches = {str(m['id']): m for m in store.all(raw=True)}
+    with open(path, 'w') as f:
+        json.dump({'matches': matches, 'event_skus': store.event_skus()}, f, indent=2)
+    return len(matches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SQLite store of collected RobotEvents matches")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Store file path")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    imp = sub.add_parser('import', help="Upsert matches from a collected_matches.json-style file")
+    imp.add_argument("path")
+
+    exp = sub.add_parser('export', help="Write the store out as collected_matches.json")
+    exp.add_argument("path")
+
+    sub.add_parser('info', help="Show match counts per event")
+
+    args = parser.parse_args()
+    store = MatchStore(args.store)
+
+    if args.command == 'import':
+        new = import_json(store, args.path)
+        print(f"Imported {args.path}: {new} new matches, {len(store)} total in {args.store}")
+    elif args.command == 'export':
+        print(f"Exported {export_json(store, args.path)} matches to {args.path}")
+    else:
+        print(f"Store: {args.store} ({len(store)} matches)")
+        for sku, count in store.event_counts():
+            print(f"  {sku:<20} {count}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@ import json
 import csv
 import os
 
+from match_names import normalize
+from match_store import MatchStore
+
 def merge_links():
     links_file = '/Users/jj/vex5hub-site/match_links.json'
     csv_file = '/Users/jj/vex5hub-site/multi_event_links.csv'
-    matches_file = '/Users/jj/vex5hub-site/collected_matches.json'
+    store_file = '/Users/jj/vex5hub-site/collected_matches.db'
     
     # Load existing links
     try:
@@ -18,26 +21,18 @@ def merge_links():
         print(f"Error loading {links_file}: {e}")
         links = {}
     
-    # Load all matches
-    with open(matches_file, 'r') as f:
-        data = json.load(f)
-        all_matches = data.get('matches', {})
+    store = MatchStore(store_file)
     
-    # Pre-index matches for faster lookup: (sku, div_id, normalized_name) -> match_id
+    # Index matches per event, loading only the events the CSV references:
+    # (sku, div_id, short match name) -> match
     match_lookup = {}
-    for m_id, m in all_matches.items():
-        sku = m.get('event', {}).get('code')
-        div = m.get('division', {}).get('id')
-        name = m.get('name')
-        if sku and name:
-            # We need to normalize name like the generation script did
-            norm_name = name.replace('Qualifier #', 'Q')
-            norm_name = norm_name.replace('Round of 16 #', 'R16')
-            norm_name = norm_name.replace('Quarterfinal #', 'QF')
-            norm_name = norm_name.replace('Semifinal #', 'SF')
-            norm_name = norm_name.replace('Final #', 'F')
-            norm_name = norm_name.replace(' #', '')
-            match_lookup[(sku, div, norm_name)] = m_id
+    
+    def index_event(sku):
+        for m in store.event(sku):
+            if m.name:
+                match_lookup[(sku, m.division_id, normalize(m.name))] = m
+    
+    indexed_skus = set()
             
     # Load CSV and merge
     merged_count = 0
@@ -45,34 +40,40 @@ def merge_links():
         reader = csv.DictReader(f)
         for row in reader:
             sku = row['sku']
-            name = row['match_name']
+            name = normalize(row['match_name'])
             div = int(row['division_id'])
             v_id = row['youtube_id']
             ts = int(row['timestamp_seconds'])
             
-            m_id = match_lookup.get((sku, div, name))
-            if m_id:
-                match_data = all_matches[m_id]
+            if sku not in indexed_skus:
+                index_event(sku)
+                indexed_skus.add(sku)
+            
+            match_data = match_lookup.get((sku, div, name))
+            if match_data:
+                m_id = str(match_data.id)
                 links[m_id] = {
                     "match_id": int(m_id),
-                    "match_name": match_data.get('name'),
+                    "match_name": match_data.name,
                     "video_url": f"https://www.youtube.com/watch?v={v_id}&t={ts}s",
                     "timestamp": ts,
-                    "alliances": match_data.get('alliances'),
-                    "round": match_data.get('round'),
-                    "instance": match_data.get('instance'),
-                    "matchnum": match_data.get('matchnum'),
+                    "alliances": match_data.alliances(),
+                    "round": match_data.round,
+                    "instance": match_data.instance,
+                    "matchnum": match_data.matchnum,
                     "division_id": div,
-                    "started": match_data.get('started'),
-                    "scheduled": match_data.get('scheduled'),
-                    "field": match_data.get('field'),
-                    "event": match_data.get('event')
+                    "started": match_data.started,
+                    "scheduled": match_data.scheduled,
+                    "field": match_data.field,
+                    "event": {"id": match_data.event_id, "name": match_data.event_name, "code": match_data.sku}
                 }
                 merged_count += 1
             else:
                 # Silently skip if match_id not found in current local data (it might be in RobotEvents but not here)
                 pass
 
+    store.close()
+
     # Save merged links
     with open(links_file, 'w') as f:
         json.dump(links, f, indent=2)
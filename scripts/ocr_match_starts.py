@@ -0,0 +1,187 @@
+"""
+OCR Match-Start Detection
+
+Finds when each match starts in a local stream recording by reading the match
+label off the on-screen scoreboard. CPU only:
+
+  1. the video is split into one time range per worker process, and each
+     worker decodes only the frames it samples (default one every 2s)
+  2. each sampled frame is cropped to the scoreboard region, binarized and
+     OCR'd as a single text line
+  3. a label counts once it is read on --confirm consecutive samples; its
+     first sighting is the match start
+
+Rows are written in the multi_event_links.csv schema, so they can go straight
+to merge_links_to_json.py, or into infer_anchors.py (format "csv") to fit
+segment offsets instead of trusting each reading:
+
+    python3 scripts/ocr_match_starts.py day1.mp4 --sku RE-V5RC-25-0147 --video-id NaLgd1bmHy4 \\
+        --crop 0.0,0.88,0.35,0.12 --out ocr_NaLgd1bmHy4.csv
+
+--crop is x,y,width,height as fractions of the frame. Use --debug-frame SECONDS
+to save the crop at one timestamp and check the region.
+
+Requires opencv-python, pytesseract and the tesseract binary.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from infer_anchors import match_name_from_label
+from match_names import normalize
+
+try:
+    import cv2
+    import pytesseract
+except ImportError:  # checked in main() so --help still works
+    cv2 = pytesseract = None
+
+CSV_FIELDS = ['sku', 'match_name', 'youtube_id', 'timestamp_seconds', 'division_id']
+TESSERACT_CONFIG = '--psm 7'  # single text line
+
+
+def _crop(frame, crop):
+    h, w = frame.shape[:2]
+    x, y, cw, ch = crop
+    return frame[int(y * h):int((y + ch) * h), int(x * w):int((x + cw) * w)]
+
+
+def read_label(frame, crop):
+    """RobotEvents match name shown in the scoreboard crop, or None."""
+    region = cv2.cvtColor(_crop(frame, crop), cv2.COLOR_BGR2GRAY)
+    # Tesseract reads small overlay text much better upscaled and binarized
+    region = cv2.resize(region, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    _, region = cv2.threshold(region, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    text = pytesseract.image_to_string(region, config=TESSERACT_CONFIG)
+    return match_name_from_label(text)
+
+
+def scan_range(path: str, start: float, end: float, interval: float, crop):
+    """Worker: [(timestamp, match_name or None)] for samples in [start, end)."""
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, int(round(interval * fps)))
+    frame_no = int(start * fps)
+    last = int(end * fps)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+
+    readings = []
+    while frame_no < last:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        readings.append((frame_no / fps, read_label(frame, crop)))
+        # grab() skips frames without decoding them
+        for _ in range(step - 1):
+            if not cap.grab():
+                break
+        frame_no += step
+    cap.release()
+    return readings
+
+
+def video_duration(path: str) -> float:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+    cap.release()
+    return duration
+
+
+def detect_starts(readings, confirm: int = 2):
+    """[(match_name, first_seen_seconds)] for labels read on `confirm` consecutive samples."""
+    starts = {}
+    run_name, run_start, run_len = None, None, 0
+    for ts, name in readings:
+        if name and name == run_name:
+            run_len += 1
+        else:
+            run_name, run_start, run_len = name, ts, 1
+        if run_name and run_len >= confirm and run_name not in starts:
+            starts[run_name] = run_start
+    return sorted(starts.items(), key=lambda item: item[1])
+
+
+def scan_video(path: str, interval: float = 2.0, crop=(0.0, 0.88, 0.35, 0.12), workers: int = None):
+    """Sample the whole video across worker processes; readings in time order."""
+    duration = video_duration(path)
+    workers = workers or os.cpu_count() or 1
+    bounds = [duration * i / workers for i in range(workers + 1)]
+    # Align chunk boundaries to the sampling grid so no sample is doubled or skipped
+    bounds = [round(b / interval) * interval for b in bounds]
+
+    readings = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scan_range, path, lo, hi, interval, crop)
+                   for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+        for future in futures:
+            readings.extend(future.result())
+    return readings
+
+
+def write_rows(path: str, rows, append: bool = False):
+    exists = append and os.path.exists(path)
+    with open(path, 'a' if append else 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if not exists:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect match starts in a stream recording via scoreboard OCR")
+    parser.add_argument("video", help="Local video file")
+    parser.add_argument("--sku", required=True, help="Event SKU for the output rows")
+    parser.add_argument("--video-id", required=True, help="YouTube video ID for the output rows")
+    parser.add_argument("--div", type=int, default=1, help="Division ID for the output rows")
+    parser.add_argument("--crop", default="0.0,0.88,0.35,0.12", help="Scoreboard region x,y,w,h as frame fractions")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between sampled frames")
+    parser.add_argument("--confirm", type=int, default=2, help="Consecutive readings needed to accept a label")
+    parser.add_argument("--workers", type=int, default=None, help="Decoder processes (default: all cores)")
+    parser.add_argument("--out", default="multi_event_links.csv", help="Output CSV")
+    parser.add_argument("--append", action="store_true", help="Append to --out instead of overwriting")
+    parser.add_argument("--debug-frame", type=float, help="Save the crop at this timestamp to ocr_debug.png and exit")
+    args = parser.parse_args()
+
+    if cv2 is None:
+        print("OCR needs opencv-python and pytesseract: pip install opencv-python pytesseract "
+              "(and install the tesseract binary)")
+        sys.exit(1)
+    crop = tuple(float(v) for v in args.crop.split(','))
+
+    if args.debug_frame is not None:
+        cap = cv2.VideoCapture(args.video)
+        cap.set(cv2.CAP_PROP_POS_MSEC, args.debug_frame * 1000)
+        ok, frame = cap.read()
+        cap.release()
+        if not ok:
+            sys.exit(f"No frame at {args.debug_frame}s")
+        cv2.imwrite('ocr_debug.png', _crop(frame, crop))
+        print(f"Saved crop to ocr_debug.png; OCR reads: {read_label(frame, crop)}")
+        return
+
+    started = time.time()
+    readings = scan_video(args.video, args.interval, crop, args.workers)
+    starts = detect_starts(readings, args.confirm)
+    print(f"Sampled {len(readings)} frames in {time.time() - started:.1f}s, "
+          f"{sum(1 for _, n in readings if n)} with a label, {len(starts)} match starts")
+
+    rows = [{
+        'sku': args.sku,
+        'match_name': normalize(name),
+        'youtube_id': args.video_id,
+        'timestamp_seconds': int(ts),
+        'division_id': args.div,
+    } for name, ts in starts]
+    write_rows(args.out, rows, args.append)
+    print(f"Wrote {len(rows)} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Move season event items onto the sharded partitions.
+
+Season events used to live under one partition, SEASON#{id} / EVENT#{start}#{sku}.
+They now live under SEASON#{id}#S{n} (ingest.season_event_pk), so this copies
+each remaining unsharded item to its shard and deletes the original. The
+SEASON#{id} / RANKING and DASHBOARD items stay where they are. Rankings need
+no migration: the next update_top_teams run writes a sharded version.
+
+    python3 scripts/shard_season.py --season 197 --dry-run
+    python3 scripts/shard_season.py --season 197 --snapshot vex5hub_snapshot.db
+"""
+
+import argparse
+import os
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest  # noqa: E402
+
+
+def unsharded_events(table, season_id: int, snapshot_path: str = None) -> list:
+    pk = f'SEASON#{season_id}'
+    if snapshot_path:
+        return list(Snapshot(snapshot_path).query(pk, 'EVENT#'))
+    items, kwargs = [], {'KeyConditionExpression': Key('PK').eq(pk) & Key('SK').begins_with('EVENT#')}
+    while True:
+        resp = table.query(**kwargs)
+        items += resp.get('Items', [])
+        if 'LastEvaluatedKey' not in resp:
+            return items
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+
+def plan_reshard(events: list, season_id: int):
+    """(copies, deletes): applied in that order, so an interrupted run never loses an event."""
+    copies, deletes = WritePlan(), WritePlan()
+    for event in events:
+        sku = event['SK'].rsplit('#', 1)[-1]
+        copies.put({**event, 'PK': ingest.season_event_pk(season_id, sku)}, reason='sharded_copy')
+        deletes.delete({'PK': event['PK'], 'SK': event['SK']}, reason='unsharded_original')
+    return copies, deletes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move SEASON#{id} event items onto the sharded partitions")
+    parser.add_argument("--season", type=int, required=True, help="Season ID, e.g. 197")
+    parser.add_argument("--profile", default="rdp", help="AWS profile to use")
+    parser.add_argument("--table", default="vex5hub-data", help="DynamoDB table name")
+    parser.add_argument("--snapshot", help="Read the unsharded items from a local table snapshot instead of querying")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without writing")
+    args = parser.parse_args()
+
+    session = boto3.Session(profile_name=args.profile, region_name='ca-central-1')
+    table = session.resource('dynamodb').Table(args.table)
+
+    events = unsharded_events(table, args.season, args.snapshot)
+    print(f"{len(events)} unsharded event items under SEASON#{args.season} "
+          f"-> {ingest.SEASON_SHARDS} shards")
+    copies, deletes = plan_reshard(events, args.season)
+    copies.print_summary()
+    deletes.print_summary()
+    if args.dry_run or not events:
+        return
+    print(f"Copied: {dict(copies.apply(table))}")
+    print(f"Deleted: {dict(deletes.apply(table))}")
+
+
+if __name__ == "__main__":
+    main()
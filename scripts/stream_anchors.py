@@ -0,0 +1,154 @@
+"""
+Stream Anchor Solver
+
+Maps match start times to video timestamps for the streams configured in
+generate_multi_event_links.STREAMS.
+
+Each stream segment is anchored by one or more reference matches whose video
+timestamp is known. A segment may list several anchors:
+
+    {"video_id": "...", "div_id": 1,
+     "anchors": [{"match_name": "Qualifier #13", "timestamp": 1943},
+                 {"match_name": "Qualifier #60", "timestamp": 9112}]}
+
+(the older single ref_match_name/ref_timestamp pair is still accepted). With
+one anchor the segment start is exact; with several it is the least-squares
+fit, which averages out the few seconds of error in each hand-picked point.
+With fit_rate and three or more anchors the playback rate is fitted too, for
+streams that drift against wall-clock time (dropped frames, cut breaks).
+
+Matches are then assigned to segments in one vectorized pass: every match's
+offset into every segment is computed as an (matches x segments) array and
+the best segment is picked per row, using the same rules as before:
+
+  - prefer the segment the match starts 0-12h after, the closest one wins
+  - otherwise allow up to 4h before a segment's start (early-morning matches)
+  - a segment with min_timestamp/max_timestamp only covers that part of its
+    video (used when a stream restarts inside one video)
+
+Requires numpy (pip install numpy).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAX_AFTER = 43200   # match may start up to 12h after the segment start
+MAX_BEFORE = 14400  # ...or up to 4h before it, if no segment claims it otherwise
+
+
+def index_matches(matches: Iterable) -> Dict[Tuple[str, int, str], object]:
+    """(sku, division_id, name) -> MatchRecord, built once for all anchor lookups."""
+    return {(m.sku, m.division_id, m.name): m for m in matches if m.name}
+
+
+def segment_anchors(cfg: dict) -> List[Tuple[str, float]]:
+    """[(match_name, video_timestamp)] for a segment config."""
+    anchors = [(a['match_name'], a['timestamp']) for a in cfg.get('anchors', [])]
+    if 'ref_match_name' in cfg:
+        anchors.append((cfg['ref_match_name'], cfg['ref_timestamp']))
+    return anchors
+
+
+def fit_segment(wall_times, video_times, fit_rate: bool = False):
+    """Least-squares fit of video_ts = rate * wall_ts + intercept.
+
+    Returns (rate, intercept, rms_residual_seconds). The rate is fixed at 1.0
+    unless fit_rate is set and at least three anchors are available.
+    """
+    wall = np.asarray(wall_times, dtype=np.float64)
+    video = np.asarray(video_times, dtype=np.float64)
+    if fit_rate and len(wall) >= 3:
+        # Center wall times so the fit stays well-conditioned at epoch magnitudes
+        origin = wall.mean()
+        design = np.column_stack([wall - origin, np.ones_like(wall)])
+        (rate, centered_intercept), *_ = np.linalg.lstsq(design, video, rcond=None)
+        intercept = centered_intercept - rate * origin
+    else:
+        rate = 1.0
+        intercept = float(np.mean(video - wall))
+    residual = video - (rate * wall + intercept)
+    return float(rate), float(intercept), float(np.sqrt(np.mean(residual ** 2)))
+
+
+def anchor_segments(streams: Dict[str, List[dict]], index: dict, fit_rate: bool = False) -> List[dict]:
+    """Fit every segment in `streams` and return the anchored ones as flat segment dicts.
+
+    Each segment gets rate/intercept (and v_start, the wall time of video t=0)
+    plus the anchors that were found and the fit residual.
+    """
+    segments = []
+    for sku, configs in streams.items():
+        for cfg in configs:
+            found = []
+            for name, ts in segment_anchors(cfg):
+                ref = index.get((sku, cfg['div_id'], name))
+                if ref is not None and ref.started_ts is not None:
+                    found.append((ref.started_ts, ts, name))
+                else:
+                    print(f"  Warning: anchor '{name}' not found for {sku} div {cfg['div_id']} ({cfg['video_id']})")
+            if not found:
+                continue
+            rate, intercept, rms = fit_segment([f[0] for f in found], [f[1] for f in found], fit_rate)
+            segments.append(dict(
+                cfg, sku=sku, rate=rate, intercept=intercept, v_start=-intercept / rate,
+                anchor_count=len(found), rms=rms
+            ))
+            print(f"Anchored {sku} ({cfg['video_id']}) from {len(found)} anchor(s) -> "
+                  f"v_start={-intercept / rate:.0f}, rate={rate:.5f}, rms={rms:.1f}s")
+    return segments
+
+
+def assign_segments(matches: List, segments: List[dict]):
+    """Pick the best segment for every match at once.
+
+    Returns (segment_index, timestamp) arrays aligned with `matches`; the
+    segment index is -1 where no segment covers the match. Timestamps are
+    clamped at 0 like the old generator did.
+    """
+    n = len(matches)
+    if not n or not segments:
+        return np.full(n, -1, dtype=np.int64), np.zeros(n, dtype=np.int64)
+
+    sku_codes = {sku: i for i, sku in enumerate(sorted({s['sku'] for s in segments}))}
+    m_sku = np.fromiter((sku_codes.get(m.sku, -1) for m in matches), dtype=np.int64, count=n)
+    m_div = np.fromiter((m.division_id or 0 for m in matches), dtype=np.int64, count=n)
+    m_wall = np.fromiter((m.started_ts if m.started else np.nan for m in matches), dtype=np.float64, count=n)
+
+    s_sku = np.array([sku_codes[s['sku']] for s in segments], dtype=np.int64)
+    s_div = np.array([s['div_id'] for s in segments], dtype=np.int64)
+    s_rate = np.array([s['rate'] for s in segments], dtype=np.float64)
+    s_intercept = np.array([s['intercept'] for s in segments], dtype=np.float64)
+    s_min = np.array([s.get('min_timestamp', -np.inf) for s in segments], dtype=np.float64)
+    s_max = np.array([s.get('max_timestamp', np.inf) for s in segments], dtype=np.float64)
+
+    # (matches x segments) video offsets; NaN start times compare False everywhere
+    offset = m_wall[:, None] * s_rate[None, :] + s_intercept[None, :]
+    eligible = ((m_sku[:, None] == s_sku[None, :]) & (m_div[:, None] == s_div[None, :])
+                & (offset >= s_min[None, :]) & (offset <= s_max[None, :]))
+
+    after = eligible & (offset >= 0) & (offset < MAX_AFTER)
+    before = eligible & (offset < 0) & (offset > -MAX_BEFORE)
+
+    after_cost = np.where(after, offset, np.inf)
+    before_cost = np.where(before, -offset, np.inf)
+    has_after = after.any(axis=1)
+    has_before = before.any(axis=1)
+
+    best = np.where(has_after, after_cost.argmin(axis=1), before_cost.argmin(axis=1))
+    best = np.where(has_after | has_before, best, -1)
+
+    rows = np.arange(n)
+    chosen = offset[rows, np.maximum(best, 0)]
+    timestamps = np.where(best >= 0, np.maximum(chosen, 0), 0).astype(np.int64)
+    return best, timestamps
+
+
+def solve(matches: List, streams: Dict[str, List[dict]], fit_rate: bool = False):
+    """Anchor every segment and assign every match.
+
+    Returns [(match, segment, timestamp)] for the matches a segment covers.
+    """
+    segments = anchor_segments(streams, index_matches(matches), fit_rate)
+    best, timestamps = assign_segments(matches, segments)
+    return [(matches[i], segments[best[i]], int(timestamps[i])) for i in np.flatnonzero(best >= 0)]
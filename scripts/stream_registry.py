@@ -0,0 +1,252 @@
+"""
+Stream Registry
+
+Video stream configuration lives in the table instead of in code, one item per
+event:
+
+    PK: STREAMS   SK: EVENT#{sku}
+    segments:  [{video_id, div_id, anchors: [{match_name, timestamp}]}]
+    exclude:   [{prefix, from, to, div_id?, reason}]   e.g. Q84..Q109 lost in a crash
+    config_hash:     hash of segments + exclude
+    generated_hash:  config_hash at the last successful regenerate
+
+`regenerate` only recomputes events whose config_hash differs from their
+generated_hash (or that are named with --sku/--force). For each one it
+fits the segments (stream_anchors), compares the resulting URLs with the
+video_url already on the event's match items and pushes only the changed ones
+(event item + each team's item) through a WritePlan. Matches come from the
+local match store, so they must have been collected first.
+
+    python3 scripts/stream_registry.py seed            # from generate_multi_event_links.STREAMS/EXCLUDE
+    python3 scripts/stream_registry.py put RE-V5RC-25-0147 streams_0147.json
+    python3 scripts/stream_registry.py list
+    python3 scripts/stream_registry.py regenerate --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
+import stream_anchors
+from generate_multi_event_links import EXCLUDE, STREAMS, is_excluded
+from match_names import normalize
+from match_store import DEFAULT_STORE, MatchStore
+from table_snapshot import dumps_item, loads_item
+from write_plan import WritePlan
+
+TABLE_NAME = 'vex5hub-data'
+REGISTRY_PK = 'STREAMS'
+
+
+def get_table(profile='rdp', table_name=TABLE_NAME):
+    session = boto3.Session(profile_name=profile, region_name='ca-central-1')
+    return session.resource('dynamodb').Table(table_name)
+
+
+def _plain(obj):
+    """Decimals -> int/float, via the snapshot serializer."""
+    return json.loads(dumps_item(obj))
+
+
+def config_hash(segments, exclude) -> str:
+    canonical = json.dumps({'segments': _plain(segments), 'exclude': _plain(exclude or [])},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def load_registry(table) -> dict:
+    """{sku: entry} for every registered event, with plain (non-Decimal) numbers."""
+    entries = {}
+    kwargs = {'KeyConditionExpression': Key('PK').eq(REGISTRY_PK) & Key('SK').begins_with('EVENT#')}
+    while True:
+        resp = table.query(**kwargs)
+        for item in resp.get('Items', []):
+            entry = _plain(item)
+            entries[entry['sku']] = entry
+        if 'LastEvaluatedKey' not in resp:
+            return entries
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+
+def put_entry(table, sku: str, segments: list, exclude: list = None, existing: dict = None) -> bool:
+    """Write an event's stream config. Returns False (and writes nothing) if it is unchanged."""
+    new_hash = config_hash(segments, exclude)
+    if existing and existing.get('config_hash') == new_hash:
+        return False
+    item = {
+        'PK': REGISTRY_PK,
+        'SK': f'EVENT#{sku}',
+        'sku': sku,
+        'segments': segments,
+        'exclude': exclude or [],
+        'config_hash': new_hash,
+        'updated_at': datetime.now(timezone.utc).isoformat()
+    }
+    if existing and existing.get('generated_hash'):
+        item['generated_hash'] = existing['generated_hash']
+    # Numbers must be Decimal for the resource API
+    table.put_item(Item=loads_item(dumps_item(item)))
+    return True
+
+
+def build_links(matches: list, entries: dict, fit_rate: bool = False) -> tuple:
+    """Solve every registered segment and return ({match_id: (match, url)}, [excluded matches])."""
+    streams = {sku: entry['segments'] for sku, entry in entries.items()}
+    links = {}
+    excluded = []
+    for match, segment, timestamp in stream_anchors.solve(matches, streams, fit_rate=fit_rate):
+        if is_excluded(normalize(match.name), match.division_id, entries[match.sku].get('exclude', [])):
+            excluded.append(match)
+            continue
+        links[match.id] = (match, f"https://www.youtube.com/watch?v={segment['video_id']}&t={timestamp}s")
+    return links, excluded
+
+
+def _current_urls(table, sku: str) -> dict:
+    """{event match SK: video_url} for one event."""
+    urls = {}
+    kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'EVENT#{sku}') & Key('SK').begins_with('MATCH#'),
+        'ProjectionExpression': 'SK, video_url',
+    }
+    while True:
+        resp = table.query(**kwargs)
+        for item in resp.get('Items', []):
+            urls[item['SK']] = item.get('video_url')
+        if 'LastEvaluatedKey' not in resp:
+            return urls
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+
+def _match_keys(match):
+    """Event item key followed by each team's item key."""
+    args = (match.division_id, match.round, match.instance, match.matchnum)
+    yield {'PK': f'EVENT#{match.sku}', 'SK': ingest.event_match_sk(*args)}
+    for team in match.red_teams + match.blue_teams:
+        if team:
+            yield {'PK': f'TEAM#{team}', 'SK': ingest.team_match_sk(match.sku, *args)}
+
+
+def plan_event(plan: WritePlan, current: dict, links: dict, excluded: list) -> int:
+    """Add video_url changes for one event to the plan. Returns the number of matches changed."""
+    changed = 0
+    for match, url in links.values():
+        event_sk = ingest.event_match_sk(match.division_id, match.round, match.instance, match.matchnum)
+        if event_sk not in current or current[event_sk] == url:
+            continue  # match not in the table yet, or already up to date
+        for key in _match_keys(match):
+            plan.update(key, "SET video_url = :v", values={':v': url},
+                        condition="attribute_exists(PK)", reason='video_url')
+        changed += 1
+    for match in excluded:
+        event_sk = ingest.event_match_sk(match.division_id, match.round, match.instance, match.matchnum)
+        if not current.get(event_sk):
+            continue
+        for key in _match_keys(match):
+            plan.update(key, "REMOVE video_url", condition="attribute_exists(PK)", reason='excluded')
+        changed += 1
+    return changed
+
+
+def regenerate(table, store_path: str = DEFAULT_STORE, skus=None, force: bool = False,
+               dry_run: bool = False, fit_rate: bool = False, workers: int = 16):
+    entries = load_registry(table)
+    if skus:
+        targets = {sku: entries[sku] for sku in skus if sku in entries}
+        missing = set(skus) - set(targets)
+        if missing:
+            print(f"Not in registry: {', '.join(sorted(missing))}")
+    elif force:
+        targets = entries
+    else:
+        targets = {sku: e for sku, e in entries.items() if e.get('generated_hash') != e.get('config_hash')}
+
+    print(f"{len(targets)} of {len(entries)} registered events need regenerating")
+    if not targets:
+        return
+
+    store = MatchStore(store_path)
+    matches = [m for sku in targets for m in store.event(sku) if m.started]
+    store.close()
+
+    links, excluded = build_links(matches, targets, fit_rate)
+    plan = WritePlan()
+    for sku in sorted(targets):
+        event_links = {mid: v for mid, v in links.items() if v[0].sku == sku}
+        event_excluded = [m for m in excluded if m.sku == sku]
+        changed = plan_event(plan, _current_urls(table, sku), event_links, event_excluded)
+        print(f"  {sku}: {len(event_links)} linked, {changed} changed")
+
+    print(f"\nPlanned writes: {len(plan)}")
+    plan.print_summary()
+    if dry_run:
+        plan.print_diff(limit=20)
+        return
+
+    results = plan.apply(table, workers=workers)
+    print(f"Applied: {dict(results)}")
+    if results.get('update_failed') or results.get('batch_failed'):
+        print("Some writes failed; leaving generated_hash unchanged so the next run retries")
+        return
+    for sku, entry in targets.items():
+        table.update_item(
+            Key={'PK': REGISTRY_PK, 'SK': f'EVENT#{sku}'},
+            UpdateExpression="SET generated_hash = :h, generated_at = :t",
+            ExpressionAttributeValues={':h': entry['config_hash'], ':t': datetime.now(timezone.utc).isoformat()}
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream registry and incremental video link regeneration")
+    parser.add_argument("--profile", default="rdp", help="AWS profile to use")
+    parser.add_argument("--table", default=TABLE_NAME, help="DynamoDB table name")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('seed', help="Register STREAMS/EXCLUDE from generate_multi_event_links.py")
+
+    put = sub.add_parser('put', help="Register one event from a JSON file {segments: [...], exclude: [...]}")
+    put.add_argument("sku")
+    put.add_argument("path")
+
+    sub.add_parser('list', help="Show registered events and whether they need regenerating")
+
+    regen = sub.add_parser('regenerate', help="Recompute and push links for changed registry entries")
+    regen.add_argument("--sku", action='append', help="Only these events (repeatable); implies --force for them")
+    regen.add_argument("--force", action="store_true", help="Regenerate every registered event")
+    regen.add_argument("--dry-run", action="store_true", help="Print the planned writes without applying")
+    regen.add_argument("--fit-rate", action="store_true", help="Also fit playback rate for 3+ anchor segments")
+    regen.add_argument("--store", default=DEFAULT_STORE, help="Local match store path")
+    regen.add_argument("--workers", type=int, default=16, help="Concurrent update workers")
+
+    args = parser.parse_args()
+    table = get_table(args.profile, args.table)
+
+    if args.command == 'seed':
+        entries = load_registry(table)
+        for sku, segments in STREAMS.items():
+            changed = put_entry(table, sku, segments, EXCLUDE.get(sku, []), entries.get(sku))
+            print(f"  {sku}: {'updated' if changed else 'unchanged'}")
+    elif args.command == 'put':
+        with open(args.path) as f:
+            config = json.load(f)
+        changed = put_entry(table, args.sku, config['segments'], config.get('exclude', []),
+                            load_registry(table).get(args.sku))
+        print(f"{args.sku}: {'updated' if changed else 'unchanged'}")
+    elif args.command == 'list':
+        for sku, entry in sorted(load_registry(table).items()):
+            state = 'up to date' if entry.get('generated_hash') == entry.get('config_hash') else 'pending'
+            print(f"  {sku:<20} {len(entry['segments'])} segment(s), {len(entry.get('exclude', []))} exclusion(s)  {state}")
+    else:
+        regenerate(table, args.store, args.sku, args.force, args.dry_run, args.fit_rate, args.workers)
+
+
+if __name__ == "__main__":
+    main()
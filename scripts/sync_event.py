@@ -1,15 +1,43 @@
 import os
+import sys
 import json
+import queue
+import threading
+import time
+import urllib.error
 import urllib.request
-from datetime import datetime, timezone
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
 
 import ssl
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
+
 RE_API_BASE = "https://www.robotevents.com/api/v2"
 
-def api_request(url, api_key):
+
+class RateLimiter:
+    """Spaces out requests across all threads to at most `per_second` calls."""
+
+    def __init__(self, per_second: float = 4.0):
+        self.interval = 1.0 / per_second
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_default_limiter = RateLimiter()
+
+
+def api_request(url, api_key, limiter=None, max_retries=3):
     req = urllib.request.Request(url, headers={
         'Authorization': f'Bearer {api_key}',
         'Accept': 'application/json',
@@ -18,121 +46,161 @@ def api_request(url, api_key):
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
     ctx.verify_mode = ssl.CERT_NONE
-    with urllib.request.urlopen(req, context=ctx) as resp:
-        return json.loads(resp.read().decode())
+    for attempt in range(max_retries):
+        (limiter or _default_limiter).wait()
+        try:
+            with urllib.request.urlopen(req, context=ctx) as resp:
+                return json.loads(resp.read().decode())
+        except urllib.error.HTTPError as e:
+            if e.code != 429 or attempt == max_retries - 1:
+                raise
+            wait = 5 * (2 ** attempt)  # 5s, 10s, 20s
+            print(f"  Rate limited (429), waiting {wait}s...")
+            time.sleep(wait)
 
-def sync_event_matches(sku, api_key, table_name, profile):
-    session = boto3.Session(profile_name=profile, region_name='ca-central-1')
-    table = session.resource('dynamodb').Table(table_name)
-    
-    # Get event details to get internal ID
-    event_data = api_request(f"{RE_API_BASE}/events?sku[]={sku}", api_key)
+
+def iter_division_matches(evt_id, div_id, api_key, limiter=None):
+    """Yield every match in a division, following pagination."""
+    page = 1
+    last_page = 1
+    while page <= last_page:
+        url = f"{RE_API_BASE}/events/{evt_id}/divisions/{div_id}/matches?page={page}&per_page=250"
+        data = api_request(url, api_key, limiter)
+        yield from data.get('data', [])
+        last_page = data.get('meta', {}).get('last_page', 1)
+        page += 1
+
+
+def build_match_items(m, sku, evt_name, event, div_id):
+    """Event source-of-truth item plus one reverse-lookup item per team for a match."""
+    return ingest.match_items(m, ingest.event_meta(event), sku=sku, evt_name=evt_name, div_id=div_id)
+
+
+def fetch_event(sku, api_key, limiter=None):
+    """Resolve a SKU to its event payload and division list."""
+    event_data = api_request(f"{RE_API_BASE}/events?sku[]={sku}", api_key, limiter)
     if not event_data['data']:
         print(f"Event {sku} not found")
-        return
-    
+        return None, []
+
     event = event_data['data'][0]
-    evt_id = event['id']
-    evt_name = event['name']
-    
-    print(f"Syncing matches for {evt_name} ({sku})...")
-    
+
     # Divisions are usually in the event payload
     divs = event.get('divisions', [])
     if not divs:
         # Fallback to fetching if not in payload
-        divs_url = f"{RE_API_BASE}/events/{evt_id}/divisions"
+        divs_url = f"{RE_API_BASE}/events/{event['id']}/divisions"
         try:
-            divs_data = api_request(divs_url, api_key)
+            divs_data = api_request(divs_url, api_key, limiter)
             divs = divs_data.get('data', [])
-        except:
+        except urllib.error.URLError:
             print("Could not fetch divisions, defaulting to division 1")
             divs = [{'id': 1, 'name': 'Division 1'}]
-    
-    for div in divs:
-        div_id = div['id']
-        div_name = div['name']
-        print(f"  Division: {div_name} ({div_id})")
-        
-        matches_url = f"{RE_API_BASE}/events/{evt_id}/divisions/{div_id}/matches?per_page=250"
-        matches_data = api_request(matches_url, api_key)
-        
-        for m in matches_data['data']:
-            match_num = m.get('matchnum', 0)
-            round_num = m.get('round', 0)
-            instance = m.get('instance', 0)
-            
-            round_names = {1: 'Practice', 2: 'Qualification', 3: 'Quarterfinal', 4: 'Semifinal', 5: 'Final', 6: 'Round of 16'}
-            round_name = round_names.get(round_num, f'Round {round_num}')
-
-            alliances = m.get('alliances', [])
-            red = next((a for a in alliances if a.get('color') == 'red'), {})
-            blue = next((a for a in alliances if a.get('color') == 'blue'), {})
-            red_teams = [t.get('team', {}).get('name', '') for t in red.get('teams', [])]
-            blue_teams = [t.get('team', {}).get('name', '') for t in blue.get('teams', [])]
-            red_score = red.get('score')
-            blue_score = blue.get('score')
-
-            match_sk = f"MATCH#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
-            item = {
-                'PK': f'EVENT#{sku}',
-                'SK': match_sk,
-                'sku': sku,
-                'event_name': evt_name,
-                'division_id': Decimal(str(div_id)),
-                'match_num': Decimal(str(match_num)),
-                'round': round_name,
-                'instance': Decimal(str(instance)),
-                'field': m.get('field', ''),
-                'scheduled': m.get('scheduled', ''),
-                'started': m.get('started', ''),
-                'red_teams': red_teams,
-                'blue_teams': blue_teams,
-                'red_score': Decimal(str(red_score)) if red_score is not None else None,
-                'blue_score': Decimal(str(blue_score)) if blue_score is not None else None,
-                'updated_at': datetime.now(timezone.utc).isoformat()
-            }
-            item = {k: v for k, v in item.items() if v is not None}
-            table.put_item(Item=item)
-            
-            # Team records
-            for tnum in red_teams + blue_teams:
-                alliance_color = 'red' if tnum in red_teams else 'blue'
-                my_score = red_score if alliance_color == 'red' else blue_score
-                opp_score = blue_score if alliance_color == 'red' else red_score
-                partner_teams = red_teams if alliance_color == 'red' else blue_teams
-                opponent_teams = blue_teams if alliance_color == 'red' else red_teams
-                won = (my_score is not None and opp_score is not None and int(my_score) > int(opp_score))
-
-                team_match_sk = f"MATCH#{sku}#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
-                
-                loc = event.get('location', {})
-                loc_str = ", ".join(filter(None, [loc.get('city'), loc.get('region'), loc.get('country')]))
-                
-                team_item = {
-                    'PK': f'TEAM#{tnum}',
-                    'SK': team_match_sk,
-                    'sku': sku,
-                    'event_name': evt_name,
-                    'alliance': alliance_color,
-                    'my_score': Decimal(str(my_score)) if my_score is not None else None,
-                    'opp_score': Decimal(str(opp_score)) if opp_score is not None else None,
-                    'partner_teams': [p for p in partner_teams if p != tnum],
-                    'opponent_teams': opponent_teams,
-                    'won': won,
-                    'round': round_name,
-                    'match_num': Decimal(str(match_num)),
-                    'event_start': event.get('start'),
-                    'event_end': event.get('end'),
-                    'event_location': loc_str,
-                    'updated_at': datetime.now(timezone.utc).isoformat()
-                }
-                team_item = {k: v for k, v in team_item.items() if v is not None}
-                table.put_item(Item=team_item)
+    return event, divs
+
+
+def _carry_video_urls(table, batch_items: list):
+    """Copy video_url from the stored items onto their replacements (one BatchGetItem per 100)."""
+    keys = list({(i['PK'], i['SK']): {'PK': i['PK'], 'SK': i['SK']} for i in batch_items}.values())
+    stored = {}
+    for n in range(0, len(keys), 100):
+        request = {table.name: {'Keys': keys[n:n + 100], 'ProjectionExpression': 'PK, SK, video_url'}}
+        while request:
+            resp = table.meta.client.batch_get_item(RequestItems=request)
+            for found in resp['Responses'].get(table.name, []):
+                if 'video_url' in found:
+                    stored[(found['PK'], found['SK'])] = found['video_url']
+            request = resp.get('UnprocessedKeys')
+    for item in batch_items:
+        url = stored.get((item['PK'], item['SK']))
+        if url and 'video_url' not in item:
+            item['video_url'] = url
+
+
+def _write_items(table, items: queue.Queue, counts: dict, chunk: int = 100):
+    """Drain the item queue into one batch writer (BatchWriteItem, 25 per request).
+
+    Items replace the stored ones whole, so video_url is read back first in
+    chunks and carried over, as the content-updater does per item.
+    """
+    finished = False
+    try:
+        with table.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+            pending = []
+            while not finished:
+                item = items.get()
+                if item is None:
+                    finished = True
+                else:
+                    pending.append(item)
+                if pending and (finished or len(pending) >= chunk):
+                    _carry_video_urls(table, pending)
+                    for write in pending:
+                        batch.put_item(Item=write)
+                    counts['items'] += len(pending)
+                    pending = []
+    except Exception as e:
+        print(f"  [ERROR] batch write failed: {e}")
+        # Keep draining so producers never block on a full queue
+        while not finished and items.get() is not None:
+            pass
+
+
+def sync_events(skus, api_key, table_name, profile, workers=6, requests_per_second=4.0):
+    """Sync every division of several events concurrently, streaming items into a batch writer.
+
+    All API calls share one rate limiter, so adding workers overlaps network latency
+    without exceeding the RobotEvents request budget.
+    """
+    session = boto3.Session(profile_name=profile, region_name='ca-central-1')
+    table = session.resource('dynamodb').Table(table_name)
+    limiter = RateLimiter(requests_per_second)
+    started = time.time()
+
+    items: queue.Queue = queue.Queue(maxsize=5000)
+    counts = {'items': 0}
+    writer = threading.Thread(target=_write_items, args=(table, items, counts))
+    writer.start()
+
+    def sync_division(event, div):
+        sku = event['sku']
+        n = 0
+        for m in iter_division_matches(event['id'], div['id'], api_key, limiter):
+            for item in build_match_items(m, sku, event['name'], event, div['id']):
+                items.put(item)
+            n += 1
+        print(f"  {sku} {div.get('name', div['id'])}: {n} matches")
+        return n
+
+    total_matches = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            events = [f.result() for f in [pool.submit(fetch_event, sku, api_key, limiter) for sku in skus]]
+            jobs = []
+            for event, divs in events:
+                if not event:
+                    continue
+                print(f"Syncing matches for {event['name']} ({event['sku']}), {len(divs)} division(s)...")
+                jobs += [pool.submit(sync_division, event, div) for div in divs]
+            for job in as_completed(jobs):
+                try:
+                    total_matches += job.result()
+                except Exception as e:
+                    print(f"  [ERROR] division sync failed: {e}")
+    finally:
+        items.put(None)
+        writer.join()
+
+    print(f"Synced {total_matches} matches ({counts['items']} items) "
+          f"for {len(skus)} event(s) in {time.time() - started:.1f}s")
+    return total_matches
+
+
+def sync_event_matches(sku, api_key, table_name, profile):
+    return sync_events([sku], api_key, table_name, profile)
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) < 3:
-        print("Usage: python3 sync_event.py <sku> <api_key>")
+        print("Usage: python3 sync_event.py <sku>[,<sku>...] <api_key>")
         sys.exit(1)
-    sync_event_matches(sys.argv[1], sys.argv[2], "vex5hub-data", "rdp")
+    sync_events(sys.argv[1].split(','), sys.argv[2], "vex5hub-data", "rdp")
@@ -1,9 +1,18 @@
 
+import argparse
+import os
+import sys
 import boto3
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
 import logging
 
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest  # noqa: E402
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,15 +22,58 @@ dynamodb = boto3.resource('dynamodb')
 TABLE_NAME = 'vex5hub-data'
 table = dynamodb.Table(TABLE_NAME)
 
-def sync_event_match_counts():
+def sync_from_snapshot(snapshot_path, season_id):
+    """Recount matches for every event from a local snapshot and apply as one batched plan."""
+    snap = Snapshot(snapshot_path)
+    logger.info(f"Counting matches from snapshot {snapshot_path} (exported {snap.exported_at()} UTC)")
+    counts = snap.count_by_pk('EVENT#', 'MATCH#')
+
+    plan = WritePlan()
+    events = [e for pk in ingest.shard_partitions(f'SEASON#{season_id}') for e in snap.query(pk, 'EVENT#')]
+    for event in events:
+        sku = event.get('sku')
+        start_date = event.get('start')
+        match_count = counts.get(f'EVENT#{sku}', 0)
+        if not sku or not start_date or match_count == 0:
+            continue
+        if event.get('match_count') == match_count:
+            continue  # already correct, no write needed
+
+        plan.update(
+            {'PK': ingest.season_event_pk(season_id, sku), 'SK': f'EVENT#{start_date}#{sku}'},
+            "SET match_count = :val",
+            values={':val': Decimal(str(match_count))},
+            reason='season_event_count'
+        )
+        plan.update(
+            {'PK': f'EVENT#{sku}', 'SK': 'METADATA'},
+            "SET match_count = :val",
+            values={':val': Decimal(str(match_count))},
+            condition="attribute_exists(PK)",
+            reason='metadata_count'
+        )
+
+    plan.print_summary()
+    logger.info(f"Applied: {dict(plan.apply(table))}")
+
+def season_events(season_id):
+    """Every event item of the season, from all of its shards (every page)."""
+    events = []
+    for pk in ingest.shard_partitions(f'SEASON#{season_id}'):
+        kwargs = {'KeyConditionExpression': Key('PK').eq(pk) & Key('SK').begins_with('EVENT#')}
+        while True:
+            resp = table.query(**kwargs)
+            events += resp.get('Items', [])
+            if 'LastEvaluatedKey' not in resp:
+                break
+            kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+    return events
+
+def sync_event_match_counts(season_id):
     logger.info("Starting match count sync...")
     
-    # 1. Fetch all events for season 197 to get their start dates and SKUs
-    season_id = '197'
-    events_resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'SEASON#{season_id}') & Key('SK').begins_with('EVENT#')
-    )
-    events = events_resp.get('Items', [])
+    # 1. Fetch all of the season's events to get their start dates and SKUs
+    events = season_events(season_id)
     logger.info(f"Fount {len(events)} events for season {season_id}")
 
     for event in events:
@@ -44,7 +96,7 @@ def sync_event_match_counts():
             
             # 3. Update the seasonal event item
             table.update_item(
-                Key={'PK': f'SEASON#{season_id}', 'SK': f'EVENT#{start_date}#{sku}'},
+                Key={'PK': ingest.season_event_pk(season_id, sku), 'SK': f'EVENT#{start_date}#{sku}'},
                 UpdateExpression="SET match_count = :val",
                 ExpressionAttributeValues={':val': Decimal(str(match_count))}
             )
@@ -64,4 +116,11 @@ def sync_event_match_counts():
     logger.info("Match count sync complete.")
 
 if __name__ == "__main__":
-    sync_event_match_counts()
+    parser = argparse.ArgumentParser(description="Recount match_count on event items")
+    parser.add_argument("--season", type=int, required=True, help="Season ID, e.g. 197")
+    parser.add_argument("--snapshot", help="Count matches from a local table snapshot instead of querying each event")
+    args = parser.parse_args()
+    if args.snapshot:
+        sync_from_snapshot(args.snapshot, args.season)
+    else:
+        sync_event_match_counts(args.season)
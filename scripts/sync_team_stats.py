@@ -0,0 +1,98 @@
+"""
+Recompute team season stats from the event match items.
+
+The stream consumer keeps TEAM#{num} / SEASON#{id} stats (wins, losses, ties,
+total_matches, wp) in step by adding the change of each match it sees, so a
+team whose matches were written before its season item existed, or a batch
+whose writes failed, leaves them short. This recounts every played
+EVENT#{sku} / MATCH#... item (season from the SKU) and sets the stats that
+differ. Rank, ap and sp are left alone.
+
+Run it as a backfill after season items are created for matches already in
+the table, and periodically as the repair path. Stream deltas that land
+between the read and the write are overwritten, so prefer a quiet time (no
+live events) or a fresh snapshot.
+
+    python3 scripts/sync_team_stats.py --dry-run
+    python3 scripts/sync_team_stats.py --season 197 --snapshot vex5hub_snapshot.db
+"""
+
+import argparse
+import os
+import sys
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from ddb_scan import parallel_scan
+from table_snapshot import Snapshot
+from write_plan import WritePlan
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest  # noqa: E402
+
+MATCH_FIELDS = ['PK', 'SK', 'red_teams', 'blue_teams', 'red_score', 'blue_score', 'started']
+
+
+def load_items(table, snapshot_path: str = None):
+    """(event match items, team season items) from a snapshot or a scan of the live table."""
+    if snapshot_path:
+        snap = Snapshot(snapshot_path)
+        print(f"Reading snapshot {snapshot_path} (exported {snap.exported_at()} UTC)")
+        return list(snap.items('MATCH#', 'EVENT#')), list(snap.items('SEASON#', 'TEAM#'))
+    matches = list(parallel_scan(table, projection=MATCH_FIELDS,
+                                 filter_expression=Attr('PK').begins_with('EVENT#') & Attr('SK').begins_with('MATCH#')))
+    seasons = list(parallel_scan(table, projection=['PK', 'SK', 'stats'],
+                                 filter_expression=Attr('PK').begins_with('TEAM#') & Attr('SK').begins_with('SEASON#')))
+    return matches, seasons
+
+
+def plan_stats(matches: list, season_items: list, season_id: int = None) -> WritePlan:
+    """SET the recomputed stats on every season item whose stored ones differ."""
+    totals = ingest.team_season_stats(matches)
+    plan = WritePlan()
+    for item in season_items:
+        stats = item.get('stats')
+        team, item_season = item['PK'][len('TEAM#'):], int(item['SK'][len('SEASON#'):])
+        if stats is None or (season_id is not None and item_season != season_id):
+            continue  # no stats map yet: update_top_teams seeds it
+        expected = totals.get((team, item_season), dict.fromkeys(ingest.STAT_FIELDS, 0))
+        if all(stats.get(f, 0) == n for f, n in expected.items()):
+            continue
+        plan.update(
+            {'PK': item['PK'], 'SK': item['SK']},
+            "SET " + ", ".join(f"stats.#{f} = :{f}" for f in expected),
+            values={f':{f}': Decimal(n) for f, n in expected.items()},
+            names={f'#{f}': f for f in expected},
+            condition="attribute_exists(stats)",
+            reason='team_stats'
+        )
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute TEAM#/SEASON# W-L-T and WP from the event match items")
+    parser.add_argument("--season", type=int, help="Only this season ID (default: every season item)")
+    parser.add_argument("--profile", default="rdp", help="AWS profile to use")
+    parser.add_argument("--table", default="vex5hub-data", help="DynamoDB table name")
+    parser.add_argument("--snapshot", help="Read the items from a local table snapshot instead of scanning")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without writing")
+    args = parser.parse_args()
+
+    session = boto3.Session(profile_name=args.profile, region_name='ca-central-1')
+    table = session.resource('dynamodb').Table(args.table)
+
+    matches, season_items = load_items(table, args.snapshot)
+    print(f"{len(matches)} event match items, {len(season_items)} team season items")
+    plan = plan_stats(matches, season_items, args.season)
+    plan.print_summary()
+    if args.dry_run:
+        plan.print_diff(limit=20)
+        return
+    if plan:
+        print(f"Applied: {dict(plan.apply(table))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Local DynamoDB Table Snapshot
+
+Exports vex5hub-data once (parallel segmented scan) into an indexed SQLite file
+so maintenance scripts can run their filters locally instead of re-scanning the
+live table each time.
+
+    python3 scripts/table_snapshot.py export --out vex5hub_snapshot.db --segments 8
+
+Scripts then read from it with --snapshot vex5hub_snapshot.db. Items come back
+with the same shape boto3 returns (numbers as Decimal), so code paths are shared.
+
+Indexes: (PK, SK) primary key, SK (prefix queries), sku, worlds_qualified, GSI1.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from decimal import Decimal
+
+import boto3
+
+from ddb_scan import parallel_scan
+
+TABLE_NAME = 'vex5hub-data'
+DEFAULT_SNAPSHOT = 'vex5hub_snapshot.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    pk TEXT NOT NULL,
+    sk TEXT NOT NULL,
+    sku TEXT,
+    worlds_qualified INTEGER,
+    gsi1pk TEXT,
+    gsi1sk TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (pk, sk)
+);
+CREATE INDEX IF NOT EXISTS idx_items_sk ON items (sk);
+CREATE INDEX IF NOT EXISTS idx_items_sku ON items (sku);
+CREATE INDEX IF NOT EXISTS idx_items_worlds ON items (worlds_qualified) WHERE worlds_qualified IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_items_gsi1 ON items (gsi1pk, gsi1sk) WHERE gsi1pk IS NOT NULL;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _encode_default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    if isinstance(obj, set):
+        return sorted(obj)
+    raise TypeError(f"Unserializable type: {type(obj)}")
+
+
+def dumps_item(item: dict) -> str:
+    """Serialize a boto3 item to compact JSON."""
+    return json.dumps(item, default=_encode_default, separators=(',', ':'))
+
+
+def loads_item(data: str) -> dict:
+    """Inverse of dumps_item: numbers come back as Decimal, like boto3."""
+    return json.loads(data, parse_float=Decimal, parse_int=Decimal)
+
+
+def _prefix_bounds(prefix: str):
+    # Range scan instead of LIKE so SQLite can use the SK index
+    return prefix, prefix + '\uffff'
+
+
+class Snapshot:
+    """Read-only query helper over a snapshot file."""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Snapshot {path} not found. Run: python3 scripts/table_snapshot.py export")
+        self.path = path
+        self.conn = sqlite3.connect(path)
+
+    def _rows(self, sql: str, params=()):
+        for (data,) in self.conn.execute(sql, params):
+            yield loads_item(data)
+
+    def exported_at(self) -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'exported_at'").fetchone()
+        return row[0] if row else ''
+
+    def get(self, pk: str, sk: str):
+        row = self.conn.execute("SELECT data FROM items WHERE pk = ? AND sk = ?", (pk, sk)).fetchone()
+        return loads_item(row[0]) if row else None
+
+    def query(self, pk: str, sk_prefix: str = ''):
+        """Equivalent of Key('PK').eq(pk) & Key('SK').begins_with(sk_prefix)."""
+        lo, hi = _prefix_bounds(sk_prefix)
+        return self._rows("SELECT data FROM items WHERE pk = ? AND sk >= ? AND sk < ? ORDER BY sk", (pk, lo, hi))
+
+    def items(self, sk_prefix: str = '', pk_prefix: str = ''):
+        """All items whose SK (and optionally PK) start with the given prefixes."""
+        lo, hi = _prefix_bounds(sk_prefix)
+        sql = "SELECT data FROM items WHERE sk >= ? AND sk < ?"
+        params = [lo, hi]
+        if pk_prefix:
+            plo, phi = _prefix_bounds(pk_prefix)
+            sql += " AND pk >= ? AND pk < ?"
+            params += [plo, phi]
+        return self._rows(sql, params)
+
+    def sk_contains(self, fragment: str):
+        return self._rows("SELECT data FROM items WHERE instr(sk, ?) > 0", (fragment,))
+
+    def by_sku(self, sku: str, sk_prefix: str = ''):
+        lo, hi = _prefix_bounds(sk_prefix)
+        return self._rows("SELECT data FROM items WHERE sku = ? AND sk >= ? AND sk < ?", (sku, lo, hi))
+
+    def worlds_qualified(self, value: bool = True):
+        return self._rows("SELECT data FROM items WHERE worlds_qualified = ?", (int(value),))
+
+    def count_by_pk(self, pk_prefix: str, sk_prefix: str) -> dict:
+        """{PK: item count} for items matching both prefixes (e.g. matches per event)."""
+        plo, phi = _prefix_bounds(pk_prefix)
+        lo, hi = _prefix_bounds(sk_prefix)
+        return dict(self.conn.execute(
+            "SELECT pk, COUNT(*) FROM items WHERE pk >= ? AND pk < ? AND sk >= ? AND sk < ? GROUP BY pk",
+            (plo, phi, lo, hi)
+        ))
+
+    def close(self):
+        self.conn.close()
+
+
+def _row(item: dict):
+    wq = item.get('worlds_qualified')
+    return (
+        item['PK'],
+        item['SK'],
+        item.get('sku'),
+        int(wq) if isinstance(wq, bool) else None,
+        item.get('GSI1PK'),
+        item.get('GSI1SK'),
+        dumps_item(item),
+    )
+
+
+def export_snapshot(table, path: str = DEFAULT_SNAPSHOT, segments: int = 8) -> int:
+    """Parallel-scan the whole table into a fresh SQLite snapshot. Returns item count."""
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+
+    started = time.time()
+    count = 0
+    batch = []
+    for item in parallel_scan(table, segments=segments):
+        batch.append(_row(item))
+        if len(batch) >= 1000:
+            conn.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            count += len(batch)
+            batch = []
+            if count % 5000 == 0:
+                print(f"  {count} items...")
+    conn.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    count += len(batch)
+
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('exported_at', datetime('now'))")
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('table', ?)", (table.name,))
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, path)
+
+    print(f"Exported {count} items to {path} in {time.time() - started:.1f}s")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export vex5hub-data to a local SQLite snapshot")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help="Parallel-scan the live table into a snapshot file")
+    export.add_argument("--out", default=DEFAULT_SNAPSHOT, help="Snapshot file path")
+    export.add_argument("--segments", type=int, default=8, help="Parallel scan segments/workers")
+    export.add_argument("--profile", default="rdp", help="AWS profile to use")
+    export.add_argument("--region", default="ca-central-1", help="AWS region")
+    export.add_argument("--table", default=TABLE_NAME, help="DynamoDB table name")
+
+    info = sub.add_parser('info', help="Show snapshot age and item counts")
+    info.add_argument("path", nargs='?', default=DEFAULT_SNAPSHOT)
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        session = boto3.Session(profile_name=args.profile, region_name=args.region)
+        table = session.resource('dynamodb').Table(args.table)
+        export_snapshot(table, args.out, args.segments)
+    else:
+        snap = Snapshot(args.path)
+        print(f"Snapshot: {args.path} (exported {snap.exported_at()} UTC)")
+        for kind, count in snap.conn.execute(
+            "SELECT substr(pk, 1, instr(pk, '#')) || ' ' || "
+            "CASE WHEN instr(sk, '#') > 0 THEN substr(sk, 1, instr(sk, '#')) ELSE sk END AS kind, COUNT(*) "
+            "FROM items GROUP BY kind ORDER BY kind"
+        ):
+            print(f"  {kind:<24} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,14 @@
 import csv
+import os
 import sys
 import argparse
 import boto3
 from boto3.dynamodb.conditions import Key
 
-def parse_match_name(name: str):
-    """
-    Parses a string like 'Q12' or 'SF1-2' into (round_name, instance, match_num)
-    Returns: (round_name: str, instance: int, match_num: int)
-    """
-    name = name.upper().strip().replace(' ', '')
-    
-    if name.startswith('Q') and not name.startswith('QF'):
-        return ('Qualification', 1, int(name[1:]))
-    elif name.startswith('P'):
-        return ('Practice', 1, int(name[1:]))
-    elif name.startswith('QF'):
-        return _parse_elim('Quarterfinal', name[2:])
-    elif name.startswith('SF'):
-        return _parse_elim('Semifinal', name[2:])
-    elif name.startswith('F'):
-        return _parse_elim('Final', name[1:])
-    elif name.startswith('R16'):
-        return _parse_elim('Round of 16', name[3:].lstrip('-'))
-    elif name.startswith('R32'):
-        return _parse_elim('Round of 32', name[3:].lstrip('-'))
-    elif name.startswith('R64'):
-        return _parse_elim('Round of 64', name[3:].lstrip('-'))
-    
-    raise ValueError(f"Unknown match notation: {name}")
-
-def _parse_elim(round_name: str, s: str):
-    if '-' in s:
-        parts = s.split('-')
-        return (round_name, int(parts[0]), int(parts[1]))
-    else:
-        # e.g. R16-4 or SF2 -> instance N, match 1
-        # BUT F1, F2 -> instance 1, match N
-        if round_name == 'Final':
-            return (round_name, 1, int(s))
-        else:
-            return (round_name, int(s), 1)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+import ingest
+from match_names import parse_name
+from write_plan import WritePlan
 
 def main():
     parser = argparse.ArgumentParser(description="Upload YouTube timestamp URLs to match items in DynamoDB")
@@ -48,6 +16,7 @@ def main():
     parser.add_argument("--profile", default="rdp", help="AWS profile to use")
     parser.add_argument("--region", default="ca-central-1", help="AWS region")
     parser.add_argument("--table", default="vex5hub-data", help="DynamoDB table name")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent update workers")
     
     args = parser.parse_args()
     
@@ -77,12 +46,13 @@ def main():
             div_id = int(row[4].strip()) if len(row) > 4 and row[4].strip() else None
             
             try:
-                round_name, instance, match_num = parse_match_name(match_name)
+                round_num, instance, match_num = parse_name(match_name)
                 ts = int(ts)
                 updates.append({
                     'sku': sku,
                     'match_name': match_name,
-                    'round': round_name,
+                    'round': ingest.round_name(round_num),
+                    'round_num': round_num,
                     'instance': instance,
                     'match_num': match_num,
                     'yt_id': yt_id,
@@ -101,34 +71,20 @@ def main():
         skuGroups = sku_groups.setdefault(u['sku'], [])
         skuGroups.append(u)
         
+    # Only the event-owned items are written: the table stream consumer
+    # (lambda/content-updater/stream_consumer.py) copies video_url to the team items
+    plan = WritePlan()
     for sku, match_updates in sku_groups.items():
         print(f"\nProcessing SKU: {sku} ({len(match_updates)} matches)")
         
-        # Query all matches for this event (Event source-of-truth items)
-        resp = table.query(
-            KeyConditionExpression=Key('PK').eq(f"EVENT#{sku}") & Key('SK').begins_with("MATCH#")
-        )
-        event_matches = resp.get('Items', [])
+        by_div_key, by_key = index_event_matches(load_event_matches(table, sku))
         
         for u in match_updates:
-            # Find the corresponding event match item
-            target_match = None
-            for m in event_matches:
-                # Basic match criteria
-                is_match = (
-                    m.get('round') == u['round'] and 
-                    int(m.get('instance', 1)) == u['instance'] and 
-                    int(m.get('match_num', 0)) == u['match_num']
-                )
-                
-                # Refine with division_id if provided
-                if is_match and u['division_id'] is not None:
-                    if int(m.get('division_id', 0)) != u['division_id']:
-                        is_match = False
-                
-                if is_match:
-                    target_match = m
-                    break
+            # Find the corresponding event match item, refined with division_id if provided
+            if u['division_id'] is not None:
+                target_match = by_div_key.get((u['division_id'], u['round'], u['instance'], u['match_num']))
+            else:
+                target_match = by_key.get((u['round'], u['instance'], u['match_num']))
             
             if not target_match:
                 div_str = f" div={u['division_id']}" if u['division_id'] is not None else ""
@@ -137,41 +93,41 @@ def main():
             
             video_url = f"https://youtu.be/{u['yt_id']}?t={u['ts']}s"
             
-            # 1. Update the Event-owned item
-            table.update_item(
-                Key={'PK': target_match['PK'], 'SK': target_match['SK']},
-                UpdateExpression="SET video_url = :v",
-                ExpressionAttributeValues={':v': video_url}
+            plan.update(
+                {'PK': target_match['PK'], 'SK': target_match['SK']},
+                "SET video_url = :v",
+                values={':v': video_url},
+                condition="attribute_exists(PK)",
+                reason='event_match'
             )
-            print(f"  [OK] Updated Event match {u['match_name']} PK={target_match['PK']} -> {video_url}")
-            
-            # 2. Update the Team-owned reverse-lookup items
-            # We need to find the specific team items. 
-            # We know the Red API teams and Blue API teams from the event match item.
-            teams = target_match.get('red_teams', []) + target_match.get('blue_teams', [])
-            
-            # Construct the SK for the team item
-            # The new format is: MATCH#{sku}#{div_id}#{round_num}#{instance:02d}#{match_num:04d}
-            # Instead of rebuilding it perfectly, it's safer to rebuild it precisely as the content-updater does
-            round_order = {'Practice': 1, 'Qualification': 2, 'Quarterfinal': 3, 'Semifinal': 4, 'Final': 5, 'Round of 16': 6}
-            round_num = round_order.get(u['round'], 0)
-            instance = int(target_match.get('instance', 1))
-            match_num = int(target_match.get('match_num', 0))
-            div_id = int(target_match.get('division_id', 1))
-            
-            team_sk = f"MATCH#{sku}#{div_id}#{round_num}#{instance:02d}#{match_num:04d}"
-            
-            for t in teams:
-                try:
-                    table.update_item(
-                        Key={'PK': f"TEAM#{t}", 'SK': team_sk},
-                        UpdateExpression="SET video_url = :v",
-                        ExpressionAttributeValues={':v': video_url},
-                        ConditionExpression="attribute_exists(PK)" # Only update if it exists
-                    )
-                except Exception as e:
-                    # Depending on top-team limits, the team item might not exist
-                    pass
+
+    print(f"\nApplying {len(plan)} video_url updates ({args.workers} workers)...")
+    results = plan.apply(table, workers=args.workers)
+    print(f"Done: {dict(results)}")
+
+def load_event_matches(table, sku: str) -> list:
+    """All event source-of-truth match items for a SKU (every page)."""
+    items = []
+    query_kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f"EVENT#{sku}") & Key('SK').begins_with("MATCH#")
+    }
+    while True:
+        resp = table.query(**query_kwargs)
+        items.extend(resp.get('Items', []))
+        if 'LastEvaluatedKey' not in resp:
+            return items
+        query_kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def index_event_matches(event_matches: list):
+    """Index matches by (division_id, round, instance, match_num), plus a division-less
+    index that keeps the first match per key (SK order), for CSV rows without a division."""
+    by_div_key = {}
+    by_key = {}
+    for m in event_matches:
+        key = (m.get('round'), int(m.get('instance', 1)), int(m.get('match_num', 0)))
+        by_div_key.setdefault((int(m.get('division_id', 0)),) + key, m)
+        by_key.setdefault(key, m)
+    return by_div_key, by_key
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,214 @@
+"""
+Video Link Validation
+
+Checks generated links against the match schedule before they are uploaded,
+over every linked event in one vectorized pass:
+
+  non_monotonic   (error)    a later match has an earlier video timestamp in the same video
+  overlap         (error)    two videos of one division cover overlapping match times
+  drift           (warning)  video time between consecutive matches disagrees with wall time
+                             by more than --tolerance (a crash or cut the anchors don't know about)
+  clamped         (warning)  timestamp 0 where the fit put the match before the video started
+  unlinked_range  (info)     consecutive scheduled matches with no link (needs --store)
+
+Inputs are multi_event_links.csv and/or match_links.json. Start times come
+from match_links.json entries themselves, or from the local match store for
+CSV rows. The report is JSON:
+
+    python3 scripts/validate_links.py --csv multi_event_links.csv --out link_report.json
+    python3 scripts/validate_links.py --json match_links.json --strict   # exit 1 on errors
+
+Requires numpy (pip install numpy).
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from match_names import normalize
+from match_store import DEFAULT_STORE, MatchStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'content-updater'))
+from ingest import load_match_records
+
+SEVERITY = {'non_monotonic': 'error', 'overlap': 'error', 'drift': 'warning',
+            'clamped': 'warning', 'unlinked_range': 'info'}
+VIDEO_URL = re.compile(r'[?&]v=([\w-]+).*?[?&]t=(\d+)')
+
+
+def load_csv_links(path: str) -> list:
+    with open(path) as f:
+        return [{
+            'sku': row['sku'],
+            'division_id': int(row['division_id']),
+            'match_name': normalize(row['match_name']),
+            'youtube_id': row['youtube_id'],
+            'timestamp': int(row['timestamp_seconds']),
+            'started_ts': None,
+        } for row in csv.DictReader(f)]
+
+
+def load_json_links(path: str) -> list:
+    rows = []
+    for rec in load_match_records(path).values():
+        m = VIDEO_URL.search(rec.video_url or '')
+        if not m:
+            continue
+        rows.append({
+            'sku': rec.sku,
+            'division_id': rec.division_id,
+            'match_name': normalize(rec.name),
+            'youtube_id': m.group(1),
+            'timestamp': int(m.group(2)),
+            'started_ts': rec.started_ts,
+        })
+    return rows
+
+
+def event_schedules(store: MatchStore, keys) -> dict:
+    """{(sku, div): [(started_ts, normalized name)]} in play order, for the linked events only."""
+    schedules = defaultdict(list)
+    for sku in {sku for sku, _ in keys}:
+        for m in store.event(sku):
+            if (sku, m.division_id) in keys and m.started and m.name:
+                schedules[(sku, m.division_id)].append((m.started_ts, normalize(m.name)))
+    return schedules
+
+
+def _issue(kind: str, **fields) -> dict:
+    return dict(type=kind, severity=SEVERITY[kind], **fields)
+
+
+def validate(rows: list, schedules: dict = None, tolerance: float = 300) -> dict:
+    """Run every check over all rows at once; returns the report dict."""
+    schedules = schedules or {}
+    names = {key: {name: ts for ts, name in sched} for key, sched in schedules.items()}
+    for row in rows:
+        if row['started_ts'] is None:
+            row['started_ts'] = names.get((row['sku'], row['division_id']), {}).get(row['match_name'])
+    timed = [r for r in rows if r['started_ts'] is not None]
+    issues = []
+    untimed = len(rows) - len(timed)
+
+    if timed:
+        groups = {}
+        video_codes = np.array([groups.setdefault((r['sku'], r['division_id'], r['youtube_id']), len(groups))
+                                for r in timed])
+        wall = np.array([r['started_ts'] for r in timed], dtype=np.float64)
+        video = np.array([r['timestamp'] for r in timed], dtype=np.float64)
+
+        order = np.lexsort((wall, video_codes))  # by video, then by start time
+        g, w, v = video_codes[order], wall[order], video[order]
+        same = g[1:] == g[:-1]
+        dv, dw = np.diff(v), np.diff(w)
+
+        for i in np.flatnonzero(same & (dv < 0)):
+            a, b = timed[order[i]], timed[order[i + 1]]
+            issues.append(_issue('non_monotonic', sku=b['sku'], division_id=b['division_id'],
+                                 youtube_id=b['youtube_id'], match_name=b['match_name'],
+                                 previous=a['match_name'], timestamp=b['timestamp'],
+                                 previous_timestamp=a['timestamp']))
+        for i in np.flatnonzero(same & (dv >= 0) & (np.abs(dv - dw) > tolerance)):
+            a, b = timed[order[i]], timed[order[i + 1]]
+            issues.append(_issue('drift', sku=b['sku'], division_id=b['division_id'],
+                                 youtube_id=b['youtube_id'], match_name=b['match_name'],
+                                 previous=a['match_name'], video_gap=int(dv[i]), schedule_gap=int(dw[i])))
+
+        # Clamped: the video's median offset puts this match before t=0
+        offset = v - w
+        medians = np.array([np.median(offset[g == code]) for code in range(len(groups))])
+        for i in np.flatnonzero((v == 0) & (w + medians[g] < 0)):
+            r = timed[order[i]]
+            issues.append(_issue('clamped', sku=r['sku'], division_id=r['division_id'], youtube_id=r['youtube_id'],
+                                 match_name=r['match_name'], seconds_before_start=int(-(w[i] + medians[g[i]]))))
+
+        # Overlap: wall-time spans of different videos in one division intersect
+        starts = np.full(len(groups), np.inf)
+        ends = np.full(len(groups), -np.inf)
+        np.minimum.at(starts, g, w)
+        np.maximum.at(ends, g, w)
+        keys = list(groups)
+        div_codes = {}
+        division = np.array([div_codes.setdefault(k[:2], len(div_codes)) for k in keys])
+        pair = (division[:, None] == division[None, :]) & np.triu(np.ones((len(keys), len(keys)), bool), 1)
+        overlapping = pair & (starts[:, None] < ends[None, :]) & (starts[None, :] < ends[:, None])
+        for a, b in zip(*np.nonzero(overlapping)):
+            issues.append(_issue('overlap', sku=keys[a][0], division_id=keys[a][1],
+                                 youtube_id=keys[a][2], other_youtube_id=keys[b][2],
+                                 overlap_seconds=int(min(ends[a], ends[b]) - max(starts[a], starts[b]))))
+
+    # Gaps: runs of scheduled matches with no link at all
+    linked = defaultdict(set)
+    for r in rows:
+        linked[(r['sku'], r['division_id'])].add(r['match_name'])
+    for key, sched in schedules.items():
+        flags = np.array([name in linked[key] for _, name in sched])
+        if not len(flags) or flags.all():
+            continue
+        edges = np.flatnonzero(np.diff(np.concatenate(([1], flags.astype(int), [1]))))
+        for lo, hi in zip(edges[::2], edges[1::2]):
+            position = 'leading' if lo == 0 else 'trailing' if hi == len(sched) else 'interior'
+            issues.append(_issue('unlinked_range', sku=key[0], division_id=key[1], first=sched[lo][1],
+                                 last=sched[hi - 1][1], count=int(hi - lo), position=position))
+
+    counts = Counter(i['type'] for i in issues)
+    return {
+        'summary': {
+            'links': len(rows),
+            'without_schedule': untimed,
+            'events': len({r['sku'] for r in rows}),
+            'errors': sum(1 for i in issues if i['severity'] == 'error'),
+            'warnings': sum(1 for i in issues if i['severity'] == 'warning'),
+            'by_type': dict(counts),
+        },
+        'issues': issues,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate video links against the match schedule")
+    parser.add_argument("--csv", help="multi_event_links.csv-style file")
+    parser.add_argument("--json", help="match_links.json-style file")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Local match store (schedule + gap detection)")
+    parser.add_argument("--tolerance", type=float, default=300, help="Allowed drift between consecutive matches (s)")
+    parser.add_argument("--out", default="link_report.json", help="Report path")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 if any errors are found")
+    args = parser.parse_args()
+
+    rows = []
+    if args.csv:
+        rows += load_csv_links(args.csv)
+    if args.json:
+        rows += load_json_links(args.json)
+    if not rows:
+        parser.error("nothing to validate; pass --csv and/or --json")
+
+    schedules = {}
+    if os.path.exists(args.store):
+        store = MatchStore(args.store)
+        schedules = event_schedules(store, {(r['sku'], r['division_id']) for r in rows})
+        store.close()
+    else:
+        print(f"No match store at {args.store}; CSV rows can't be timed and gaps aren't reported")
+
+    report = validate(rows, schedules, args.tolerance)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    summary = report['summary']
+    print(f"{summary['links']} links across {summary['events']} events: "
+          f"{summary['errors']} errors, {summary['warnings']} warnings -> {args.out}")
+    for kind, count in sorted(summary['by_type'].items()):
+        print(f"  {kind:<16} {count}")
+    if args.strict and summary['errors']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
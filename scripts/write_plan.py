@@ -0,0 +1,185 @@
+"""
+Batched Write Plans
+
+Maintenance scripts collect their intended changes into a WritePlan instead of
+issuing one synchronous call per item. A plan can be printed, saved as JSONL
+for review, and applied:
+
+  - puts/deletes go through BatchWriteItem (25 items per request)
+  - updates run concurrently on a thread pool (BatchWriteItem can't update),
+    optionally guarded by a ConditionExpression, and finish before any put/delete
+  - progress can be recorded to a file so an interrupted apply resumes
+"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from table_snapshot import dumps_item, loads_item
+
+
+class WritePlan:
+    def __init__(self, ops=None):
+        self.ops = ops or []
+
+    def put(self, item: dict, reason: str = ''):
+        self.ops.append({'op': 'put', 'item': item, 'reason': reason})
+
+    def delete(self, key: dict, reason: str = ''):
+        self.ops.append({'op': 'delete', 'key': key, 'reason': reason})
+
+    def update(self, key: dict, expression: str, values: dict = None, names: dict = None,
+               condition: str = None, reason: str = ''):
+        op = {'op': 'update', 'key': key, 'expression': expression, 'reason': reason}
+        if values:
+            op['values'] = values
+        if names:
+            op['names'] = names
+        if condition:
+            op['condition'] = condition
+        self.ops.append(op)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def summary(self) -> Counter:
+        return Counter(f"{op['op']}:{op['reason']}" if op.get('reason') else op['op'] for op in self.ops)
+
+    def print_summary(self):
+        for kind, count in sorted(self.summary().items()):
+            print(f"  {kind:<40} {count}")
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            for op in self.ops:
+                f.write(dumps_item(op) + '\n')
+        print(f"Saved {len(self.ops)} planned writes to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'WritePlan':
+        with open(path) as f:
+            return cls([loads_item(line) for line in f if line.strip()])
+
+    def print_diff(self, limit: int = None):
+        """Human-readable listing of every planned write, for review before applying."""
+        symbols = {'put': '+', 'delete': '-', 'update': '~'}
+        for op in self.ops[:limit]:
+            key = op['item'] if op['op'] == 'put' else op['key']
+            line = f"{symbols[op['op']]} {key['PK']} {key['SK']}"
+            if op['op'] == 'update':
+                values = ', '.join(f"{k}={v}" for k, v in (op.get('values') or {}).items())
+                line += f"  {op['expression']}  [{values}]"
+            if op.get('reason'):
+                line += f"  ({op['reason']})"
+            print(line)
+        if limit is not None and len(self.ops) > limit:
+            print(f"... {len(self.ops) - limit} more")
+
+    def apply(self, table, workers: int = 8, progress_path: str = None) -> Counter:
+        """Execute the plan. Returns counts of applied/skipped operations.
+
+        With progress_path, completed operation indices are appended to that file
+        and skipped on the next run, so an interrupted apply can be resumed.
+        """
+        done = _load_progress(progress_path)
+        pending = [(i, op) for i, op in enumerate(self.ops) if i not in done]
+        if done:
+            print(f"Resuming: {len(done)} of {len(self.ops)} writes already applied")
+
+        writes = [(i, op) for i, op in pending if op['op'] in ('put', 'delete')]
+        updates = [(i, op) for i, op in pending if op['op'] == 'update']
+        # BatchWriteItem takes at most 25 requests
+        chunks = [writes[n:n + 25] for n in range(0, len(writes), 25)]
+
+        # The low-level client is thread-safe; resource objects are not. The resource's
+        # client still converts Python values to and from DynamoDB types.
+        client = table.meta.client
+        tracker = _Progress(progress_path, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Updates first: a merge into the canonical item must land before its duplicate is deleted
+            for future in as_completed([pool.submit(_apply_update, client, table.name, i, op) for i, op in updates]):
+                tracker.record(*future.result())
+            for future in as_completed([pool.submit(_apply_batch, client, table.name, chunk) for chunk in chunks]):
+                tracker.record(*future.result())
+        tracker.close()
+
+        return tracker.results
+
+
+class _Progress:
+    def __init__(self, path: str, total: int):
+        self.total = total
+        self.results = Counter()
+        self.completed = 0
+        self.file = open(path, 'a') if path else None
+
+    def record(self, indices, results: Counter):
+        self.results.update(results)
+        self.completed += len(indices)
+        if self.file and indices:
+            self.file.write(''.join(f"{i}\n" for i in indices))
+            self.file.flush()
+        if self.total and (self.completed % 500 < len(indices) or self.completed == self.total):
+            print(f"  {self.completed}/{self.total} writes applied")
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+def _load_progress(path: str) -> set:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {int(line) for line in f if line.strip()}
+
+
+def _apply_batch(client, table_name: str, chunk):
+    """BatchWriteItem one chunk, retrying unprocessed items with backoff."""
+    # A batch may not touch the same key twice; the last write for a key wins
+    by_key = {}
+    for _, op in chunk:
+        key = op['item'] if op['op'] == 'put' else op['key']
+        if op['op'] == 'put':
+            by_key[(key['PK'], key['SK'])] = {'PutRequest': {'Item': op['item']}}
+        else:
+            by_key[(key['PK'], key['SK'])] = {'DeleteRequest': {'Key': op['key']}}
+    requests = list(by_key.values())
+
+    for attempt in range(8):
+        try:
+            resp = client.batch_write_item(RequestItems={table_name: requests})
+        except Exception as e:
+            print(f"  [ERROR] batch write: {e}")
+            return [], Counter({'batch_failed': len(chunk)})
+        requests = resp.get('UnprocessedItems', {}).get(table_name, [])
+        if not requests:
+            return [i for i, _ in chunk], Counter(op['op'] for _, op in chunk)
+        time.sleep(min(0.05 * (2 ** attempt), 2))
+
+    print(f"  [ERROR] batch write: {len(requests)} items still unprocessed after retries")
+    return [], Counter({'batch_failed': len(chunk)})
+
+
+def _apply_update(client, table_name: str, index: int, op: dict):
+    kwargs = {
+        'TableName': table_name,
+        'Key': op['key'],
+        'UpdateExpression': op['expression'],
+    }
+    if op.get('values'):
+        kwargs['ExpressionAttributeValues'] = op['values']
+    if op.get('names'):
+        kwargs['ExpressionAttributeNames'] = op['names']
+    if op.get('condition'):
+        kwargs['ConditionExpression'] = op['condition']
+    try:
+        client.update_item(**kwargs)
+        return [index], Counter({'update': 1})
+    except client.exceptions.ConditionalCheckFailedException:
+        # Item changed since the plan was made; counts as done so resume doesn't retry it
+        return [index], Counter({'update_skipped': 1})
+    except Exception as e:
+        print(f"  [ERROR] update {op['key']}: {e}")
+        return [], Counter({'update_failed': 1})
@@ -22,6 +22,13 @@ async function fetchLive<T>(path: string): Promise<T | null> {
     } catch { return null; }
 }
 
+interface Dashboard {
+    active_events: any[];
+    upcoming_events: any[];
+    top_teams: Record<string, Team[]>;
+    updated_at: string;
+}
+
 function mapEvent(item: any): Event {
     return {
         id: item.id,
@@ -49,23 +56,15 @@ export default function Home() {
     useEffect(() => {
         const load = async () => {
             setLoading(true);
-            const [rawTeams, rawEvents] = await Promise.all([
-                fetchLive<Team[]>(`/teams?season=${SEASON_ID}`),
-                fetchLive<any[]>(`/events?season=${SEASON_ID}`),
-            ]);
-            if (rawTeams) setTeams(rawTeams.slice(0, 4));
-            if (rawEvents) {
-                const mapped = rawEvents.map(mapEvent);
-                // Sort: active first, then future by start date, filter out past
-                const splitPoint = new Date(Date.now() - 12 * 60 * 60 * 1000);
-                const upcoming = mapped
-                    .filter(e => new Date(e.end) >= splitPoint)
-                    .sort((a, b) => {
-                        if (a.status === 'active' && b.status !== 'active') return -1;
-                        if (b.status === 'active' && a.status !== 'active') return 1;
-                        return new Date(a.start).getTime() - new Date(b.start).getTime();
-                    });
-                setEvents(upcoming.slice(0, 3));
+            // One precomputed document (content-updater) instead of the full team and event lists
+            const dashboard = await fetchLive<Dashboard>(`/dashboard?season=${SEASON_ID}`);
+            if (dashboard) {
+                const topTeams = Object.values(dashboard.top_teams || {})
+                    .flat()
+                    .sort((a, b) => (a.skills?.rank ?? Infinity) - (b.skills?.rank ?? Infinity));
+                setTeams(topTeams.slice(0, 4));
+                const current = [...(dashboard.active_events || []), ...(dashboard.upcoming_events || [])];
+                setEvents(current.map(mapEvent).slice(0, 3));
             }
             setLoading(false);
         };
@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react';
 import { useParams } from "next/navigation";
 import { getTeam, getMatches, getTeamEvents, getTeamAwards } from "@/lib/api";
+import { subscribeMatches } from "@/lib/liveFeed";
 import { Team, Match, TeamEvent, Award } from "@/types";
 import {
     Table,
@@ -99,6 +100,20 @@ export default function TeamDetailClient({ teamNumber }: TeamDetailClientProps)
         fetchAwards();
     }, [number]);
 
+    // Live score changes for this team, merged into the list by SK
+    useEffect(() => {
+        if (!number) return;
+        return subscribeMatches({ team: number }, (updates) => {
+            setMatches(prev => {
+                const bySk = new Map(prev.map(m => [m.SK, m]));
+                for (const { item } of updates) {
+                    bySk.set(item.SK, { ...bySk.get(item.SK), ...item } as Match);
+                }
+                return Array.from(bySk.values());
+            });
+        });
+    }, [number]);
+
     if (loading) {
         return (
             <div className="space-y-6 pb-10 animate-pulse">
@@ -8,7 +8,7 @@ export async function generateStaticParams() {
         const apiUrl = process.env.NEXT_PUBLIC_API_URL;
         if (!apiUrl) return [{ number: '3150N' }];
 
-        const res = await fetch(`${apiUrl}/teams?season=197`, {
+        const res = await fetch(`${apiUrl}/teams?season=${process.env.NEXT_PUBLIC_SEASON_ID || '197'}`, {
             headers: { 'Accept': 'application/json' }
         });
         if (!res.ok) return [{ number: '3150N' }];
@@ -216,8 +216,8 @@ const MOCK_EVENTS: Event[] = [
 
 
 
-export async function getTeams(query: string = ''): Promise<Team[]> {
-    const apiTeams = await fetchFromApi<Team[]>(`/teams?season=${SEASON_ID}&q=${query}`);
+export async function getTeams(query: string = '', season: string = SEASON_ID): Promise<Team[]> {
+    const apiTeams = await fetchFromApi<Team[]>(`/teams?season=${season}&q=${query}`);
     if (apiTeams) return apiTeams;
 
     // Simulate API delay for mock
@@ -229,8 +229,8 @@ export async function getTeams(query: string = ''): Promise<Team[]> {
     );
 }
 
-export async function getEvents(): Promise<Event[]> {
-    const data = await fetchFromApi<any>(`/events?season=${SEASON_ID}`);
+export async function getEvents(season: string = SEASON_ID): Promise<Event[]> {
+    const data = await fetchFromApi<any>(`/events?season=${season}`);
 
     if (data && Array.isArray(data)) {
         return data.map((item: any) => ({
@@ -256,24 +256,18 @@ export async function getEvents(): Promise<Event[]> {
     return MOCK_EVENTS;
 }
 
-export async function getTeam(number: string): Promise<Team | undefined> {
-    const apiTeam = await fetchFromApi<Team>(`/teams/${number}`);
+export async function getTeam(number: string, season: string = SEASON_ID): Promise<Team | undefined> {
+    const apiTeam = await fetchFromApi<Team>(`/teams/${number}?season=${season}`);
     if (apiTeam) return apiTeam;
 
     await new Promise(resolve => setTimeout(resolve, 500));
     return MOCK_TEAMS.find(t => t.number === number);
 }
 
-export async function getMatches(teamNumber: string): Promise<Match[]> {
-    const apiMatches = await fetchFromApi<Match[]>(`/teams/${teamNumber}/matches`);
+export async function getMatches(teamNumber: string, season: string = SEASON_ID): Promise<Match[]> {
+    // The API only reads that season's match items (SK prefix per season)
+    const apiMatches = await fetchFromApi<Match[]>(`/teams/${teamNumber}/matches?season=${season}`);
     if (apiMatches && Array.isArray(apiMatches)) {
-        // Filter out matches from previous seasons based on SEASON_ID
-        // 197 is 2025-2026, its SKUs contain '-25-'
-        // 190 is 2024-2025, its SKUs contain '-24-'
-        const seasonYearSuffix = SEASON_ID === "197" ? "-25-" : SEASON_ID === "190" ? "-24-" : "";
-        if (seasonYearSuffix) {
-            return apiMatches.filter(m => m.sku && m.sku.includes(seasonYearSuffix));
-        }
         return apiMatches;
     }
     return [];
@@ -0,0 +1,39 @@
+// Live match feed: score changes pushed by the updaters.
+// wss:// URLs are the API Gateway WebSocket feed; http(s):// is the local
+// stand-in broker (scripts/feed_broker.py), which speaks Server-Sent Events.
+const FEED_URL = (process.env.NEXT_PUBLIC_FEED_URL || '').replace(/\/$/, '');
+
+export interface FeedUpdate {
+    channel: string;            // 'event:{sku}' | 'team:{number}'
+    item: Record<string, any>;  // the written match item (without PK)
+}
+
+export function subscribeMatches(
+    target: { sku?: string; team?: string },
+    onUpdates: (updates: FeedUpdate[]) => void
+): () => void {
+    if (!FEED_URL || typeof window === 'undefined') return () => { };
+
+    const params = new URLSearchParams();
+    if (target.sku) params.set('sku', target.sku);
+    if (target.team) params.set('team', target.team);
+
+    const handle = (data: string) => {
+        try {
+            const message = JSON.parse(data);
+            if (message.type === 'matches' && Array.isArray(message.updates)) onUpdates(message.updates);
+        } catch {
+            // ignore malformed messages
+        }
+    };
+
+    if (/^wss?:\/\//i.test(FEED_URL)) {
+        const socket = new WebSocket(`${FEED_URL}?${params}`);
+        socket.onmessage = (e) => handle(e.data);
+        return () => socket.close();
+    }
+
+    const source = new EventSource(`${FEED_URL}/stream?${params}`);
+    source.addEventListener('matches', (e) => handle((e as MessageEvent).data));
+    return () => source.close();
+}
@@ -0,0 +1,42 @@
+"""
+Shared fixtures: scripts/ and lambda/content-updater/ on the path, and a moto
+table with the production key schema (PK/SK plus GSI1).
+
+    pip install pytest moto
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for path in ('scripts', os.path.join('lambda', 'content-updater')):
+    sys.path.insert(0, os.path.join(ROOT, path))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ca-central-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+
+@pytest.fixture
+def table():
+    moto = pytest.importorskip('moto')
+    import boto3
+
+    with moto.mock_aws():
+        resource = boto3.resource('dynamodb')
+        keys = ('PK', 'SK', 'GSI1PK', 'GSI1SK')
+        yield resource.create_table(
+            TableName='vex5hub-data',
+            BillingMode='PAY_PER_REQUEST',
+            KeySchema=[{'AttributeName': 'PK', 'KeyType': 'HASH'}, {'AttributeName': 'SK', 'KeyType': 'RANGE'}],
+            AttributeDefinitions=[{'AttributeName': k, 'AttributeType': 'S'} for k in keys],
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'GSI1',
+                'KeySchema': [{'AttributeName': 'GSI1PK', 'KeyType': 'HASH'},
+                              {'AttributeName': 'GSI1SK', 'KeyType': 'RANGE'}],
+                'Projection': {'ProjectionType': 'ALL'},
+            }],
+        )
@@ -0,0 +1,54 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@pytest.fixture
+def api(monkeypatch):
+    # Loaded under its own name: the content-updater's index.py is already `index` on sys.path
+    spec = importlib.util.spec_from_file_location('api_index', os.path.join(ROOT, 'lambda', 'api-handler', 'index.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, 'TABLE_NAME', 'vex5hub-data')
+    monkeypatch.setattr(module.time, 'sleep', lambda s: None)
+    return module
+
+
+class ThrottledClient:
+    """BatchGetItem that never processes the `throttled` key."""
+
+    def __init__(self, items, throttled):
+        self.items, self.throttled = items, throttled
+        self.get_calls = 0
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems['vex5hub-data']['Keys']
+        resp = {'Responses': {'vex5hub-data': [self.items[(k['PK']['S'], k['SK']['S'])]
+                                               for k in keys if k['SK']['S'] != self.throttled]}}
+        unprocessed = [k for k in keys if k['SK']['S'] == self.throttled]
+        if unprocessed:
+            resp['UnprocessedKeys'] = {'vex5hub-data': {'Keys': unprocessed}}
+        return resp
+
+    def get_item(self, TableName, Key):
+        self.get_calls += 1
+        return {'Item': self.items[(Key['PK']['S'], Key['SK']['S'])]}
+
+
+def test_batch_get_reads_throttled_keys_one_by_one(api, monkeypatch):
+    items = {('TEAM#3150N', sk): {'PK': {'S': 'TEAM#3150N'}, 'SK': {'S': sk}} for sk in ('METADATA', 'SEASON#197')}
+    client = ThrottledClient(items, 'SEASON#197')
+    monkeypatch.setattr(api, 'dynamodb', lambda: client)
+
+    found = api.batch_get([api.table_key(*key) for key in items])
+    assert sorted(i['SK'] for i in found) == ['METADATA', 'SEASON#197']
+    assert client.get_calls == 1
+
+
+@pytest.mark.parametrize('body', ['[]', '1', 'null', '"sku"', '{bad'])
+def test_subscribe_rejects_bodies_that_are_not_objects(api, body):
+    event = {'requestContext': {'routeKey': 'subscribe', 'connectionId': 'c1'}, 'body': body}
+    assert api.feed_handler(event)['statusCode'] == 400
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr
+
+from ddb_scan import parallel_scan
+
+
+def _seed(table):
+    with table.batch_writer() as batch:
+        for n in range(30):
+            batch.put_item(Item={'PK': f'EVENT#RE-V5RC-25-{n:04d}', 'SK': 'MATCH#1#2#01#0001',
+                                 'red_score': Decimal(n), 'red_teams': ['3150N']})
+        batch.put_item(Item={'PK': 'TEAM#3150N', 'SK': 'METADATA', 'name': 'Nighthawks'})
+
+
+def test_unfiltered_scan_returns_resource_shaped_items(table):
+    _seed(table)
+    items = list(parallel_scan(table, segments=4))
+    assert len(items) == 31
+    match = next(i for i in items if i['PK'] == 'EVENT#RE-V5RC-25-0007')
+    assert match['red_score'] == Decimal(7)
+    assert match['red_teams'] == ['3150N']
+
+
+def test_filtered_scan_with_projection(table):
+    _seed(table)
+    items = list(parallel_scan(table, segments=4, projection=['PK', 'red_score'],
+                               filter_expression=Attr('SK').begins_with('MATCH#') & Attr('red_score').gte(25)))
+    assert sorted(i['red_score'] for i in items) == [Decimal(n) for n in range(25, 30)]
+    assert all(set(i) == {'PK', 'red_score'} for i in items)
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+import pytest
+
+from export_season import collect_rows, load_season, write_datasets
+
+
+def test_sparse_attributes_survive_the_export(tmp_path):
+    pytest.importorskip('pyarrow')
+    rows = collect_rows([
+        {'PK': 'EVENT#RE-V5RC-25-0165', 'SK': 'MATCH#1#2#01#0001', 'sku': 'RE-V5RC-25-0165',
+         'red_score': Decimal(47)},
+        {'PK': 'EVENT#RE-V5RC-25-0165', 'SK': 'MATCH#1#2#01#0002', 'sku': 'RE-V5RC-25-0165',
+         'red_score': Decimal(12), 'video_url': 'https://youtu.be/x?t=900'},
+        {'PK': 'TEAM#3150N', 'SK': 'SEASON#197', 'number': '3150N'},
+        {'PK': 'TEAM#1A', 'SK': 'SEASON#197', 'number': '1A', 'stats': {'wins': Decimal(3), 'wp': Decimal(6)}},
+    ])
+    write_datasets(rows, str(tmp_path))
+
+    matches = load_season(str(tmp_path), 197).to_pylist()
+    assert {m['SK']: m['video_url'] for m in matches} == {'MATCH#1#2#01#0001': None,
+                                                          'MATCH#1#2#01#0002': 'https://youtu.be/x?t=900'}
+    teams = load_season(str(tmp_path), 197, 'teams').to_pylist()
+    assert {t['number']: t['stats_wins'] for t in teams} == {'3150N': None, '1A': 3}
@@ -0,0 +1,30 @@
+import feed
+
+
+class PagedTable:
+    """Returns one subscription item per query page, like a channel past the 1 MB page limit."""
+
+    def __init__(self, items):
+        self.items = items
+        self.deleted = []
+
+    def query(self, **kwargs):
+        start = kwargs.get('ExclusiveStartKey', {}).get('n', 0)
+        resp = {'Items': self.items[start:start + 1]}
+        if start + 1 < len(self.items):
+            resp['LastEvaluatedKey'] = {'n': start + 1}
+        return resp
+
+    def delete_item(self, Key):
+        self.deleted.append(Key)
+
+
+def test_subscribers_reads_every_page():
+    table = PagedTable([{'PK': 'FEED#event:RE-V5RC-25-0001', 'SK': f'CONN#c{n}'} for n in range(3)])
+    assert feed._subscribers(table, 'event:RE-V5RC-25-0001') == ['c0', 'c1', 'c2']
+
+
+def test_remove_connection_reads_every_page():
+    table = PagedTable([{'PK': 'CONN#c1', 'SK': f'FEED#team:{n}'} for n in range(3)])
+    feed.remove_connection(table, 'c1')
+    assert len(table.deleted) == 6
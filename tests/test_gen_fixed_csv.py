@@ -0,0 +1,33 @@
+import csv
+import json
+
+from gen_fixed_csv import convert_json_to_csv
+
+
+def _link(n, ts, started, sku='RE-V5RC-25-0254'):
+    return {'match_name': f'Qualifier #{n}', 'video_url': f'https://www.youtube.com/watch?v=vid&t={ts}s',
+            'timestamp': ts, 'division_id': 1, 'started': started, 'event': {'sku': sku}}
+
+
+def test_keeps_checked_rows_and_skips_clamped_or_out_of_order(tmp_path):
+    links = {
+        1: _link(1, 120, '2025-10-04T09:00:00'),
+        2: _link(2, 0, '2025-10-04T09:05:00'),        # clamped
+        3: _link(3, 900, '2025-10-04T09:10:00'),      # after Q4's time
+        4: _link(4, 600, '2025-10-04T09:15:00'),
+        5: _link(5, 1000, '2025-10-04T09:20:00'),
+        6: _link(1, 50, '2025-10-04T09:00:00', sku='RE-V5RC-25-0165'),
+    }
+    json_path, csv_path = tmp_path / 'links.json', tmp_path / 'fixed.csv'
+    json_path.write_text(json.dumps(links))
+    csv_path.write_text("sku,match_name,youtube_id,timestamp_seconds,division_id\n"
+                        "RE-V5RC-25-0165,Q1,checked,695,1\n")
+
+    convert_json_to_csv(str(json_path), str(csv_path))
+
+    with open(csv_path, newline='') as f:
+        rows = list(csv.reader(f))[1:]
+    assert rows == [['RE-V5RC-25-0165', 'Q1', 'checked', '695', '1'],
+                    ['RE-V5RC-25-0254', 'Q1', 'vid', '120', '1'],
+                    ['RE-V5RC-25-0254', 'Q4', 'vid', '600', '1'],
+                    ['RE-V5RC-25-0254', 'Q5', 'vid', '1000', '1']]
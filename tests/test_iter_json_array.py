@@ -0,0 +1,24 @@
+import io
+import json
+
+import pytest
+
+import index
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 4, 5, 64])
+def test_values_split_across_chunks(chunk_size):
+    values = [12345, 678, -9.5e3, True, None, "café", {"team": {"team": "3150N"}, "rank": 1}, [1, 22]]
+    raw = io.BytesIO(json.dumps(values).encode())
+    assert list(index.iter_json_array(raw, chunk_size)) == values
+
+
+def test_stops_reading_when_the_caller_stops():
+    raw = io.BytesIO(b'[1, 2, 3' + b', 4' * 10000 + b']')
+    first = next(index.iter_json_array(raw, 4))
+    assert first == 1 and raw.tell() < 16
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        list(index.iter_json_array(io.BytesIO(b'[1, 2'), 2))
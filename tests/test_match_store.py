@@ -0,0 +1,35 @@
+import json
+
+import ingest
+from match_store import MatchStore, export_json, import_json
+
+
+def _match(match_id, matchnum, **extra):
+    return {'id': match_id, 'name': f'Qualifier #{matchnum}', 'round': 2, 'instance': 1, 'matchnum': matchnum,
+            'scheduled': f'2026-01-21T13:{matchnum:02d}:00-05:00', 'started': '', 'field': 'Plaskolite',
+            'division': {'id': 1, 'name': 'Default'},
+            'event': {'id': 60165, 'name': 'Kalahari Classic', 'code': 'RE-V5RC-25-0165'},
+            'alliances': [{'color': 'red', 'score': 47, 'teams': [{'team': {'id': 1, 'name': '4911E'}, 'sitting': False}]},
+                          {'color': 'blue', 'score': 33, 'teams': [{'team': {'id': 2, 'name': '3145C'}, 'sitting': False}]}],
+            **extra}
+
+
+def test_store_round_trips_raw_matches(tmp_path):
+    linked = _match(131338994, 1, video_url='https://www.youtube.com/watch?v=uZLlramgfoQ&t=695s', updated_at='x')
+    source = tmp_path / 'collected_matches.json'
+    source.write_text(json.dumps({'matches': {'131338994': linked, '131338995': _match(131338995, 2)}}))
+
+    store = MatchStore(str(tmp_path / 'store.db'))
+    assert import_json(store, str(source)) == 2
+    assert next(store.event('RE-V5RC-25-0165')).video_url == linked['video_url']
+    assert next(store.event('RE-V5RC-25-0165', raw=True)) == linked
+
+    out = tmp_path / 'export.json'
+    export_json(store, str(out))
+    assert json.loads(out.read_text())['matches']['131338994'] == linked
+
+
+def test_records_keep_video_url(tmp_path):
+    store = MatchStore(str(tmp_path / 'store.db'))
+    store.upsert([ingest.MatchRecord.from_api(_match(7, 3, video_url='https://youtu.be/x?t=5s'))])
+    assert store.get(7).video_url == 'https://youtu.be/x?t=5s'
@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+import ingest
+import index
+
+
+def _ranked(table, team, partition, rank):
+    table.put_item(Item={'PK': f'TEAM#{team}', 'SK': 'SEASON#197', 'number': team, 'rank': Decimal(rank),
+                         'GSI1PK': f'{partition}#S{ingest.shard_of(team)}', 'GSI1SK': f'RANK#{rank:04d}#TEAM#{team}'})
+
+
+def test_ranked_teams_include_the_building_run(table, monkeypatch):
+    monkeypatch.setattr(index, 'table', table)
+    published = 'SEASON#197#V20251001000000000000'
+    _ranked(table, '1A', published, 2)
+    table.put_item(Item={'PK': 'SEASON#197', 'SK': index.RANKING_SK, 'version': published,
+                         'shards': Decimal(ingest.SEASON_SHARDS)})
+
+    building = index.start_ranking_run(197)
+    _ranked(table, '2A', building, 1)  # already moved over by the run
+
+    assert [t['number'] for t in index.ranked_teams(197, 10)] == ['2A', '1A']
+    assert index.tracked_team_numbers(197) == {'1A', '2A'}
+
+    index.publish_ranking(197, building)
+    assert index.ranking_partitions(197) == ingest.shard_partitions(building)
@@ -0,0 +1,26 @@
+import queue
+
+from sync_event import _write_items
+
+
+def test_write_items_keeps_stored_video_urls(table):
+    table.put_item(Item={'PK': 'EVENT#RE-V5RC-25-0001', 'SK': 'MATCH#1#2#01#0001', 'red_score': 0,
+                         'video_url': 'https://youtu.be/x?t=10s'})
+    table.put_item(Item={'PK': 'TEAM#3150N', 'SK': 'MATCH#RE-V5RC-25-0001#1#2#01#0001',
+                         'video_url': 'https://youtu.be/x?t=10s'})
+
+    items = queue.Queue()
+    items.put({'PK': 'EVENT#RE-V5RC-25-0001', 'SK': 'MATCH#1#2#01#0001', 'red_score': 42})
+    items.put({'PK': 'TEAM#3150N', 'SK': 'MATCH#RE-V5RC-25-0001#1#2#01#0001', 'my_score': 42})
+    for n in range(2, 150):  # more than one read-back chunk
+        items.put({'PK': 'EVENT#RE-V5RC-25-0001', 'SK': f'MATCH#1#2#01#{n:04d}', 'red_score': n})
+    items.put(None)
+    counts = {'items': 0}
+    _write_items(table, items, counts)
+
+    assert counts['items'] == 150
+    event = table.get_item(Key={'PK': 'EVENT#RE-V5RC-25-0001', 'SK': 'MATCH#1#2#01#0001'})['Item']
+    assert event['red_score'] == 42 and event['video_url'] == 'https://youtu.be/x?t=10s'
+    team = table.get_item(Key={'PK': 'TEAM#3150N', 'SK': 'MATCH#RE-V5RC-25-0001#1#2#01#0001'})['Item']
+    assert team['my_score'] == 42 and team['video_url'] == 'https://youtu.be/x?t=10s'
+    assert 'video_url' not in table.get_item(Key={'PK': 'EVENT#RE-V5RC-25-0001', 'SK': 'MATCH#1#2#01#0002'})['Item']
@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+import ingest
+from sync_team_stats import load_items, plan_stats
+
+
+def _match(n, red, blue, red_score, blue_score, sku='RE-V5RC-25-0001', started='2025-10-04T10:00:00Z'):
+    return {'PK': f'EVENT#{sku}', 'SK': f'MATCH#1#2#01#{n:04d}', 'red_teams': red, 'blue_teams': blue,
+            'red_score': Decimal(red_score), 'blue_score': Decimal(blue_score), 'started': started}
+
+
+def _season_item(team, season_id=197, **stats):
+    return {'PK': f'TEAM#{team}', 'SK': f'SEASON#{season_id}',
+            'stats': {f: Decimal(stats.get(f, 0)) for f in ingest.STAT_FIELDS + ('rank',)}}
+
+
+def test_team_season_stats_skips_unplayed_and_unknown_seasons():
+    totals = ingest.team_season_stats([
+        _match(1, ['1A', '2A'], ['3A', '4A'], 10, 5),
+        _match(2, ['1A', '3A'], ['2A', '4A'], 7, 7),
+        _match(3, ['1A', '2A'], ['3A', '4A'], 0, 0, started=None),     # scheduled
+        _match(4, ['1A', '2A'], ['3A', '4A'], 9, 1, sku='RE-V5RC-19-0001'),  # season not mapped
+    ])
+    assert totals[('1A', 197)] == {'wins': 1, 'losses': 0, 'ties': 1, 'total_matches': 2, 'wp': 3}
+    assert totals[('4A', 197)] == {'wins': 0, 'losses': 1, 'ties': 1, 'total_matches': 2, 'wp': 1}
+
+
+def test_recompute_sets_only_stale_stats(table):
+    for match in (_match(1, ['1A'], ['2A'], 10, 5), _match(2, ['1A'], ['3A'], 3, 8)):
+        table.put_item(Item=match)
+    table.put_item(Item=_season_item('1A', wins=1, losses=1, total_matches=2, wp=2, rank=4))  # already right
+    table.put_item(Item=_season_item('2A', rank=9))       # ranked after its match was written
+    table.put_item(Item=_season_item('9Z', wins=3, total_matches=3, wp=6))  # no matches left
+    table.put_item(Item={'PK': 'TEAM#3A', 'SK': 'SEASON#197'})  # not seeded yet
+
+    plan = plan_stats(*load_items(table))
+    assert sorted(op['key']['PK'] for op in plan.ops) == ['TEAM#2A', 'TEAM#9Z']
+    assert plan.apply(table) == {'update': 2}
+
+    two_a = table.get_item(Key={'PK': 'TEAM#2A', 'SK': 'SEASON#197'})['Item']['stats']
+    assert two_a == {'wins': 0, 'losses': 1, 'ties': 0, 'total_matches': 1, 'wp': 0, 'rank': 9}
+    assert table.get_item(Key={'PK': 'TEAM#9Z', 'SK': 'SEASON#197'})['Item']['stats']['wp'] == 0
+    assert plan_stats(*load_items(table), season_id=190).ops == []
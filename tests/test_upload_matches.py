@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+import ingest
+from upload_matches import plan_video_urls
+
+
+def test_only_video_url_is_written(table):
+    stored = {'PK': 'EVENT#RE-V5RC-25-0165', 'SK': ingest.event_match_sk(1, 2, 1, 1),
+              'red_score': Decimal(47), 'blue_score': Decimal(33), 'started': '2026-01-21T17:59:22Z'}
+    table.put_item(Item=stored)
+    table.put_item(Item={'PK': 'TEAM#4911E', 'SK': 'MATCH#RE-V5RC-25-0165#1#2#01#0001',
+                         'event_start': '2026-01-21', 'red_score': Decimal(47)})
+    link = {'match_name': 'Qualifier #1', 'round': 2, 'instance': 1, 'matchnum': 1, 'division_id': 1,
+            'video_url': 'https://www.youtube.com/watch?v=uZLlramgfoQ&t=695s',
+            'alliances': [{'color': 'red', 'score': 0, 'teams': [{'team': {'id': 1, 'name': '4911E'}}]}],
+            'event': {'sku': 'RE-V5RC-25-0165'}}
+    missing = dict(link, matchnum=2, match_name='Qualifier #2')
+    matches = {'1': ingest.MatchRecord.from_api(link), '2': ingest.MatchRecord.from_api(missing)}
+
+    assert plan_video_urls(matches).apply(table) == {'update': 1, 'update_skipped': 1}
+
+    items = {(i['PK'], i['SK']): i for i in table.scan()['Items']}
+    assert items[(stored['PK'], stored['SK'])] == dict(stored, video_url=link['video_url'])
+    assert items[('TEAM#4911E', 'MATCH#RE-V5RC-25-0165#1#2#01#0001')]['event_start'] == '2026-01-21'
+    assert len(items) == 2
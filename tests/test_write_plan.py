@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from write_plan import WritePlan
+
+
+def test_apply_puts_deletes_and_updates(table, tmp_path):
+    for n in range(30):
+        table.put_item(Item={'PK': 'EVENT#RE-V5RC-25-0001', 'SK': f'MATCH#1#2#01#{n:04d}', 'red_score': Decimal(n)})
+    table.put_item(Item={'PK': 'EVENT#RE-V5RC-25-0002', 'SK': 'METADATA', 'match_count': Decimal(0)})
+
+    plan = WritePlan()
+    for n in range(30):
+        plan.delete({'PK': 'EVENT#RE-V5RC-25-0001', 'SK': f'MATCH#1#2#01#{n:04d}'}, reason='dup')
+        plan.put({'PK': 'EVENT#RE-V5RC-25-0002', 'SK': f'MATCH#1#2#01#{n:04d}', 'red_teams': ['3150N'],
+                  'red_score': Decimal(n)}, reason='moved')
+    plan.update({'PK': 'EVENT#RE-V5RC-25-0002', 'SK': 'METADATA'}, "SET match_count = :n",
+                values={':n': Decimal(30)}, condition="attribute_exists(PK)")
+    plan.update({'PK': 'EVENT#RE-V5RC-25-0009', 'SK': 'MATCH#1#2#01#0000'}, "SET video_url = :v",
+                values={':v': 'https://youtu.be/x?t=10'}, condition="attribute_exists(PK)")
+
+    results = plan.apply(table, progress_path=str(tmp_path / 'progress'))
+    assert results == {'put': 30, 'delete': 30, 'update': 1, 'update_skipped': 1}
+
+    items = table.scan()['Items']
+    assert {i['PK'] for i in items} == {'EVENT#RE-V5RC-25-0002'}
+    assert next(i for i in items if i['SK'] == 'MATCH#1#2#01#0000')['red_teams'] == ['3150N']
+    assert next(i for i in items if i['SK'] == 'METADATA')['match_count'] == 30
+
+    # Everything is recorded as done, so a resumed apply has nothing left to write
+    assert WritePlan(plan.ops).apply(table, progress_path=str(tmp_path / 'progress')) == {}